@@ -0,0 +1,100 @@
+"""
+Offline maintenance commands for the backend
+
+Usage:
+    python -m backend.app.cli compile-snapshot SEED OUT
+    python -m backend.app.cli import-sqlite SEED OUT
+
+Commands run outside the API process (e.g., in a build or deploy step) so the
+expensive work never happens on the request path.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+
+
+def _compile_snapshot(args: argparse.Namespace) -> int:
+    from .services.snapshot import compile_snapshot
+
+    started = time.perf_counter()
+
+    def progress(count: int) -> None:
+        print(f"  {count:,} records", file=sys.stderr)
+
+    count = compile_snapshot(
+        Path(args.seed),
+        Path(args.out),
+        progress=progress,
+        workers=args.workers,
+        fp_rate=args.filter_fp_rate,
+    )
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {count:,} records to {args.out} in {elapsed:.1f}s")
+    return 0
+
+
+def _import_sqlite(args: argparse.Namespace) -> int:
+    from .services.sqlite import import_sqlite
+
+    started = time.perf_counter()
+
+    def progress(count: int) -> None:
+        print(f"  {count:,} records", file=sys.stderr)
+
+    count = import_sqlite(
+        Path(args.seed), Path(args.out), progress=progress, workers=args.workers
+    )
+    elapsed = time.perf_counter() - started
+    print(f"Imported {count:,} records into {args.out} in {elapsed:.1f}s")
+    return 0
+
+
+def _add_workers_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Processes loading the seed (default 0: one per CPU; 1: none)",
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.app.cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser(
+        "compile-snapshot",
+        help="Compile a JSON/JSONL seed into a memory-mappable .snap file",
+    )
+    p.add_argument("seed", help="Seed file (JSON array or JSON Lines)")
+    p.add_argument("out", help="Output snapshot path (e.g. seed.snap)")
+    _add_workers_argument(p)
+    p.add_argument(
+        "--filter-fp-rate",
+        type=float,
+        default=0.01,
+        help="False-positive rate of the stored name filter (0: no filter)",
+    )
+    p.set_defaults(func=_compile_snapshot)
+
+    p = sub.add_parser(
+        "import-sqlite",
+        help="Import a JSON/JSONL seed into a SQLite database (FTS5 search)",
+    )
+    p.add_argument("seed", help="Seed file (JSON array or JSON Lines)")
+    p.add_argument("out", help="Output database path (e.g. seed.sqlite)")
+    _add_workers_argument(p)
+    p.set_defaults(func=_import_sqlite)
+
+    args = parser.parse_args(argv)
+    result: int = args.func(args)
+    return result
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+Runtime settings
+
+Collects the environment variables the backend reads into one immutable
+object. Settings are resolved once when the app is created, so request
+handlers never touch `os.environ` or the filesystem to decide configuration.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_SEED_PATH = "backend/data/seed_entities.json"
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """Interpret common truthy spellings of an environment variable."""
+
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Backend configuration.
+
+    Attributes:
+      seed_path: Seed file, snapshot or SQLite database (DATA_SEED_PATH), or
+        a directory of per-country partition files (`US.jsonl`, `GB.snap`,
+        ...) opened on first use. When it does not exist the built-in
+        in-memory sample dataset is served.
+      data_store: "dict" or "columnar" storage for JSON seeds (DATA_STORE).
+      seed_streaming: Decode JSON array seeds record by record
+        (DATA_SEED_STREAMING).
+      seed_workers: Processes decoding, validating and indexing seed
+        records (DATA_SEED_WORKERS); 1 loads in-process, 0 uses one per CPU.
+      reload_interval: Seconds between seed file change checks by the
+        background watcher (SEED_RELOAD_INTERVAL); 0 disables watching.
+      registry_budget: End-to-end seconds allowed for a registry fan-out
+        lookup (REGISTRY_BUDGET_SECONDS).
+      registry_urls: Base URLs of HTTP registries consulted by `/verify`
+        alongside the local dataset (REGISTRY_URLS, comma-separated).
+      registry_timeout: Seconds per registry call, retries included
+        (REGISTRY_TIMEOUT_SECONDS); each attempt also stops at the
+        request's remaining budget.
+      registry_pool_size: Keep-alive connections per registry
+        (REGISTRY_POOL_SIZE).
+      registry_retry_ratio: Retries allowed per registry request, on average
+        (REGISTRY_RETRY_RATIO).
+      registry_breaker_failures: Consecutive failed calls that open a
+        registry's circuit (REGISTRY_BREAKER_FAILURES).
+      registry_breaker_reset: Seconds an open circuit fails fast before a
+        trial call (REGISTRY_BREAKER_RESET_SECONDS).
+      cache_size: Max cached lookup results (VERIFY_CACHE_SIZE); 0 disables
+        the lookup cache.
+      cache_ttl: Seconds a found record stays cached (VERIFY_CACHE_TTL).
+      cache_negative_ttl: Seconds a not-found result stays cached
+        (VERIFY_CACHE_NEGATIVE_TTL).
+      fuzzy_threshold: Minimum Jaro-Winkler similarity for fuzzy matches
+        (FUZZY_MATCH_THRESHOLD).
+      autocomplete_cache_size: Max cached autocomplete results
+        (AUTOCOMPLETE_CACHE_SIZE); 0 disables the autocomplete cache.
+      autocomplete_cache_ttl: Seconds an autocomplete result stays cached
+        (AUTOCOMPLETE_CACHE_TTL).
+      metrics_enabled: Record latency metrics and serve them on /metrics
+        (METRICS_ENABLED); when off no instrumentation is installed.
+      watchlist_path: Sanctions/PEP watchlist to screen names against
+        (WATCHLIST_PATH); unset keeps the placeholder screening rule.
+      coalesce_lookups: Share one in-flight `/verify` lookup among concurrent
+        identical requests (COALESCE_LOOKUPS, on by default). Applies only
+        when registries are configured; local-only lookups are never
+        coalesced, so they are not subject to `coalesce_timeout`.
+      coalesce_timeout: Seconds a shared lookup may take before its callers
+        get a 504 (COALESCE_TIMEOUT_SECONDS).
+      warm_indexes: Build indexes that are otherwise created on first use
+        (autocomplete) when the provider loads (WARM_INDEXES), so the first
+        requests don't pay for them and pre-fork workers share them.
+      partition_budget_mb: Summed file size, in MiB, of partitions kept
+        loaded when `seed_path` is a directory (PARTITION_MEMORY_BUDGET_MB);
+        least recently used partitions beyond it are dropped. 0 keeps every
+        loaded partition.
+      delta_dir: Directory of JSON Lines change sets (upserts and deletes)
+        applied on top of the loaded dataset in file name order
+        (DATA_DELTA_DIR); new files are picked up every `reload_interval`.
+      audit_log_path: SQLite file recording every verification and search
+        (AUDIT_LOG_PATH); unset disables the audit log.
+      audit_batch_size: Audit events written per transaction
+        (AUDIT_BATCH_SIZE).
+      audit_flush_interval: Maximum seconds an audit event waits before it
+        is written (AUDIT_FLUSH_INTERVAL).
+      audit_queue_size: Audit events queued in memory before the overflow
+        policy applies (AUDIT_QUEUE_SIZE).
+      audit_overflow: "drop_newest" or "drop_oldest", which events are lost
+        when the audit queue is full (AUDIT_OVERFLOW).
+      name_filter_fp_rate: False-positive rate of the per-country name
+        filters that answer lookups of absent businesses without querying
+        the dataset (NAME_FILTER_FP_RATE); 0 disables them.
+    """
+
+    seed_path: Path = Path(DEFAULT_SEED_PATH)
+    data_store: str = "dict"
+    seed_streaming: bool = False
+    seed_workers: int = 1
+    reload_interval: float = 2.0
+    registry_budget: float = 2.5
+    registry_urls: tuple[str, ...] = ()
+    registry_timeout: float = 1.0
+    registry_pool_size: int = 10
+    registry_retry_ratio: float = 0.1
+    registry_breaker_failures: int = 5
+    registry_breaker_reset: float = 30.0
+    cache_size: int = 0
+    cache_ttl: float = 300.0
+    cache_negative_ttl: float = 30.0
+    fuzzy_threshold: float = 0.9
+    autocomplete_cache_size: int = 0
+    autocomplete_cache_ttl: float = 5.0
+    metrics_enabled: bool = False
+    watchlist_path: Optional[Path] = None
+    coalesce_lookups: bool = True
+    coalesce_timeout: float = 3.0
+    warm_indexes: bool = False
+    partition_budget_mb: float = 0.0
+    delta_dir: Optional[Path] = None
+    audit_log_path: Optional[Path] = None
+    audit_batch_size: int = 500
+    audit_flush_interval: float = 1.0
+    audit_queue_size: int = 10_000
+    audit_overflow: str = "drop_newest"
+    name_filter_fp_rate: float = 0.0
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Build settings from environment variables, using defaults if unset."""
+
+        watchlist = os.getenv("WATCHLIST_PATH")
+        delta_dir = os.getenv("DATA_DELTA_DIR")
+        audit_log = os.getenv("AUDIT_LOG_PATH")
+        return cls(
+            seed_path=Path(os.getenv("DATA_SEED_PATH", DEFAULT_SEED_PATH)),
+            data_store=os.getenv("DATA_STORE", "dict").strip().lower(),
+            seed_streaming=env_flag("DATA_SEED_STREAMING"),
+            seed_workers=int(os.getenv("DATA_SEED_WORKERS", "1")),
+            reload_interval=float(os.getenv("SEED_RELOAD_INTERVAL", "2.0")),
+            registry_budget=float(os.getenv("REGISTRY_BUDGET_SECONDS", "2.5")),
+            registry_urls=tuple(
+                url.strip()
+                for url in os.getenv("REGISTRY_URLS", "").split(",")
+                if url.strip()
+            ),
+            registry_timeout=float(os.getenv("REGISTRY_TIMEOUT_SECONDS", "1.0")),
+            registry_pool_size=int(os.getenv("REGISTRY_POOL_SIZE", "10")),
+            registry_retry_ratio=float(os.getenv("REGISTRY_RETRY_RATIO", "0.1")),
+            registry_breaker_failures=int(os.getenv("REGISTRY_BREAKER_FAILURES", "5")),
+            registry_breaker_reset=float(
+                os.getenv("REGISTRY_BREAKER_RESET_SECONDS", "30")
+            ),
+            cache_size=int(os.getenv("VERIFY_CACHE_SIZE", "0")),
+            cache_ttl=float(os.getenv("VERIFY_CACHE_TTL", "300")),
+            cache_negative_ttl=float(os.getenv("VERIFY_CACHE_NEGATIVE_TTL", "30")),
+            fuzzy_threshold=float(os.getenv("FUZZY_MATCH_THRESHOLD", "0.9")),
+            autocomplete_cache_size=int(os.getenv("AUTOCOMPLETE_CACHE_SIZE", "0")),
+            autocomplete_cache_ttl=float(os.getenv("AUTOCOMPLETE_CACHE_TTL", "5")),
+            metrics_enabled=env_flag("METRICS_ENABLED"),
+            watchlist_path=Path(watchlist) if watchlist else None,
+            coalesce_lookups=env_flag("COALESCE_LOOKUPS", default=True),
+            coalesce_timeout=float(os.getenv("COALESCE_TIMEOUT_SECONDS", "3")),
+            warm_indexes=env_flag("WARM_INDEXES"),
+            partition_budget_mb=float(os.getenv("PARTITION_MEMORY_BUDGET_MB", "0")),
+            delta_dir=Path(delta_dir) if delta_dir else None,
+            audit_log_path=Path(audit_log) if audit_log else None,
+            audit_batch_size=int(os.getenv("AUDIT_BATCH_SIZE", "500")),
+            audit_flush_interval=float(os.getenv("AUDIT_FLUSH_INTERVAL", "1")),
+            audit_queue_size=int(os.getenv("AUDIT_QUEUE_SIZE", "10000")),
+            audit_overflow=os.getenv("AUDIT_OVERFLOW", "drop_newest").strip().lower(),
+            name_filter_fp_rate=float(os.getenv("NAME_FILTER_FP_RATE", "0")),
+        )
@@ -10,23 +10,137 @@ Run locally (example):
     uvicorn backend.app.main:app --reload
 """
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Sequence
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import os
 
+from .config import Settings
+
 # Routers encapsulate feature areas; the verify router handles KYB checks.
-from .routers import verify
+from .routers import audit, verify
+from .services.audit import AuditStats, create_audit_log
+from .services.bloom import FilterStats
+from .services.cache import CacheStats
+from .services.delta import DeltaFeed, DeltaStats
+from .services.metrics import PROMETHEUS_CONTENT_TYPE, Metrics, MetricsMiddleware
+from .services.partitioned import PartitionStats
+from .services.providers import create_provider_registry
+from .services.registries import (
+    AsyncDataProvider,
+    FanOutProvider,
+    RegistrySource,
+    SyncProviderAdapter,
+)
+from .services.registry_client import RegistryClientStats, create_http_registries
+from .services.screening import create_screener_registry
+from .services.singleflight import SingleFlightProvider, SingleFlightStats
 
 
-def create_app() -> FastAPI:
+def create_app(
+    settings: Optional[Settings] = None,
+    registries: Sequence[RegistrySource] = (),
+) -> FastAPI:
     """Factory to create the FastAPI app.
 
     Using a factory helps testing (fresh app per test) and future configuration
     (e.g., dependency injection, settings, middleware) without side effects.
+    Settings default to the environment and are read once here. External
+    `registries`, plus an HTTP registry per `settings.registry_urls` entry,
+    are queried concurrently alongside the local dataset by `/v1/verify`.
     """
 
+    settings = settings or Settings.from_env()
+
+    # The data provider and watchlist are loaded once up front; their file
+    # watchers run only while the app is serving (between startup and shutdown).
+    cache_stats = CacheStats()
+    completion_stats = CacheStats()
+    partition_stats = PartitionStats()
+    delta_stats = DeltaStats()
+    filter_stats = FilterStats()
+    # Instrumentation exists only when enabled, so it costs nothing otherwise.
+    metrics = Metrics() if settings.metrics_enabled else None
+    providers = create_provider_registry(
+        settings,
+        cache_stats=cache_stats,
+        completion_stats=completion_stats,
+        metrics=metrics,
+        partition_stats=partition_stats,
+        delta_stats=delta_stats,
+        filter_stats=filter_stats,
+    )
+    deltas = (
+        DeltaFeed(lambda: providers.current, interval=settings.reload_interval)
+        if settings.delta_dir is not None
+        else None
+    )
+    screening = create_screener_registry(settings)
+    audit_stats = AuditStats()
+    audit_log = create_audit_log(settings, audit_stats)
+    registry_stats = RegistryClientStats()
+    http_registries = create_http_registries(settings, registry_stats)
+    registries = [
+        *(
+            RegistrySource(registry, timeout=settings.registry_timeout)
+            for registry in http_registries
+        ),
+        *registries,
+    ]
+    lookup: AsyncDataProvider = SyncProviderAdapter(lambda: providers.current)
+    if registries:
+        # The local dataset answers instantly when it knows the business.
+        lookup = FanOutProvider(
+            [RegistrySource(lookup, timeout=settings.registry_budget), *registries],
+            budget=settings.registry_budget,
+        )
+    flight_stats = SingleFlightStats()
+    # Only registry round trips are worth sharing; a local lookup would just
+    # gain a timeout that a cold partition load or page-in could exceed.
+    coalescing = settings.coalesce_lookups and bool(registries)
+    if coalescing:
+        # Outermost, so coalesced requests also share registry round trips.
+        lookup = SingleFlightProvider(
+            lookup, timeout=settings.coalesce_timeout, stats=flight_stats
+        )
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        providers.start()
+        screening.start()
+        if deltas is not None:
+            deltas.start()
+        if audit_log is not None:
+            audit_log.start()
+        # Data was loaded (and warmed) in `create_app`, possibly before fork.
+        app.state.ready = True
+        try:
+            yield
+        finally:
+            app.state.ready = False
+            if audit_log is not None:
+                # Drains the queue, so requests served before shutdown are kept.
+                audit_log.stop()
+            if deltas is not None:
+                deltas.stop()
+            screening.stop()
+            providers.stop()
+            for registry in http_registries:
+                registry.client.close()
+
     # Title and version can be surfaced in OpenAPI docs.
-    app = FastAPI(title="Business Entity Resolution API", version="0.1.0")
+    app = FastAPI(
+        title="Business Entity Resolution API", version="0.1.0", lifespan=lifespan
+    )
+    app.state.settings = settings
+    app.state.providers = providers
+    app.state.screening = screening
+    app.state.lookup = lookup
+    app.state.audit = audit_log
+    app.state.ready = False
 
     # CORS: allow the local web dev server to call the API from the browser.
     # Origins are configured via CORS_ORIGINS (comma-separated), defaulting to
@@ -44,7 +158,7 @@ def create_app() -> FastAPI:
         allow_origins=allow_origins,
         allow_credentials=True,
         allow_methods=["GET", "POST", "OPTIONS"],
-        allow_headers=["*"]
+        allow_headers=["*"],
     )
 
     # Health check: simple and dependency-free to maximize reliability.
@@ -52,8 +166,56 @@ def create_app() -> FastAPI:
     def health() -> dict[str, str]:
         return {"status": "ok"}
 
+    # Readiness: 503 until this worker has started serving (and again while it
+    # shuts down), so load balancers only route to workers with data loaded.
+    @app.get("/ready", tags=["system"])
+    def ready() -> JSONResponse:
+        if not app.state.ready:
+            return JSONResponse({"status": "unavailable"}, status_code=503)
+        return JSONResponse({"status": "ready", "generation": providers.generation})
+
+    # Operational counters for dashboards and troubleshooting.
+    @app.get("/stats", tags=["system"])
+    def stats() -> dict[str, object]:
+        return {
+            "cache": {"enabled": settings.cache_size > 0, **cache_stats.as_dict()},
+            "autocomplete_cache": {
+                "enabled": settings.autocomplete_cache_size > 0,
+                **completion_stats.as_dict(),
+            },
+            "coalescing": {
+                "enabled": coalescing,
+                **flight_stats.as_dict(),
+            },
+            "partitions": {
+                "enabled": settings.seed_path.is_dir(),
+                **partition_stats.as_dict(),
+            },
+            "deltas": {"enabled": deltas is not None, **delta_stats.as_dict()},
+            "name_filter": {
+                "enabled": settings.name_filter_fp_rate > 0,
+                "false_positive_rate": settings.name_filter_fp_rate,
+                **filter_stats.as_dict(),
+            },
+            "audit": {"enabled": audit_log is not None, **audit_stats.as_dict()},
+            "registries": {
+                "enabled": bool(http_registries),
+                "circuits": {r.name: r.client.breaker.state for r in http_registries},
+                **registry_stats.as_dict(),
+            },
+        }
+
+    if metrics is not None:
+        # Outermost middleware, so request timings include CORS handling.
+        app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+        @app.get("/metrics", tags=["system"], include_in_schema=False)
+        def prometheus_metrics() -> Response:
+            return Response(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
     # Register domain routers under a versioned API prefix.
     app.include_router(verify.router, prefix="/v1")
+    app.include_router(audit.router, prefix="/v1")
 
     return app
 
@@ -0,0 +1,138 @@
+"""
+Audit history endpoints
+
+Serves the dashboard's search history view from the verification audit log
+(see `services.audit`). Entries appear once the background writer has flushed
+them, typically within `AUDIT_FLUSH_INTERVAL` seconds.
+"""
+
+from datetime import datetime, timezone
+from typing import Literal, Optional, cast
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, ConfigDict
+
+from ..services.audit import AuditLog
+from .verify import get_audit
+
+router = APIRouter(prefix="/audit", tags=["audit"])
+
+# Upper bound on entries per history page.
+MAX_HISTORY_PAGE = 500
+
+
+class AuditEntry(BaseModel):
+    """One recorded verification or search.
+
+    Fields:
+    - id: Entry id; newer entries have larger ids.
+    - timestamp: When the request was handled (UTC).
+    - kind: "verify" or "search".
+    - query: Submitted name or search text.
+    - country: ISO2 code, when the request had one.
+    - matched: Matched legal name (top hit for searches).
+    - results: Number of records returned.
+    - status: Verification decision; null for searches.
+    """
+
+    id: int
+    timestamp: datetime
+    kind: Literal["verify", "search"]
+    query: str
+    country: Optional[str] = None
+    matched: Optional[str] = None
+    results: int
+    status: Optional[Literal["clear", "review_required"]] = None
+
+
+class AuditHistory(BaseModel):
+    """A page of audit entries, newest first.
+
+    Pass `next_before` as `before` to fetch the next (older) page; it is null
+    on the last page.
+    """
+
+    items: list[AuditEntry]
+    next_before: Optional[int] = None
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "items": [
+                    {
+                        "id": 42,
+                        "timestamp": "2024-05-01T12:00:00Z",
+                        "kind": "verify",
+                        "query": "Acme Corp",
+                        "country": "US",
+                        "matched": "Acme Corp",
+                        "results": 1,
+                        "status": "clear",
+                    }
+                ],
+                "next_before": None,
+            }
+        }
+    )
+
+
+def _epoch(value: Optional[datetime]) -> Optional[float]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+@router.get(
+    "/history",
+    response_model=AuditHistory,
+    responses={404: {"description": "The audit log is not enabled"}},
+)
+def history(
+    kind: Optional[Literal["verify", "search"]] = None,
+    country: Optional[str] = None,
+    q: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    before: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=MAX_HISTORY_PAGE),
+    audit: Optional[AuditLog] = Depends(get_audit),
+) -> AuditHistory:
+    """List recorded verifications and searches, newest first.
+
+    Query params:
+      kind: only "verify" or "search" entries
+      country: ISO2 country filter
+      q: exact submitted name or search text (case-insensitive)
+      since / until: time range (ISO 8601; naive values are UTC)
+      before: return entries older than this id (pagination)
+      limit: maximum entries (default 50, max 500)
+    """
+
+    if audit is None:
+        raise HTTPException(status_code=404, detail="Audit log is not enabled")
+    events = audit.history(
+        kind=kind,
+        country=country,
+        query=q,
+        since=_epoch(since),
+        until=_epoch(until),
+        before_id=before,
+        limit=limit,
+    )
+    items = [
+        AuditEntry(
+            id=cast(int, e.id),  # set on every stored event
+            timestamp=datetime.fromtimestamp(e.ts, tz=timezone.utc),
+            kind=e.kind,
+            query=e.query,
+            country=e.country,
+            matched=e.matched,
+            results=e.results,
+            status=e.status,
+        )
+        for e in events
+    ]
+    next_before = items[-1].id if len(items) == limit else None
+    return AuditHistory(items=items, next_before=next_before)
@@ -0,0 +1,123 @@
+"""
+Direct JSON rendering for hot endpoints
+
+`/v1/verify` and `/v1/verify/search` return pre-encoded bytes instead of
+pydantic models. Going through `VerifyResponse`/`Candidate` costs an
+`Address` and a response model per result, FastAPI's re-validation against
+`response_model`, `jsonable_encoder` and finally `json.dumps`; for cache-hit
+lookups that is most of the request's CPU time.
+
+The output is byte-for-byte what FastAPI's `JSONResponse` would produce for
+the equivalent model (same field order, nulls included, compact separators,
+non-ASCII kept as UTF-8). Routes keep their `response_model`, so the OpenAPI
+schema is unchanged. The record part of a result (name, address, status)
+never changes for a given `BusinessRecord`, so it is rendered once and kept
+in a bounded LRU cache.
+"""
+
+from __future__ import annotations
+
+import json
+from functools import lru_cache, partial
+from typing import Iterable, Optional
+
+from ..services.datasource import BusinessRecord, SearchHit
+from ..services.screening import ScreeningResult
+
+# Distinct records whose JSON fragment is kept.
+RECORD_FRAGMENT_CACHE_SIZE = 16_384
+
+# Same settings as starlette's JSONResponse.render.
+_dumps = partial(
+    json.dumps, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+)
+
+
+def _fragment(
+    legal_name: str, line1: str, city: str, country: str, registration_status: str
+) -> str:
+    status = (
+        registration_status
+        if registration_status in {"Active", "Inactive"}
+        else "Unknown"
+    )
+    return (
+        f'"legal_name":{_dumps(legal_name)},'
+        f'"address":{{"line1":{_dumps(line1)},"city":{_dumps(city)},'
+        f'"country":{_dumps(country)}}},'
+        f'"registration_status":{_dumps(status)}'
+    )
+
+
+@lru_cache(maxsize=RECORD_FRAGMENT_CACHE_SIZE)
+def record_fragment(rec: BusinessRecord) -> str:
+    """The `legal_name`, `address` and `registration_status` members of a result.
+
+    Shared by `VerifyResponse` and `Candidate`, which both start with these
+    fields. Statuses other than Active/Inactive render as "Unknown".
+    """
+
+    return _fragment(
+        rec.legal_name,
+        rec.address_line1,
+        rec.city,
+        rec.country,
+        rec.registration_status,
+    )
+
+
+def render_verify(
+    name: str,
+    country: str,
+    rec: Optional[BusinessRecord],
+    screening: ScreeningResult,
+    match_score: Optional[float] = None,
+) -> bytes:
+    """Encode a `VerifyResponse` for a lookup result.
+
+    Applies the same rules as `build_verify_response`: unknown businesses echo
+    the normalized input with "Unknown" address fields.
+    """
+
+    if rec is None:
+        head = _fragment(
+            name.strip().title(), "Unknown", "Unknown", country.upper(), "Unknown"
+        )
+    else:
+        head = record_fragment(rec)
+
+    if screening.risk_flags:
+        flags = _dumps(list(screening.risk_flags))
+        status = "review_required"
+    else:
+        flags = "null"
+        status = "clear"
+    hits = (
+        "["
+        + ",".join(
+            f'{{"list":{_dumps(hit.entry.list_name)},"id":{_dumps(hit.entry.id)},'
+            f'"name":{_dumps(hit.entry.name)},"matched":{_dumps(hit.alias)}}}'
+            for hit in screening.hits
+        )
+        + "]"
+        if screening.hits
+        else "null"
+    )
+    score = "null" if match_score is None else _dumps(float(match_score))
+    return (
+        f'{{{head},"risk_flags":{flags},"status":"{status}",'
+        f'"match_score":{score},"screening_hits":{hits}}}'
+    ).encode("utf-8")
+
+
+def render_candidates(hits: Iterable[SearchHit]) -> bytes:
+    """Encode a `list[Candidate]` for ranked search results."""
+
+    return (
+        "["
+        + ",".join(
+            f'{{{record_fragment(hit.record)},"score":{_dumps(float(hit.score))}}}'
+            for hit in hits
+        )
+        + "]"
+    ).encode("utf-8")
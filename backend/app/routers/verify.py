@@ -6,52 +6,67 @@ country and receive a structured response with basic verification fields and a
 simple risk status, as outlined in the PRD.
 """
 
-from typing import Literal, Optional
+import json
+from typing import Any, AsyncIterator, Literal, Optional, cast
 
-from fastapi import APIRouter, Depends
-from pydantic import BaseModel, Field, ConfigDict
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field, ConfigDict, ValidationError
+from starlette.types import Receive, Scope, Send
+
+from ..config import Settings
 
 # Import the data provider abstraction to retrieve basic business facts.
-from ..services.datasource import (
-    BusinessRecord,
-    DataProvider,
-    InMemoryDataProvider,
-    FileDataProvider,
-)
-from pathlib import Path
-import os
+from ..services.audit import AuditEvent, AuditLog
+from ..services.datasource import BusinessRecord, DataProvider, FuzzyMatch
+from ..services.registries import AsyncDataProvider
+from ..services.metrics import stage_timer
+from ..services.screening import Screener, ScreeningResult
+from .render import render_candidates, render_verify
 
 
 router = APIRouter(prefix="", tags=["verify"])  # Empty prefix; mounted at /v1
 
 
-_PROVIDER: DataProvider | None = None
-_PROV_KEY: str | None = None
+def get_provider(request: Request) -> DataProvider:
+    """Dependency that supplies a data provider instance.
 
+    The provider registry is built once by `create_app` from the startup
+    settings and swapped in the background when the seed file changes, so this
+    is a plain attribute read with no environment or filesystem access. Tests
+    can still replace it through `app.dependency_overrides`.
+    """
 
-def get_provider() -> DataProvider:
-    """Dependency that supplies a data provider instance.
+    return cast(DataProvider, request.app.state.providers.current)
 
-    Using a function allows dependency overrides in tests if needed, while the
-    default returns a simple in-memory dataset for local development.
+
+def get_lookup(request: Request) -> AsyncDataProvider:
+    """Dependency that supplies the async lookup used by `/verify`.
+
+    This is the local provider, or a fan-out over the local provider and any
+    external registries passed to `create_app`.
     """
 
-    # Decide provider based on presence of a JSON seed file. This supports
-    # local iteration on data without code changes.
-    path_env = os.getenv("DATA_SEED_PATH", "backend/data/seed_entities.json")
-    key = "MEMORY"
-    seed_path = Path(path_env)
-    if seed_path.exists():
-        key = str(seed_path.resolve())
-
-    global _PROVIDER, _PROV_KEY
-    if _PROVIDER is None or _PROV_KEY != key:
-        _PROV_KEY = key
-        _PROVIDER = (
-            FileDataProvider(seed_path) if key != "MEMORY" else InMemoryDataProvider()
-        )
+    return cast(AsyncDataProvider, request.app.state.lookup)
+
 
-    return _PROVIDER
+def get_screener(request: Request) -> Screener:
+    """Dependency that supplies the current (hot-reloaded) screener."""
+
+    return cast(Screener, request.app.state.screening.current)
+
+
+def get_audit(request: Request) -> Optional[AuditLog]:
+    """Dependency that supplies the audit log, or None when it is disabled."""
+
+    return cast(Optional[AuditLog], request.app.state.audit)
+
+
+def get_settings(request: Request) -> Settings:
+    """Dependency that supplies the settings the app was created with."""
+
+    return cast(Settings, request.app.state.settings)
 
 
 class VerifyRequest(BaseModel):
@@ -60,10 +75,15 @@ class VerifyRequest(BaseModel):
     Fields:
     - name: Business name to verify.
     - country: ISO 3166-1 alpha-2 country code (e.g., "US").
+    - match: "exact" (default) or "fuzzy" to fall back to the closest local
+      record above the configured similarity threshold.
     """
 
     name: str = Field(..., min_length=1, description="Business legal or trade name")
     country: str = Field(..., min_length=2, max_length=2, description="ISO2 code")
+    match: Literal["exact", "fuzzy"] = Field(
+        "exact", description="Name matching mode"
+    )
 
     # OpenAPI example to guide integrators in docs (/docs)
     model_config = ConfigDict(
@@ -85,6 +105,22 @@ class Address(BaseModel):
     country: str
 
 
+class ScreeningMatch(BaseModel):
+    """A watchlist entry that matched the submitted name.
+
+    Fields:
+    - list: Watchlist the entry belongs to (e.g., "sanctions", "pep").
+    - id: Entry identifier within the list.
+    - name: Listed primary name.
+    - matched: The listed name or alias found in the submitted name.
+    """
+
+    list: str
+    id: str
+    name: str
+    matched: str
+
+
 class VerifyResponse(BaseModel):
     """Standardized verification result.
 
@@ -94,6 +130,10 @@ class VerifyResponse(BaseModel):
     - registration_status: Simplified status from registries (e.g., Active).
     - risk_flags: Optional list of screening hits (e.g., ["sanctions_hit"]).
     - status: Top-level decision helper: "clear" or "review_required".
+    - match_score: Name similarity (0-1) of the matched record for fuzzy
+      requests; null for exact requests or when nothing matched.
+    - screening_hits: Watchlist entries behind `risk_flags`, when screening
+      against a configured watchlist.
     """
 
     legal_name: str
@@ -101,6 +141,8 @@ class VerifyResponse(BaseModel):
     registration_status: Literal["Active", "Inactive", "Unknown"]
     risk_flags: Optional[list[str]] = None
     status: Literal["clear", "review_required"]
+    match_score: Optional[float] = None
+    screening_hits: Optional[list[ScreeningMatch]] = None
 
     # OpenAPI example for a clear response
     model_config = ConfigDict(
@@ -145,26 +187,113 @@ class VerifyResponse(BaseModel):
                     }
                 }
             }
-        }
+        },
+        504: {"description": "The business lookup timed out"},
     },
 )
-def verify(
+async def verify(
+    request: Request,
     req: VerifyRequest,
+    lookup: AsyncDataProvider = Depends(get_lookup),
     provider: DataProvider = Depends(get_provider),
-) -> VerifyResponse:
+    screener: Screener = Depends(get_screener),
+    settings: Settings = Depends(get_settings),
+    audit: Optional[AuditLog] = Depends(get_audit),
+) -> Response:
     """Stub verification endpoint for the MVP.
 
     This implementation returns a deterministic example payload suitable for
     front-end and integration scaffolding. Replace with real data sources and
     screening logic in later iterations.
+
+    The handler is async so registry round trips wait on the event loop
+    rather than holding a threadpool thread.
     """
 
-    # For the stub, infer a trivial "hit" when the name contains the word "test".
-    has_hit = "test" in req.name.lower()
+    timer = stage_timer(request)
+    timer.lap("validation")
 
     # Try to resolve a known business from the data provider. If not found,
     # return a minimal structure with unknown fields.
-    rec: Optional[BusinessRecord] = provider.lookup_business(req.name, req.country)
+    try:
+        rec: Optional[BusinessRecord] = await lookup.lookup_business(
+            req.name, req.country
+        )
+    except TimeoutError:
+        # A shared (coalesced) lookup ran past its deadline.
+        raise HTTPException(
+            status_code=504, detail="Business lookup timed out"
+        ) from None
+    args = (req, rec, provider, settings.fuzzy_threshold)
+    rec, match_score = (
+        await run_in_threadpool(_apply_match_mode, *args)
+        if provider.blocking and req.match == "fuzzy"
+        else _apply_match_mode(*args)
+    )
+    timer.lap("lookup")
+
+    screening = screener.screen(req.name)
+    timer.lap("screening")
+
+    # Encoded directly: same bytes as a `VerifyResponse`, without building one.
+    body = render_verify(req.name, req.country, rec, screening, match_score)
+    if audit is not None:
+        audit.record(_verify_event(req, rec, screening))
+    timer.lap("response")
+    return Response(body, media_type="application/json")
+
+
+def _apply_match_mode(
+    req: VerifyRequest,
+    rec: Optional[BusinessRecord],
+    provider: DataProvider,
+    threshold: float,
+) -> tuple[Optional[BusinessRecord], Optional[float]]:
+    """Return the record and match score for `req` given its exact lookup.
+
+    Fuzzy requests that found nothing fall back to the closest local record
+    (through the provider's blocking index) scoring at least `threshold`.
+    The exact lookup already missed, so only the near-match search runs.
+    """
+
+    if req.match != "fuzzy":
+        return rec, None
+    if rec is not None:
+        return rec, 1.0
+    found: Optional[FuzzyMatch] = provider.near_match(
+        req.name, req.country, threshold
+    )
+    if found is None:
+        return None, None
+    return found.record, found.score
+
+
+def _verify_event(
+    req: VerifyRequest, rec: Optional[BusinessRecord], screening: ScreeningResult
+) -> AuditEvent:
+    """Audit log entry for one verification."""
+
+    return AuditEvent(
+        kind="verify",
+        query=req.name,
+        country=req.country.strip().upper(),
+        matched=rec.legal_name if rec is not None else None,
+        results=int(rec is not None),
+        status="review_required" if screening.risk_flags else "clear",
+    )
+
+
+def build_verify_response(
+    req: VerifyRequest,
+    rec: Optional[BusinessRecord],
+    screening: ScreeningResult,
+    match_score: Optional[float] = None,
+) -> VerifyResponse:
+    """Map a request, its lookup result and screening result to the response.
+
+    Shared by the single, batch and streaming endpoints so every path applies
+    the same normalization and screening rules.
+    """
 
     if rec is None:
         # Unknown business: supply normalized inputs and default values.
@@ -186,7 +315,17 @@ def verify(
             else "Unknown"
         )
 
-    risk_flags = ["possible_match"] if has_hit else None
+    has_hit = bool(screening.risk_flags)
+    risk_flags = list(screening.risk_flags) if has_hit else None
+    hits = [
+        ScreeningMatch(
+            list=hit.entry.list_name,
+            id=hit.entry.id,
+            name=hit.entry.name,
+            matched=hit.alias,
+        )
+        for hit in screening.hits
+    ]
     status: Literal["clear", "review_required"] = (
         "review_required" if has_hit else "clear"
     )
@@ -197,19 +336,318 @@ def verify(
         registration_status=registration_status,
         risk_flags=risk_flags,
         status=status,
+        match_score=match_score,
+        screening_hits=hits or None,
     )
 
 
+# Upper bound on items per batch request; larger jobs should be split or use
+# a streaming upload.
+MAX_BATCH_SIZE = 10_000
+
+
+class BatchVerifyResult(BaseModel):
+    """Outcome of one item in a batch verification.
+
+    Exactly one of `result` or `error` is set. `index` is the item's position
+    in the submitted array.
+    """
+
+    index: int
+    result: Optional[VerifyResponse] = None
+    error: Optional[str] = None
+
+
+def _format_validation_error(e: ValidationError) -> str:
+    """Render pydantic errors as "field: message" pairs."""
+
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc']) or 'item'}: {err['msg']}"
+        for err in e.errors()
+    )
+
+
+@router.post(
+    "/verify/batch",
+    response_model=list[BatchVerifyResult],
+    responses={504: {"description": "The business lookups timed out"}},
+)
+async def verify_batch(
+    items: list[Any] = Body(..., max_length=MAX_BATCH_SIZE),
+    lookup: AsyncDataProvider = Depends(get_lookup),
+    provider: DataProvider = Depends(get_provider),
+    screener: Screener = Depends(get_screener),
+    settings: Settings = Depends(get_settings),
+    audit: Optional[AuditLog] = Depends(get_audit),
+) -> list[BatchVerifyResult]:
+    """Verify many businesses in one request.
+
+    The body is a JSON array of `VerifyRequest` objects. Items are validated
+    individually, looked up together (the local dataset in a single pass,
+    then any configured registries for the businesses it does not have), and
+    returned in submission order; an invalid item yields an `error` entry
+    without failing the rest of the batch. Items with `"match": "fuzzy"` fall
+    back to the closest local record, as on `/verify`.
+    """
+
+    out = [BatchVerifyResult(index=i) for i in range(len(items))]
+    valid: list[tuple[int, VerifyRequest]] = []
+    for i, item in enumerate(items):
+        try:
+            valid.append((i, VerifyRequest.model_validate(item)))
+        except ValidationError as e:
+            out[i].error = _format_validation_error(e)
+
+    try:
+        records = await lookup.lookup_many(
+            [(req.name, req.country) for _, req in valid]
+        )
+    except TimeoutError:
+        # A shared (coalesced) lookup ran past its deadline.
+        raise HTTPException(
+            status_code=504, detail="Business lookup timed out"
+        ) from None
+    # Fuzzy matching, screening and rendering are CPU work (or blocking
+    # provider calls); keep them off the event loop.
+    await run_in_threadpool(
+        _fill_batch_results,
+        out,
+        valid,
+        records,
+        provider,
+        screener,
+        settings.fuzzy_threshold,
+        audit,
+    )
+    return out
+
+
+def _fill_batch_results(
+    out: list[BatchVerifyResult],
+    valid: list[tuple[int, VerifyRequest]],
+    records: list[Optional[BusinessRecord]],
+    provider: DataProvider,
+    screener: Screener,
+    threshold: float,
+    audit: Optional[AuditLog],
+) -> None:
+    """Match, screen and set the `result` entries of looked-up batch items."""
+
+    events: list[AuditEvent] = []
+    for (i, req), found in zip(valid, records, strict=True):
+        rec, match_score = _apply_match_mode(req, found, provider, threshold)
+        screening = screener.screen(req.name)
+        out[i].result = build_verify_response(req, rec, screening, match_score)
+        events.append(_verify_event(req, rec, screening))
+    if audit is not None:
+        audit.record_many(events)
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Input lines validated, looked up and rendered together.
+STREAM_CHUNK_LINES = 512
+
+# Longest accepted NDJSON input line; longer lines are reported and skipped so
+# a missing newline cannot grow the line buffer without bound.
+MAX_STREAM_LINE_BYTES = 64 * 1024
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """Streaming response whose body iterator also consumes the request body.
+
+    `StreamingResponse` normally listens for client disconnects concurrently,
+    which would race the body iterator for request messages. Here the body
+    iterator reads the request itself (surfacing disconnects as
+    `ClientDisconnect`), so only the send side runs.
+    """
+
+    media_type = NDJSON_MEDIA_TYPE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def _iter_ndjson_lines(
+    request: Request,
+) -> AsyncIterator[tuple[int, Optional[bytes]]]:
+    """Yield `(line_number, line)` pairs as request body chunks arrive.
+
+    Lines over `MAX_STREAM_LINE_BYTES` are yielded as `None`.
+    """
+
+    buf = b""
+    lineno = 0
+    skipping = False
+    async for chunk in request.stream():
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            lineno += 1
+            if skipping:
+                skipping = False
+                yield lineno, None
+            else:
+                yield lineno, line if len(line) <= MAX_STREAM_LINE_BYTES else None
+        if len(buf) > MAX_STREAM_LINE_BYTES:
+            skipping = True
+            buf = b""
+    if buf or skipping:
+        yield lineno + 1, None if skipping else buf
+
+
+# One parsed chunk of NDJSON input: output slots (error lines already
+# rendered) and the valid requests as `(slot, line_number, request)`.
+_ParsedChunk = tuple[list[Optional[bytes]], list[tuple[int, int, VerifyRequest]]]
+
+
+def _error_line(lineno: int, error: str) -> bytes:
+    return json.dumps({"line": lineno, "error": error}).encode("utf-8")
+
+
+def _parse_ndjson_chunk(lines: list[tuple[int, Optional[bytes]]]) -> _ParsedChunk:
+    """Validate one chunk of NDJSON lines.
+
+    Invalid lines are rendered as `{"line": n, "error": "..."}` right away so
+    output stays aligned with input.
+    """
+
+    out: list[Optional[bytes]] = []
+    valid: list[tuple[int, int, VerifyRequest]] = []
+    for lineno, raw in lines:
+        if raw is None:
+            error = f"line exceeds {MAX_STREAM_LINE_BYTES} bytes"
+        else:
+            try:
+                req = VerifyRequest.model_validate_json(raw)
+                valid.append((len(out), lineno, req))
+                out.append(None)
+                continue
+            except ValidationError as e:
+                error = _format_validation_error(e)
+        out.append(_error_line(lineno, error))
+    return out, valid
+
+
+def _render_ndjson_chunk(
+    chunk: _ParsedChunk,
+    records: list[Optional[BusinessRecord]],
+    provider: DataProvider,
+    screener: Screener,
+    threshold: float,
+    audit: Optional[AuditLog] = None,
+) -> bytes:
+    """Match and screen a looked-up chunk and render its output lines."""
+
+    out, valid = chunk
+    events: list[AuditEvent] = []
+    for (pos, _, req), found in zip(valid, records, strict=True):
+        rec, match_score = _apply_match_mode(req, found, provider, threshold)
+        screening = screener.screen(req.name)
+        resp = build_verify_response(req, rec, screening, match_score)
+        out[pos] = resp.model_dump_json().encode("utf-8")
+        events.append(_verify_event(req, rec, screening))
+    if audit is not None:
+        audit.record_many(events)
+    return b"".join(line + b"\n" for line in out if line is not None)
+
+
+async def _verify_ndjson_chunk(
+    lines: list[tuple[int, Optional[bytes]]],
+    lookup: AsyncDataProvider,
+    provider: DataProvider,
+    screener: Screener,
+    threshold: float,
+    audit: Optional[AuditLog] = None,
+) -> bytes:
+    """Verify one chunk of NDJSON lines and render the output lines.
+
+    Parsing and rendering run on the threadpool; the lookups go through the
+    async lookup chain like single verifications.
+    """
+
+    chunk = await run_in_threadpool(_parse_ndjson_chunk, lines)
+    out, valid = chunk
+    try:
+        records = await lookup.lookup_many(
+            [(req.name, req.country) for _, _, req in valid]
+        )
+    except TimeoutError:
+        # The response has started; report the chunk's lines instead of a 504.
+        for pos, lineno, _ in valid:
+            out[pos] = _error_line(lineno, "business lookup timed out")
+        chunk, records = (out, []), []
+    return await run_in_threadpool(
+        _render_ndjson_chunk, chunk, records, provider, screener, threshold, audit
+    )
+
+
+@router.post(
+    "/verify/stream",
+    response_class=NDJSONStreamingResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                NDJSON_MEDIA_TYPE: {
+                    "schema": {"type": "string"},
+                    "example": '{"name": "Acme Corp", "country": "US"}\n',
+                }
+            },
+        }
+    },
+)
+async def verify_stream(
+    request: Request,
+    lookup: AsyncDataProvider = Depends(get_lookup),
+    provider: DataProvider = Depends(get_provider),
+    screener: Screener = Depends(get_screener),
+    settings: Settings = Depends(get_settings),
+    audit: Optional[AuditLog] = Depends(get_audit),
+) -> NDJSONStreamingResponse:
+    """Verify an NDJSON upload of `VerifyRequest` lines as a stream.
+
+    The request body is read incrementally and verified in chunks of
+    `STREAM_CHUNK_LINES`; each chunk's `VerifyResponse` lines are written back
+    before more input is read, so memory stays flat regardless of upload size
+    and a slow reader throttles the upload. Blank lines are skipped; invalid
+    lines produce an error object carrying their 1-based line number.
+    """
+
+    async def verify_chunk(lines: list[tuple[int, Optional[bytes]]]) -> bytes:
+        return await _verify_ndjson_chunk(
+            lines, lookup, provider, screener, settings.fuzzy_threshold, audit
+        )
+
+    async def body() -> AsyncIterator[bytes]:
+        pending: list[tuple[int, Optional[bytes]]] = []
+        async for lineno, line in _iter_ndjson_lines(request):
+            if line is not None and not line.strip():
+                continue
+            pending.append((lineno, line))
+            if len(pending) >= STREAM_CHUNK_LINES:
+                yield await verify_chunk(pending)
+                pending = []
+        if pending:
+            yield await verify_chunk(pending)
+
+    return NDJSONStreamingResponse(body())
+
+
 class Candidate(BaseModel):
     """Slimmed candidate record for search results.
 
     Used by the search endpoint to list possible matches before running full
-    verification/screening.
+    verification/screening. `score` is the relevance (0-1) results are ordered
+    by: exact > prefix > token prefix > substring matches, Active first.
     """
 
     legal_name: str
     address: Address
     registration_status: Literal["Active", "Inactive", "Unknown"]
+    score: float
 
     # Example used in OpenAPI docs
     model_config = ConfigDict(
@@ -218,6 +656,7 @@ class Candidate(BaseModel):
                 "legal_name": "Acme Corp",
                 "address": {"line1": "123 Main St", "city": "Springfield", "country": "US"},
                 "registration_status": "Active",
+                "score": 1.0,
             }
         }
     )
@@ -238,6 +677,7 @@ class Candidate(BaseModel):
                                     "legal_name": "Acme Corp",
                                     "address": {"line1": "123 Main St", "city": "Springfield", "country": "US"},
                                     "registration_status": "Active",
+                                    "score": 1.0,
                                 }
                             ],
                         }
@@ -248,9 +688,11 @@ class Candidate(BaseModel):
     },
 )
 def search(
-    q: str, country: Optional[str] = None, limit: int = 10, provider: DataProvider = Depends(get_provider)
-) -> list[Candidate]:
-    """Search for businesses by partial legal name.
+    request: Request,
+    q: str, country: Optional[str] = None, limit: int = 10, provider: DataProvider = Depends(get_provider),
+    audit: Optional[AuditLog] = Depends(get_audit),
+) -> Response:
+    """Search for businesses by partial legal name, most relevant first.
 
     Query params:
       q: partial name to match (min length 2)
@@ -258,21 +700,86 @@ def search(
       limit: maximum results (default 10)
     """
 
+    timer = stage_timer(request)
+    timer.lap("validation")
+
     q_norm = q.strip()
     if len(q_norm) < 2:
         # FastAPI will convert this ValueError to 422 Unprocessable Entity.
         raise ValueError("q must be at least 2 characters")
 
-    results = provider.search_businesses(q_norm, country=country, limit=limit)
-    out: list[Candidate] = []
-    for rec in results:
-        reg_status: Literal["Active", "Inactive", "Unknown"] = (
-            rec.registration_status if rec.registration_status in {"Active", "Inactive"} else "Unknown"
+    results = provider.search_ranked(q_norm, country=country, limit=limit)
+    timer.lap("search")
+    # Encoded directly: same bytes as `list[Candidate]`, without building them.
+    body = render_candidates(results)
+    if audit is not None:
+        audit.record(
+            AuditEvent(
+                kind="search",
+                query=q_norm,
+                country=country.strip().upper() if country else None,
+                matched=results[0].record.legal_name if results else None,
+                results=len(results),
+            )
+        )
+    timer.lap("response")
+    return Response(body, media_type="application/json")
+
+
+# Upper bound on completions per autocomplete request.
+MAX_COMPLETIONS = 50
+
+
+class Completion(BaseModel):
+    """Name suggestion returned by the autocomplete endpoint."""
+
+    legal_name: str
+    country: str
+    registration_status: Literal["Active", "Inactive", "Unknown"]
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "legal_name": "Acme Corp",
+                "country": "US",
+                "registration_status": "Active",
+            }
+        }
+    )
+
+
+@router.get("/verify/autocomplete", response_model=list[Completion])
+def autocomplete(
+    q: str = Query(..., min_length=1),
+    country: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=MAX_COMPLETIONS),
+    provider: DataProvider = Depends(get_provider),
+) -> list[Completion]:
+    """Complete a legal name prefix for search-as-you-type.
+
+    Returns the first `limit` names (alphabetically) starting with `q`, from
+    a per-country sorted prefix index rather than a substring scan.
+
+    Query params:
+      q: name prefix (case-insensitive)
+      country: optional ISO2 country filter
+      limit: maximum completions (default 10, max 50)
+    """
+
+    out: list[Completion] = []
+    for rec in provider.autocomplete(q, country=country, limit=limit):
+        reg_status = cast(
+            Literal["Active", "Inactive", "Unknown"],
+            (
+                rec.registration_status
+                if rec.registration_status in {"Active", "Inactive"}
+                else "Unknown"
+            ),
         )
         out.append(
-            Candidate(
+            Completion(
                 legal_name=rec.legal_name,
-                address=Address(line1=rec.address_line1, city=rec.city, country=rec.country),
+                country=rec.country,
                 registration_status=reg_status,
             )
         )
@@ -0,0 +1,363 @@
+"""
+Verification audit log
+
+Compliance requires a record of every verification and search. Writing a row
+inside each request would add a database round trip (and an fsync) to the
+hot path, so handlers only append an `AuditEvent` to an in-memory queue and
+return; a background writer thread flushes the queue to SQLite in batches,
+one transaction per batch:
+
+- A batch is written once `batch_size` events are waiting or
+  `flush_interval` seconds after the previous flush, whichever comes first.
+- The queue holds at most `max_queue` events. When the writer falls behind
+  (slow disk, long write lock) the overflow policy decides what is lost:
+  "drop_newest" rejects incoming events, "drop_oldest" discards the oldest
+  queued ones. Either way requests never wait on the log, and losses are
+  counted in `AuditStats.dropped`.
+- `stop()` drains the queue before the writer exits, so a graceful shutdown
+  loses nothing.
+
+The database is in WAL mode, so `history` (the dashboard's view) reads
+concurrently with the writer, and several workers may append to the same
+file. Only flushed events are visible to `history`.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable, Literal, Optional
+
+from ..config import Settings
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("drop_newest", "drop_oldest")
+
+# Seconds a connection waits for another writer's lock before failing.
+_BUSY_TIMEOUT = 5.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS audit_events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    query TEXT NOT NULL,
+    query_key TEXT NOT NULL,
+    country TEXT,
+    matched TEXT,
+    results INTEGER NOT NULL,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS audit_events_ts ON audit_events (ts);
+CREATE INDEX IF NOT EXISTS audit_events_query ON audit_events (query_key, id);
+CREATE INDEX IF NOT EXISTS audit_events_country ON audit_events (country, id);
+"""
+
+_INSERT = """
+INSERT INTO audit_events (ts, kind, query, query_key, country, matched, results,
+                          status)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_COLUMNS = "id, ts, kind, query, country, matched, results, status"
+
+AuditKind = Literal["verify", "search"]
+AuditStatus = Literal["clear", "review_required"]
+
+
+@dataclass(frozen=True)
+class AuditEvent:
+    """One verification or search, as recorded in the audit log.
+
+    Attributes:
+      kind: "verify" (single, batch or streamed) or "search".
+      query: Submitted name or search text.
+      country: Uppercased ISO2 code, or None for unfiltered searches.
+      matched: Legal name of the matched record (top hit for searches).
+      results: Records returned (0 or 1 for verifications).
+      status: Verification decision ("clear" / "review_required"); None for
+        searches.
+      ts: Unix time the request was handled.
+      id: Row id once stored; None for events not yet written.
+    """
+
+    kind: AuditKind
+    query: str
+    country: Optional[str] = None
+    matched: Optional[str] = None
+    results: int = 0
+    status: Optional[AuditStatus] = None
+    ts: float = field(default_factory=time.time)
+    id: Optional[int] = None
+
+
+@dataclass
+class AuditStats:
+    """Cumulative counters. `dropped` events were lost to queue overflow,
+    `failed` ones to write errors."""
+
+    enqueued: int = 0
+    written: int = 0
+    dropped: int = 0
+    failed: int = 0
+    batches: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    return sqlite3.connect(
+        path, timeout=_BUSY_TIMEOUT, isolation_level=None, check_same_thread=False
+    )
+
+
+class AuditLog:
+    """Queue of audit events flushed to SQLite by a background thread.
+
+    Parameters:
+      path: SQLite database file; created (with its schema) if missing.
+      batch_size: Events written per transaction, and the queue length that
+        triggers an early flush.
+      flush_interval: Maximum seconds an event waits in the queue while the
+        writer is running.
+      max_queue: Queued events beyond which the overflow policy applies.
+      overflow: One of `OVERFLOW_POLICIES`.
+      stats: Counters to update (a fresh instance by default).
+
+    Raises ValueError for an unknown overflow policy or non-positive sizes.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_queue: int = 10_000,
+        overflow: str = "drop_newest",
+        stats: Optional[AuditStats] = None,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown audit overflow policy {overflow!r}; "
+                f"expected one of {', '.join(OVERFLOW_POLICIES)}"
+            )
+        if batch_size <= 0 or max_queue <= 0:
+            raise ValueError("Audit batch and queue sizes must be positive")
+        self._path = path
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_queue = max_queue
+        self._overflow = overflow
+        self.stats = stats if stats is not None else AuditStats()
+        # Guards `_pending`, `_closed` and `stats`; the writer only holds it
+        # to take a batch, never while writing.
+        self._cond = threading.Condition()
+        self._pending: deque[AuditEvent] = deque()
+        self._stopping = False
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+        conn = _connect(path)
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    def __len__(self) -> int:
+        """Number of events waiting to be written."""
+
+        with self._cond:
+            return len(self._pending)
+
+    def record(self, event: AuditEvent) -> bool:
+        """Queue one event without waiting on the database.
+
+        Returns False when the event was rejected (queue full under
+        "drop_newest", or the log already stopped).
+        """
+
+        return self.record_many((event,)) == 1
+
+    def record_many(self, events: Iterable[AuditEvent]) -> int:
+        """Queue several events under one lock; returns how many were accepted."""
+
+        accepted = 0
+        with self._cond:
+            for event in events:
+                if self._closed:
+                    self.stats.dropped += 1
+                    continue
+                if len(self._pending) >= self._max_queue:
+                    self.stats.dropped += 1
+                    if self._overflow == "drop_newest":
+                        continue
+                    self._pending.popleft()
+                self._pending.append(event)
+                self.stats.enqueued += 1
+                accepted += 1
+            if len(self._pending) >= self._batch_size:
+                self._cond.notify()
+        return accepted
+
+    def start(self) -> None:
+        """Start the writer thread (no-op if already running)."""
+
+        if self._thread is not None:
+            return
+        with self._cond:
+            self._stopping = self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="audit-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Write every queued event, then stop the writer thread.
+
+        Events recorded afterwards are dropped until `start()` is called again.
+        """
+
+        with self._cond:
+            self._closed = True
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        conn = _connect(self._path)
+        try:
+            while True:
+                with self._cond:
+                    self._cond.wait_for(
+                        lambda: self._stopping
+                        or len(self._pending) >= self._batch_size,
+                        timeout=self._flush_interval,
+                    )
+                    take = min(len(self._pending), self._batch_size)
+                    batch = [self._pending.popleft() for _ in range(take)]
+                    done = self._stopping and not self._pending
+                if batch:
+                    self._write(conn, batch)
+                if done:
+                    return
+        finally:
+            conn.close()
+
+    def _write(self, conn: sqlite3.Connection, batch: list[AuditEvent]) -> None:
+        rows = [
+            (
+                e.ts,
+                e.kind,
+                e.query,
+                e.query.strip().lower(),
+                e.country,
+                e.matched,
+                e.results,
+                e.status,
+            )
+            for e in batch
+        ]
+        try:
+            with conn:
+                conn.execute("BEGIN")
+                conn.executemany(_INSERT, rows)
+        except sqlite3.Error:
+            # The batch is lost rather than retried, so a broken database
+            # cannot back the queue up into every request.
+            logger.exception("Failed to write %d audit events", len(batch))
+            with self._cond:
+                self.stats.failed += len(batch)
+            return
+        with self._cond:
+            self.stats.written += len(batch)
+            self.stats.batches += 1
+
+    def history(
+        self,
+        kind: Optional[AuditKind] = None,
+        country: Optional[str] = None,
+        query: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        before_id: Optional[int] = None,
+        limit: int = 50,
+    ) -> list[AuditEvent]:
+        """Written events matching every given filter, newest first.
+
+        `query` matches the submitted text case-insensitively (whole value);
+        `since` / `until` bound `ts` (inclusive / exclusive); `before_id`
+        pages past the last id of a previous page.
+        """
+
+        where: list[str] = []
+        params: list[object] = []
+        if kind is not None:
+            where.append("kind = ?")
+            params.append(kind)
+        if country:
+            where.append("country = ?")
+            params.append(country.strip().upper())
+        if query:
+            where.append("query_key = ?")
+            params.append(query.strip().lower())
+        if since is not None:
+            where.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("ts < ?")
+            params.append(until)
+        if before_id is not None:
+            where.append("id < ?")
+            params.append(before_id)
+        sql = f"SELECT {_COLUMNS} FROM audit_events"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+
+        conn = _connect(self._path)
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+        return [
+            AuditEvent(
+                kind=kind_,
+                query=query_,
+                country=country_,
+                matched=matched,
+                results=results,
+                status=status,
+                ts=ts,
+                id=id_,
+            )
+            for id_, ts, kind_, query_, country_, matched, results, status in rows
+        ]
+
+
+def create_audit_log(
+    settings: Settings, stats: Optional[AuditStats] = None
+) -> Optional[AuditLog]:
+    """The configured audit log, or None when `settings.audit_log_path` is
+    unset."""
+
+    if settings.audit_log_path is None:
+        return None
+    return AuditLog(
+        settings.audit_log_path,
+        batch_size=settings.audit_batch_size,
+        flush_interval=settings.audit_flush_interval,
+        max_queue=settings.audit_queue_size,
+        overflow=settings.audit_overflow,
+        stats=stats,
+    )
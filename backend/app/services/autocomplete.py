@@ -0,0 +1,103 @@
+"""
+Prefix autocomplete index
+
+`PrefixIndex` keeps, per country, the record ordinals sorted by lowercased
+legal name. A completion request bisects to the first name at or after the
+prefix and walks forward while names still start with it, so the first `k`
+completions cost O(log n + k) instead of a scan. Names are read through the
+provider's own accessor rather than copied, so the index adds only a 4-byte
+ordinal per record on top of the provider's storage. Snapshots store the
+sorted ordinals, so opening one does not sort anything.
+"""
+
+from __future__ import annotations
+
+import heapq
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import chain, islice
+from typing import Callable, Iterable, Iterator, Mapping, Optional, Sequence
+
+
+class PrefixIndex:
+    """Per-country sorted ordinal arrays searched by bisect.
+
+    Parameters:
+      runs: Per country, the ordinals of its records sorted by name key (as
+        built by `build`, or stored with the data).
+      name_key: Returns the lowercased legal name of an ordinal.
+    """
+
+    def __init__(
+        self,
+        runs: Mapping[str, Sequence[int]],
+        name_key: Callable[[int], str],
+    ) -> None:
+        self._name_key = name_key
+        # Countries are kept in code order so merged results that tie on name
+        # come out ordered by country.
+        self._sorted = {country: runs[country] for country in sorted(runs)}
+
+    @classmethod
+    def build(
+        cls,
+        entries: Iterable[tuple[int, str, str]],
+        name_key: Callable[[int], str],
+    ) -> PrefixIndex:
+        """Sort `(ordinal, name_key, country)` entries of every record."""
+
+        grouped: defaultdict[str, list[tuple[str, int]]] = defaultdict(list)
+        for ordinal, key, country in entries:
+            grouped[country].append((key, ordinal))
+        runs = {
+            country: array("I", (ordinal for _, ordinal in sorted(rows)))
+            for country, rows in grouped.items()
+        }
+        return cls(runs, name_key)
+
+    def runs(self) -> dict[str, Sequence[int]]:
+        """Per country, its ordinals in name order (see the constructor)."""
+
+        return dict(self._sorted)
+
+    def _iter_country(self, ordinals: Sequence[int], prefix: str) -> Iterator[int]:
+        i = bisect_left(ordinals, prefix, key=self._name_key)
+        while i < len(ordinals):
+            ordinal = ordinals[i]
+            if not self._name_key(ordinal).startswith(prefix):
+                return
+            yield ordinal
+            i += 1
+
+    def complete(self, prefix: str, country: Optional[str], limit: int) -> list[int]:
+        """Ordinals of the first `limit` names starting with `prefix`.
+
+        `prefix` must already be lowercased. Without a country filter the
+        per-country runs are merged so results stay in (name, country) order.
+        """
+
+        if country is not None:
+            ordinals = self._sorted.get(country)
+            if ordinals is None:
+                return []
+            return list(islice(self._iter_country(ordinals, prefix), limit))
+
+        runs = [
+            self._iter_country(ordinals, prefix) for ordinals in self._sorted.values()
+        ]
+        merged = heapq.merge(*runs, key=self._name_key)
+        return list(islice(merged, limit))
+
+    def matches(self, prefix: str, country: Optional[str]) -> Iterator[int]:
+        """Ordinals of every name starting with `prefix`, country by country
+        and in name order within each."""
+
+        if country is not None:
+            ordinals = self._sorted.get(country)
+            if ordinals is None:
+                return iter(())
+            return self._iter_country(ordinals, prefix)
+        return chain.from_iterable(
+            self._iter_country(ordinals, prefix) for ordinals in self._sorted.values()
+        )
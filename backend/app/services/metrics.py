@@ -0,0 +1,361 @@
+"""
+Latency metrics and Prometheus exposition
+
+Dependency-free histograms, gauges and counters rendered in the Prometheus
+text format (version 0.0.4), plus the pieces that feed them:
+
+- `MetricsMiddleware` times every request and, for handlers that mark stages
+  with `stage_timer(request).lap(...)`, the time spent in each stage.
+- `InstrumentedDataProvider` times every call into the data provider.
+- Provider loads record their duration and dataset size.
+
+Metrics are opt-in (`METRICS_ENABLED`). When off, none of these objects are
+created: the middleware isn't installed, providers aren't wrapped and
+`stage_timer` hands out a shared no-op timer.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Container, Optional, Sequence
+
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .datasource import BusinessRecord, DataProvider, FuzzyMatch, SearchHit
+from .fuzzy import DEFAULT_THRESHOLD
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds (seconds) for latency histograms: 50us to 10s.
+LATENCY_BUCKETS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram keyed by label values."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [0] * (len(self.buckets) + 2)
+            series[i] += 1
+            series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        with self._lock:
+            snapshot = {k: list(v) for k, v in sorted(self._series.items())}
+        bounds = [_number(b) for b in self.buckets] + ["+Inf"]
+        for labelvalues, series in snapshot.items():
+            total = 0
+            for bound, count in zip(bounds, series[:-1], strict=True):
+                total += int(count)
+                le = _labels(self.labelnames, labelvalues, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {total}")
+            labels = _labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{labels} {total}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Last-set value per label values."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        with self._lock:
+            self._values[labelvalues] = value
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        with self._lock:
+            items = sorted(self._values.items())
+        for labelvalues, value in items:
+            labels = _labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}{labels} {_number(value)}")
+        return lines
+
+
+class Counter(Gauge):
+    """Monotonic count per label values."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, *labelvalues: str) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+
+class Metrics:
+    """The backend's metric families."""
+
+    def __init__(self) -> None:
+        self.request_seconds = Histogram(
+            "http_request_duration_seconds",
+            "End-to-end request latency by route.",
+            ("method", "route", "status"),
+        )
+        self.stage_seconds = Histogram(
+            "http_request_stage_seconds",
+            "Time spent in each stage of instrumented handlers.",
+            ("route", "stage"),
+        )
+        self.provider_call_seconds = Histogram(
+            "provider_call_duration_seconds",
+            "Latency of data provider calls.",
+            ("provider", "method"),
+        )
+        self.provider_load_seconds = Gauge(
+            "provider_load_duration_seconds",
+            "Duration of the most recent data provider load.",
+        )
+        self.provider_records = Gauge(
+            "provider_records",
+            "Records served by the current data provider.",
+        )
+        self.provider_loads = Counter(
+            "provider_loads_total",
+            "Data provider loads, including the initial one.",
+        )
+
+    def render(self) -> str:
+        families: list[_Metric] = [
+            self.request_seconds,
+            self.stage_seconds,
+            self.provider_call_seconds,
+            self.provider_load_seconds,
+            self.provider_records,
+            self.provider_loads,
+        ]
+        return "\n".join(line for f in families for line in f.render()) + "\n"
+
+
+class StageTimer:
+    """Splits one request's handling time into named stages.
+
+    The first stage runs from request arrival to the first `lap`, so it
+    covers routing, body parsing/validation and dependency resolution. The
+    middleware records the time from the last lap to the response start as
+    "serialization".
+    """
+
+    __slots__ = ("_last", "laps")
+
+    def __init__(self, started: float) -> None:
+        self._last = started
+        self.laps: list[tuple[str, float]] = []
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.laps.append((stage, now - self._last))
+        self._last = now
+
+    def finish(self) -> None:
+        if self.laps:
+            self.lap("serialization")
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def lap(self, stage: str) -> None:
+        pass
+
+
+_NOOP_TIMER = _NoopTimer()
+
+
+def stage_timer(request: Request) -> Any:
+    """The request's `StageTimer`, or a no-op timer when metrics are off."""
+
+    return request.scope.get("stage_timer", _NOOP_TIMER)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request and stage latencies."""
+
+    def __init__(self, app: ASGIApp, metrics: Metrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        timer = StageTimer(started)
+        scope["stage_timer"] = timer
+        status = "500"
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+                timer.finish()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            elapsed = time.perf_counter() - started
+            self.metrics.request_seconds.observe(elapsed, scope["method"], path, status)
+            for stage, seconds in timer.laps:
+                self.metrics.stage_seconds.observe(seconds, path, stage)
+
+
+class InstrumentedDataProvider(DataProvider):
+    """Times every call into an inner provider."""
+
+    def __init__(self, inner: DataProvider, metrics: Metrics) -> None:
+        self.inner = inner
+        self.blocking = inner.blocking
+        self._observe = metrics.provider_call_seconds.observe
+        self._name = type(inner).__name__
+
+    def _timed(self, method: str, started: float) -> None:
+        self._observe(time.perf_counter() - started, self._name, method)
+
+    def lookup_business(self, name: str, country: str) -> Optional[BusinessRecord]:
+        started = time.perf_counter()
+        try:
+            return self.inner.lookup_business(name, country)
+        finally:
+            self._timed("lookup_business", started)
+
+    def lookup_many(
+        self, keys: Sequence[tuple[str, str]]
+    ) -> list[Optional[BusinessRecord]]:
+        started = time.perf_counter()
+        try:
+            return self.inner.lookup_many(keys)
+        finally:
+            self._timed("lookup_many", started)
+
+    def match_business(
+        self, name: str, country: str, threshold: float = DEFAULT_THRESHOLD
+    ) -> Optional[FuzzyMatch]:
+        started = time.perf_counter()
+        try:
+            return self.inner.match_business(name, country, threshold=threshold)
+        finally:
+            self._timed("match_business", started)
+
+    def near_match(
+        self,
+        name: str,
+        country: str,
+        threshold: float = DEFAULT_THRESHOLD,
+        exclude: Container[tuple[str, str]] = frozenset(),
+    ) -> Optional[FuzzyMatch]:
+        started = time.perf_counter()
+        try:
+            return self.inner.near_match(name, country, threshold, exclude=exclude)
+        finally:
+            self._timed("near_match", started)
+
+    def search_businesses(
+        self, query: str, country: Optional[str] = None, limit: int = 10
+    ) -> list[BusinessRecord]:
+        started = time.perf_counter()
+        try:
+            return self.inner.search_businesses(query, country=country, limit=limit)
+        finally:
+            self._timed("search_businesses", started)
+
+    def search_ranked(
+        self, query: str, country: Optional[str] = None, limit: int = 10
+    ) -> list[SearchHit]:
+        started = time.perf_counter()
+        try:
+            return self.inner.search_ranked(query, country=country, limit=limit)
+        finally:
+            self._timed("search_ranked", started)
+
+    def autocomplete(
+        self, prefix: str, country: Optional[str] = None, limit: int = 10
+    ) -> list[BusinessRecord]:
+        started = time.perf_counter()
+        try:
+            return self.inner.autocomplete(prefix, country=country, limit=limit)
+        finally:
+            self._timed("autocomplete", started)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.inner, attr)
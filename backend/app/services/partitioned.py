@@ -0,0 +1,268 @@
+"""
+Country-partitioned, lazily loaded datasets
+
+Regional deployments mostly serve a handful of countries, so loading every
+country up front wastes startup time and memory. With `DATA_SEED_PATH`
+pointing at a directory holding one seed, snapshot or SQLite file per ISO2
+code (`US.jsonl`, `GB.snap`, `DE.sqlite`, ...), `PartitionedDataProvider`
+opens a country's partition on the first request for that country and keeps
+recently used partitions under a memory budget, evicting the least recently
+used ones beyond it.
+
+A partition's cost is estimated from its file size, so the budget bounds the
+on-disk bytes of resident partitions: parsed (dict/columnar) partitions
+typically take a small multiple of that in memory, while snapshots and SQLite
+files are paged in by the kernel and count their size regardless.
+
+Requests with a country go to that partition only. Searches and completions
+without one fan out over every partition (loading each in turn) and merge the
+per-country results; equal scores or names keep country code order. Nothing
+is evicted while a fan-out runs, so it opens each partition at most once;
+when the last running fan-out finishes, partitions beyond the budget are
+evicted again. Deployments serving many country-less queries want a budget
+that fits every partition, or each one reopens the evicted partitions.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Container, Iterator, Optional, Sequence
+
+from .datasource import BusinessRecord, DataProvider, FuzzyMatch, SearchHit
+from .fuzzy import DEFAULT_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+# Partition file names: ISO2 code plus a supported seed/snapshot suffix.
+_PARTITION_FILE = re.compile(
+    r"^([A-Za-z]{2})\.(json|jsonl|ndjson|snap|sqlite|db)$", re.IGNORECASE
+)
+
+
+@dataclass
+class PartitionStats:
+    """Cumulative load/eviction counters and the current resident set."""
+
+    loads: int = 0
+    evictions: int = 0
+    resident: int = 0
+    resident_bytes: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+def find_partitions(root: Path) -> dict[str, Path]:
+    """Map each ISO2 code to its partition file in `root`, in code order.
+
+    Raises ValueError when two files claim the same country.
+    """
+
+    found: dict[str, Path] = {}
+    for path in sorted(root.iterdir()):
+        m = _PARTITION_FILE.match(path.name)
+        if m is None or not path.is_file():
+            continue
+        code = m.group(1).upper()
+        if code in found:
+            raise ValueError(
+                f"Duplicate partitions for {code}: {found[code].name}, {path.name}"
+            )
+        found[code] = path
+    return dict(sorted(found.items()))
+
+
+class PartitionedDataProvider(DataProvider):
+    """Routes calls to per-country providers opened on first use.
+
+    Parameters:
+      root: Directory of partition files (see `find_partitions`).
+      open_partition: Builds the provider for one partition file.
+      budget_bytes: Upper bound on the summed file size of loaded partitions;
+        0 keeps every partition once loaded. The partition being used is
+        never evicted, even when it alone exceeds the budget, and nothing
+        is evicted until country-less fan-outs finish.
+      stats: Counters to update; pass a shared instance to keep totals
+        across reloads.
+    """
+
+    # Opening a partition reads it from disk.
+    blocking = True
+
+    def __init__(
+        self,
+        root: Path,
+        open_partition: Callable[[Path], DataProvider],
+        budget_bytes: int = 0,
+        stats: Optional[PartitionStats] = None,
+    ) -> None:
+        self._files = find_partitions(root)
+        self._open = open_partition
+        self._budget = budget_bytes
+        self.stats = stats if stats is not None else PartitionStats()
+        self.stats.resident = self.stats.resident_bytes = 0
+        # code -> (provider, estimated bytes), least recently used first.
+        self._loaded: OrderedDict[str, tuple[DataProvider, int]] = OrderedDict()
+        self._lock = threading.Lock()  # guards `_loaded`, `_fanouts`, `stats`
+        self._fanouts = 0  # running country-less calls; they pin partitions
+        # One lock per country so a partition is opened once, while other
+        # countries stay available.
+        self._load_locks = {code: threading.Lock() for code in self._files}
+
+    @property
+    def countries(self) -> list[str]:
+        """ISO2 codes with a partition, loaded or not."""
+
+        return list(self._files)
+
+    def loaded(self) -> list[str]:
+        """Codes of resident partitions, least recently used first."""
+
+        with self._lock:
+            return list(self._loaded)
+
+    def _partition(self, country: str) -> Optional[DataProvider]:
+        code = country.strip().upper()
+        path = self._files.get(code)
+        if path is None:
+            return None
+        with self._lock:
+            entry = self._loaded.get(code)
+            if entry is not None:
+                self._loaded.move_to_end(code)
+                return entry[0]
+        with self._load_locks[code]:
+            with self._lock:
+                entry = self._loaded.get(code)
+            if entry is not None:
+                return entry[0]
+            provider = self._open(path)
+            size = path.stat().st_size
+            with self._lock:
+                self._loaded[code] = (provider, size)
+                self.stats.loads += 1
+                self._evict(keep=code)
+            logger.info("Loaded partition %s (%d bytes)", code, size)
+            return provider
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """Drop least recently used partitions until within budget, unless a
+        fan-out is running. Called with `_lock` held."""
+
+        total = sum(size for _, size in self._loaded.values())
+        if self._budget > 0 and not self._fanouts:
+            for code in list(self._loaded):
+                if total <= self._budget:
+                    break
+                if code == keep:
+                    continue
+                # In-flight calls keep their reference; the partition is freed
+                # once they finish.
+                _, size = self._loaded.pop(code)
+                total -= size
+                self.stats.evictions += 1
+                logger.info("Evicted partition %s", code)
+        self.stats.resident = len(self._loaded)
+        self.stats.resident_bytes = total
+
+    def _each(self) -> Iterator[DataProvider]:
+        """Every partition, loading the missing ones; the budget is applied
+        once no fan-out is running."""
+
+        with self._lock:
+            self._fanouts += 1
+        try:
+            for code in self._files:
+                provider = self._partition(code)
+                if provider is not None:
+                    yield provider
+        finally:
+            with self._lock:
+                self._fanouts -= 1
+                self._evict()
+
+    def lookup_business(self, name: str, country: str) -> Optional[BusinessRecord]:
+        provider = self._partition(country)
+        if provider is None:
+            return None
+        return provider.lookup_business(name, country)
+
+    def lookup_many(
+        self, keys: Sequence[tuple[str, str]]
+    ) -> list[Optional[BusinessRecord]]:
+        """Bulk lookups, one inner bulk call per country."""
+
+        by_country: dict[str, list[int]] = {}
+        for i, (_, country) in enumerate(keys):
+            by_country.setdefault(country.strip().upper(), []).append(i)
+        out: list[Optional[BusinessRecord]] = [None] * len(keys)
+        for code, positions in by_country.items():
+            provider = self._partition(code)
+            if provider is None:
+                continue
+            found = provider.lookup_many([keys[i] for i in positions])
+            for i, rec in zip(positions, found, strict=True):
+                out[i] = rec
+        return out
+
+    def match_business(
+        self, name: str, country: str, threshold: float = DEFAULT_THRESHOLD
+    ) -> Optional[FuzzyMatch]:
+        provider = self._partition(country)
+        if provider is None:
+            return None
+        return provider.match_business(name, country, threshold=threshold)
+
+    def near_match(
+        self,
+        name: str,
+        country: str,
+        threshold: float = DEFAULT_THRESHOLD,
+        exclude: Container[tuple[str, str]] = frozenset(),
+    ) -> Optional[FuzzyMatch]:
+        provider = self._partition(country)
+        if provider is None:
+            return None
+        return provider.near_match(name, country, threshold, exclude=exclude)
+
+    def search_businesses(
+        self, query: str, country: Optional[str] = None, limit: int = 10
+    ) -> list[BusinessRecord]:
+        return [hit.record for hit in self.search_ranked(query, country, limit)]
+
+    def search_ranked(
+        self, query: str, country: Optional[str] = None, limit: int = 10
+    ) -> list[SearchHit]:
+        """Top `limit` matches; without a country, merged across partitions."""
+
+        if country:
+            provider = self._partition(country)
+            if provider is None:
+                return []
+            return provider.search_ranked(query, country, limit)
+        per_country = [p.search_ranked(query, None, limit) for p in self._each()]
+        merged = heapq.merge(*per_country, key=lambda hit: -hit.score)
+        return list(itertools.islice(merged, limit))
+
+    def autocomplete(
+        self, prefix: str, country: Optional[str] = None, limit: int = 10
+    ) -> list[BusinessRecord]:
+        """First `limit` names starting with `prefix`, in name order."""
+
+        if country:
+            provider = self._partition(country)
+            if provider is None:
+                return []
+            return provider.autocomplete(prefix, country, limit)
+        per_country = [p.autocomplete(prefix, None, limit) for p in self._each()]
+        merged = heapq.merge(
+            *per_country, key=lambda rec: (rec.legal_name.lower(), rec.country)
+        )
+        return list(itertools.islice(merged, limit))
@@ -0,0 +1,165 @@
+"""
+Provider selection and lifecycle
+
+Maps `Settings` to a concrete `DataProvider` and wraps it in a `Reloadable` so
+the app resolves its provider once at startup and picks up seed file changes
+from a background watcher instead of checking the filesystem per request.
+Optional layers (such as the lookup cache) are applied on every (re)load so
+they are rebuilt together with the data they front.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Sized
+from pathlib import Path
+from typing import Optional
+
+from ..config import Settings
+from .bloom import FilterStats, filter_provider
+from .cache import CachedDataProvider, CacheStats, LookupCache
+from .columnar import ColumnarDataProvider
+from .datasource import (
+    DataProvider,
+    FileDataProvider,
+    InMemoryDataProvider,
+    _MatchingDataProvider,
+)
+from .delta import DeltaDataProvider, DeltaStats
+from .metrics import InstrumentedDataProvider, Metrics
+from .partitioned import PartitionedDataProvider, PartitionStats
+from .reloader import Reloadable
+from .snapshot import SNAPSHOT_SUFFIX, SnapshotDataProvider
+from .sqlite import SQLITE_SUFFIXES, SqliteDataProvider
+
+ProviderRegistry = Reloadable[DataProvider]
+
+
+def open_provider(
+    settings: Settings,
+    partition_stats: Optional[PartitionStats] = None,
+    filter_stats: Optional[FilterStats] = None,
+) -> DataProvider:
+    """Build the provider described by `settings`.
+
+    - Missing seed path: the built-in in-memory sample dataset.
+    - Directory: one partition file per country, each opened on first use.
+    - Otherwise the single file, see `open_file`.
+    """
+
+    path = settings.seed_path
+    if not path.exists():
+        return InMemoryDataProvider()
+    if path.is_dir():
+        return PartitionedDataProvider(
+            path,
+            lambda part: open_file(part, settings, filter_stats),
+            budget_bytes=int(settings.partition_budget_mb * (1 << 20)),
+            stats=partition_stats,
+        )
+    return open_file(path, settings, filter_stats)
+
+
+def open_file(
+    path: Path, settings: Settings, filter_stats: Optional[FilterStats] = None
+) -> DataProvider:
+    """Open one dataset file.
+
+    - `.snap` file: a memory-mapped precompiled snapshot.
+    - `.sqlite` / `.db` file: an imported SQLite database, queried on disk.
+    - Otherwise a JSON / JSON Lines seed in dict or columnar storage.
+
+    With `settings.name_filter_fp_rate`, the file's provider is fronted by a
+    name filter (per partition, for partitioned layouts) counted in
+    `filter_stats`.
+    """
+
+    provider: _MatchingDataProvider
+    if path.suffix == SNAPSHOT_SUFFIX:
+        # Precompiled snapshots are memory-mapped, not parsed.
+        provider = SnapshotDataProvider(path)
+    elif path.suffix in SQLITE_SUFFIXES:
+        provider = SqliteDataProvider(path)
+    elif settings.data_store == "columnar":
+        provider = ColumnarDataProvider.from_seed(path, workers=settings.seed_workers)
+    else:
+        provider = FileDataProvider(
+            path, stream=settings.seed_streaming, workers=settings.seed_workers
+        )
+    if settings.warm_indexes:
+        provider.warm()
+    if settings.name_filter_fp_rate > 0:
+        return filter_provider(provider, settings.name_filter_fp_rate, filter_stats)
+    return provider
+
+
+def create_provider_registry(
+    settings: Settings,
+    cache_stats: Optional[CacheStats] = None,
+    completion_stats: Optional[CacheStats] = None,
+    metrics: Optional[Metrics] = None,
+    partition_stats: Optional[PartitionStats] = None,
+    delta_stats: Optional[DeltaStats] = None,
+    filter_stats: Optional[FilterStats] = None,
+) -> ProviderRegistry:
+    """Load the configured provider and watch its seed file for changes.
+
+    When `settings.cache_size` (lookups) or `settings.autocomplete_cache_size`
+    is positive every loaded provider is fronted by new caches, so a seed
+    change invalidates all cached results; `cache_stats` and
+    `completion_stats` accumulate counters across those rebuilds. With
+    `metrics`, loads are timed and every provider call is recorded. With
+    `settings.warm_indexes`, lazily built indexes are built as part of the
+    load (of each partition, for partitioned layouts). `partition_stats`
+    accumulates partition loads and evictions across reloads. With
+    `settings.delta_dir`, every load replays the directory's change sets over
+    the (cached) provider into `delta_stats`; see `DeltaFeed` for new files.
+    Name filters sit below the caches and count into `filter_stats`.
+    """
+
+    stats = cache_stats if cache_stats is not None else CacheStats()
+    prefix_stats = completion_stats if completion_stats is not None else CacheStats()
+
+    def load() -> DataProvider:
+        started = time.perf_counter()
+        provider = open_provider(settings, partition_stats, filter_stats)
+        if metrics is not None:
+            metrics.provider_load_seconds.set(time.perf_counter() - started)
+            if isinstance(provider, Sized):
+                metrics.provider_records.set(len(provider))
+            metrics.provider_loads.inc()
+        cache: Optional[LookupCache] = None
+        completions: Optional[LookupCache] = None
+        if settings.cache_size > 0:
+            cache = LookupCache(
+                settings.cache_size,
+                ttl=settings.cache_ttl,
+                negative_ttl=settings.cache_negative_ttl,
+                stats=stats,
+            )
+        if settings.autocomplete_cache_size > 0:
+            completions = LookupCache(
+                settings.autocomplete_cache_size,
+                ttl=settings.autocomplete_cache_ttl,
+                negative_ttl=settings.autocomplete_cache_ttl,
+                stats=prefix_stats,
+            )
+        if cache is not None or completions is not None:
+            provider = CachedDataProvider(provider, cache, completions)
+        if settings.delta_dir is not None:
+            # Over the caches: they front the unchanging base, so applying a
+            # delta never has to invalidate them.
+            delta = DeltaDataProvider(provider, settings.delta_dir, stats=delta_stats)
+            delta.sync()
+            provider = delta
+        if metrics is not None:
+            # Outermost, so cache hits are timed too.
+            provider = InstrumentedDataProvider(provider, metrics)
+        return provider
+
+    return Reloadable(
+        load,
+        watch=settings.seed_path,
+        interval=settings.reload_interval,
+        name="data provider",
+    )
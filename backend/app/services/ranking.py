@@ -0,0 +1,70 @@
+"""
+Search relevance scoring
+
+`relevance` scores a substring match of a query against a legal name so
+search results can be ranked instead of returned in insertion order. Match
+kinds are tiered and never overlap:
+
+- exact name            0.8
+- name prefix           0.6
+- token prefix          0.4  ("acme" in "The Acme Group")
+- other substring       0.2  ("acme" in "Pacmem Ltd")
+
+Within a tier, names the query covers more of (closer to exact) score up to
+0.1 higher, and Active registrations get a further 0.1, so an exact Active
+match scores 1.0.
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Iterable, TypeVar
+
+T = TypeVar("T")
+# A score, or a score followed by a tie-breaker.
+S = TypeVar("S", float, tuple[float, int])
+
+EXACT = 0.8
+PREFIX = 0.6
+TOKEN_PREFIX = 0.4
+SUBSTRING = 0.2
+
+_COVERAGE_WEIGHT = 0.1
+_ACTIVE_BONUS = 0.1
+
+
+def match_tier(q: str, name_key: str) -> float:
+    """Tier of a lowercased name that is known to contain `q`."""
+
+    if name_key == q:
+        return EXACT
+    if name_key.startswith(q):
+        return PREFIX
+    i = name_key.find(q, 1)
+    while i != -1:
+        if not name_key[i - 1].isalnum():
+            return TOKEN_PREFIX
+        i = name_key.find(q, i + 1)
+    return SUBSTRING
+
+
+def relevance(q: str, name_key: str, registration_status: str) -> float:
+    """Score in (0, 1] of `name_key` (lowercased, contains `q`) for query `q`."""
+
+    score = match_tier(q, name_key) + _COVERAGE_WEIGHT * len(q) / len(name_key)
+    if registration_status == "Active":
+        score += _ACTIVE_BONUS
+    return round(score, 4)
+
+
+def top_k(scored: Iterable[tuple[S, T]], k: int) -> list[tuple[S, T]]:
+    """The `k` highest-scoring items, best first.
+
+    Uses a bounded heap, so only `k` items are held regardless of how many
+    matches are scored. Equal scores keep their input order; a `(score,
+    tie-breaker)` pair orders them by the tie-breaker instead, highest first.
+    """
+
+    if k <= 0:
+        return []
+    return heapq.nlargest(k, scored, key=lambda item: item[0])
@@ -0,0 +1,356 @@
+"""
+Async registry lookups and multi-registry fan-out
+
+Real registry integrations are network calls, so they implement the async
+`AsyncDataProvider` interface instead of the synchronous `DataProvider` and
+never pin a threadpool thread while waiting on a response.
+
+`FanOutProvider` queries several registries concurrently and returns the first
+authoritative answer (a found record), cancelling the rest. Each source has
+its own timeout and can optionally be hedged: if it has not answered after
+`hedge_after` seconds a second, identical request is sent and whichever
+returns first is used. End-to-end latency is therefore bounded by the slowest
+source that has to answer (or the overall budget), not the sum of all of them.
+
+The budget is also published as a deadline (`deadline` / `time_left`) in a
+context variable, so clients can bound each network call, including retries,
+by the time the request has left.
+
+Batches go through `lookup_many`. Sources with a bulk call (the local
+dataset) answer all keys at once; registries are then asked, key by key and
+with the same timeouts and hedging as single lookups, only for the keys no
+bulk source found.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import partial
+from typing import Awaitable, Callable, Iterator, Optional, Sequence, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
+
+from .datasource import BusinessRecord, DataProvider
+
+logger = logging.getLogger(__name__)
+
+# Default end-to-end budget for a fan-out lookup, leaving headroom under the
+# PRD's 3-second response target for screening and serialization.
+DEFAULT_BUDGET_SECONDS = 2.5
+
+# Lookups a per-key `lookup_many` keeps in flight at once.
+MAX_CONCURRENT_LOOKUPS = 32
+
+_T = TypeVar("_T")
+
+# Monotonic time by which registry calls in the current context must finish.
+_deadline: ContextVar[Optional[float]] = ContextVar("registry_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[float]:
+    """Bound registry calls made in this context to `seconds` from now.
+
+    An enclosing deadline that expires earlier still applies. Tasks created
+    inside the block inherit the deadline. Yields the effective deadline.
+    """
+
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        at = min(at, current)
+    token = _deadline.set(at)
+    try:
+        yield at
+    finally:
+        _deadline.reset(token)
+
+
+def time_left() -> Optional[float]:
+    """Seconds until the current deadline (negative once passed), or None."""
+
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+class RegistryUnavailable(ConnectionError):
+    """A registry cannot be used right now (e.g. its circuit is open).
+
+    Raised without waiting on the network; callers treat it like any other
+    transport failure.
+    """
+
+
+class AsyncDataProvider:
+    """Async interface for business lookups by name and country.
+
+    Implementations return a `BusinessRecord` when the business is found and
+    `None` when it is not; transport failures should raise. Providers that
+    answer `lookup_many` in one call rather than key by key set
+    `bulk = True`.
+    """
+
+    name: str = "registry"
+    bulk: bool = False
+
+    async def lookup_business(
+        self, name: str, country: str
+    ) -> Optional[BusinessRecord]:  # noqa: D401
+        """Look up a business by name and country."""
+
+        raise NotImplementedError
+
+    async def lookup_many(
+        self, keys: Sequence[tuple[str, str]]
+    ) -> list[Optional[BusinessRecord]]:
+        """Look up several `(name, country)` keys; results follow `keys`.
+
+        The default runs `lookup_business` for each key, at most
+        `MAX_CONCURRENT_LOOKUPS` at a time.
+        """
+
+        return await gather_limited(
+            [partial(self.lookup_business, name, country) for name, country in keys]
+        )
+
+
+async def gather_limited(calls: Sequence[Callable[[], Awaitable[_T]]]) -> list[_T]:
+    """Await `calls` concurrently, at most `MAX_CONCURRENT_LOOKUPS` at a time.
+
+    The first failure is raised and the remaining calls are cancelled.
+    """
+
+    gate = asyncio.Semaphore(MAX_CONCURRENT_LOOKUPS)
+
+    async def run(call: Callable[[], Awaitable[_T]]) -> _T:
+        async with gate:
+            return await call()
+
+    tasks = [asyncio.ensure_future(run(call)) for call in calls]
+    try:
+        return list(await asyncio.gather(*tasks))
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+class SyncProviderAdapter(AsyncDataProvider):
+    """Exposes a synchronous `DataProvider` through the async interface.
+
+    The provider is fetched through `get_provider` on every call so hot
+    reloads are honoured. In-memory providers are called inline; providers
+    flagged `blocking` run on the threadpool.
+    """
+
+    name = "local"
+    bulk = True
+
+    def __init__(self, get_provider: Callable[[], DataProvider]) -> None:
+        self._get_provider = get_provider
+
+    async def lookup_business(
+        self, name: str, country: str
+    ) -> Optional[BusinessRecord]:
+        provider = self._get_provider()
+        if provider.blocking:
+            return await run_in_threadpool(provider.lookup_business, name, country)
+        return provider.lookup_business(name, country)
+
+    async def lookup_many(
+        self, keys: Sequence[tuple[str, str]]
+    ) -> list[Optional[BusinessRecord]]:
+        provider = self._get_provider()
+        if provider.blocking:
+            return await run_in_threadpool(provider.lookup_many, keys)
+        return provider.lookup_many(keys)
+
+
+@dataclass(frozen=True)
+class RegistrySource:
+    """One registry queried by `FanOutProvider`.
+
+    Attributes:
+      provider: The registry client.
+      timeout: Seconds to wait for this registry (including any hedge).
+      hedge_after: Send a duplicate request if no answer arrives within this
+        many seconds; None disables hedging.
+      countries: ISO2 codes the registry covers; None means all countries.
+    """
+
+    provider: AsyncDataProvider
+    timeout: float = 1.0
+    hedge_after: Optional[float] = None
+    countries: Optional[frozenset[str]] = None
+
+    def covers(self, country: str) -> bool:
+        return self.countries is None or country in self.countries
+
+
+async def _first_success(
+    tasks: set[asyncio.Task[Optional[BusinessRecord]]],
+) -> Optional[BusinessRecord]:
+    """Return the result of the first task to succeed; re-raise if all fail."""
+
+    error: Optional[BaseException] = None
+    pending = tasks
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() is None:
+                return task.result()
+            error = task.exception()
+    assert error is not None
+    raise error
+
+
+class FanOutProvider(AsyncDataProvider):
+    """Concurrent lookup across several registries; first record wins.
+
+    Sources that fail or time out count as "not found". When no source finds
+    the business within `budget` seconds the result is `None`, which the
+    verify endpoint already maps to an Unknown registration.
+    """
+
+    name = "fan-out"
+
+    def __init__(
+        self,
+        sources: Sequence[RegistrySource],
+        budget: float = DEFAULT_BUDGET_SECONDS,
+    ) -> None:
+        self._sources = list(sources)
+        self._budget = budget
+
+    @staticmethod
+    @contextmanager
+    def _failures_logged(source: RegistrySource) -> Iterator[None]:
+        """Log and swallow a failed or timed-out call to `source`."""
+
+        try:
+            yield
+        except RegistryUnavailable as e:
+            # Expected while a registry is down; no traceback per request.
+            logger.warning("Registry %s unavailable: %s", source.provider.name, e)
+        except TimeoutError:
+            logger.warning(
+                "Registry %s timed out after %.2fs",
+                source.provider.name,
+                source.timeout,
+            )
+        except Exception:
+            logger.exception("Registry %s lookup failed", source.provider.name)
+
+    async def _ask(
+        self, source: RegistrySource, name: str, country: str
+    ) -> Optional[BusinessRecord]:
+        """Query one source within its timeout, hedging if configured."""
+
+        def attempt() -> asyncio.Task[Optional[BusinessRecord]]:
+            return asyncio.create_task(source.provider.lookup_business(name, country))
+
+        tasks: set[asyncio.Task[Optional[BusinessRecord]]] = set()
+        with self._failures_logged(source):
+            try:
+                async with asyncio.timeout(source.timeout):
+                    with deadline(source.timeout):
+                        tasks.add(attempt())
+                        if source.hedge_after is not None:
+                            done, _ = await asyncio.wait(
+                                tasks, timeout=source.hedge_after
+                            )
+                            if not done:
+                                tasks.add(attempt())
+                    return await _first_success(tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+        return None
+
+    async def _ask_bulk(
+        self, source: RegistrySource, keys: Sequence[tuple[str, str]]
+    ) -> list[Optional[BusinessRecord]]:
+        """One `lookup_many` call to a bulk source for the keys it covers."""
+
+        out: list[Optional[BusinessRecord]] = [None] * len(keys)
+        covered = [
+            i for i, (_, c) in enumerate(keys) if source.covers(c.strip().upper())
+        ]
+        if not covered:
+            return out
+        with self._failures_logged(source):
+            async with asyncio.timeout(source.timeout):
+                with deadline(source.timeout):
+                    found = await source.provider.lookup_many(
+                        [keys[i] for i in covered]
+                    )
+            for i, rec in zip(covered, found, strict=True):
+                out[i] = rec
+        return out
+
+    async def lookup_business(
+        self, name: str, country: str
+    ) -> Optional[BusinessRecord]:
+        """Query all covering sources concurrently; return the first record."""
+
+        return await self._lookup(name, country, self._sources)
+
+    async def lookup_many(
+        self, keys: Sequence[tuple[str, str]]
+    ) -> list[Optional[BusinessRecord]]:
+        """Ask bulk sources for every key, then the others for the misses.
+
+        A record from a bulk source is as authoritative as any, so only keys
+        none of them found cost registry round trips. Each of those is a
+        fan-out of its own, bounded by `budget`.
+        """
+
+        bulk = [s for s in self._sources if s.provider.bulk]
+        rest = [s for s in self._sources if not s.provider.bulk]
+        out: list[Optional[BusinessRecord]] = [None] * len(keys)
+        answers = await asyncio.gather(*(self._ask_bulk(s, keys) for s in bulk))
+        for found in answers:
+            out = [
+                prev if prev is not None else rec
+                for prev, rec in zip(out, found, strict=True)
+            ]
+
+        missing = [i for i, rec in enumerate(out) if rec is None]
+        if rest and missing:
+            found = await gather_limited(
+                [partial(self._lookup, *keys[i], rest) for i in missing]
+            )
+            for i, rec in zip(missing, found, strict=True):
+                out[i] = rec
+        return out
+
+    async def _lookup(
+        self, name: str, country: str, sources: Sequence[RegistrySource]
+    ) -> Optional[BusinessRecord]:
+        code = country.strip().upper()
+        with deadline(self._budget):
+            pending = {
+                asyncio.create_task(self._ask(source, name, country))
+                for source in sources
+                if source.covers(code)
+            }
+        try:
+            async with asyncio.timeout(self._budget):
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        rec = task.result()
+                        if rec is not None:
+                            return rec
+        except TimeoutError:
+            logger.warning("Registry fan-out exceeded %.2fs budget", self._budget)
+        finally:
+            for task in pending:
+                task.cancel()
+        return None
@@ -0,0 +1,549 @@
+"""
+Pooled HTTP client for registry backends
+
+Registry integrations are HTTP APIs. `RegistryClient` is the transport they
+share, and `HTTPRegistry` is the `AsyncDataProvider` on top of it:
+
+- Keep-alive connections, pooled per registry host and event loop, so a
+  lookup does not pay a TCP (and TLS) handshake. Requests use HTTP/1.1 on
+  asyncio streams: the standard library has no HTTP/2 client and the
+  backend takes no third-party HTTP dependency.
+- Deadlines: an attempt waits at most `timeout` seconds and never past the
+  deadline of the request it serves (`registries.deadline`), so retries
+  cannot outlive the caller's budget.
+- Circuit breaker: after `failure_threshold` consecutive failed calls (any
+  call without a usable answer, including a 429 or a 200 whose body is not
+  a valid record, but not a 404 or another client error such as 401) the
+  client fails fast with `RegistryUnavailable` for
+  `reset_timeout` seconds, then lets a single trial call through. The
+  fan-out treats that as "not found", which `/verify` reports as an Unknown
+  registration.
+- Retry budget: failed attempts (transport errors, timeouts, malformed
+  responses, 408, 429 and 5xx) are retried only while the budget has tokens,
+  which requests earn at a fixed ratio, so a struggling registry never sees
+  its load multiplied.
+
+Registries answer `GET <base>/businesses?name=...&country=...` with a record
+object (the seed schema) and 200, or 404 (with any body) when the business
+is unknown.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import ssl
+import threading
+import time
+import weakref
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Optional
+from urllib.parse import urlencode, urlsplit
+
+from ..config import Settings
+from .datasource import BusinessRecord, _to_record
+from .registries import AsyncDataProvider, RegistryUnavailable, time_left
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT_SECONDS = 1.0
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Largest response body accepted from a registry.
+MAX_BODY_BYTES = 1 << 20
+
+
+class RegistryError(Exception):
+    """A registry answered, but not with a usable response."""
+
+
+@dataclass
+class RegistryClientStats:
+    """Cumulative counters across every registry client.
+
+    `failures` counts calls that failed after their last attempt, `rejected`
+    calls refused by an open circuit, `retries_denied` retries the budget
+    did not allow.
+    """
+
+    requests: int = 0
+    attempts: int = 0
+    retries: int = 0
+    retries_denied: int = 0
+    failures: int = 0
+    rejected: int = 0
+    connections_opened: int = 0
+    connections_reused: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    Closed: calls pass. After `failure_threshold` consecutive failures it
+    opens and refuses calls. Every `reset_timeout` seconds while open one
+    trial call passes; its success closes the circuit, its failure keeps it
+    open for another `reset_timeout`.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._threshold = failure_threshold
+        self._reset = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        """One of "closed", "open" or "half_open" (a trial call may pass)."""
+
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._clock() - self._opened_at >= self._reset:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may proceed now."""
+
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            now = self._clock()
+            if now - self._opened_at < self._reset:
+                return False
+            # Re-arm, so only this call is the trial for the next period.
+            self._opened_at = now
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._opened_at is not None or self._failures >= self._threshold:
+                self._opened_at = self._clock()
+
+
+class RetryBudget:
+    """Token bucket limiting retries to a fraction of requests.
+
+    Every request deposits `ratio` tokens and every retry spends one;
+    `min_per_second` tokens also accrue over time so a quiet client can
+    still retry now and then. At most `max_tokens` are saved up.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.1,
+        min_per_second: float = 1.0,
+        max_tokens: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ratio = ratio
+        self._min_per_second = min_per_second
+        self._max_tokens = max_tokens
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = max_tokens
+        self._updated = clock()
+
+    def _refill(self, amount: float) -> None:
+        now = self._clock()
+        earned = amount + (now - self._updated) * self._min_per_second
+        self._tokens = min(self._max_tokens, self._tokens + earned)
+        self._updated = now
+
+    def deposit(self) -> None:
+        """Credit one request."""
+
+        with self._lock:
+            self._refill(self._ratio)
+
+    def withdraw(self) -> bool:
+        """Spend one retry token; False when the budget is exhausted."""
+
+        with self._lock:
+            self._refill(0.0)
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+
+class _Connection:
+    """One HTTP/1.1 connection; `reused` once it has served a response."""
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+@dataclass
+class _LoopPool:
+    """Connections and slots of one event loop (streams are loop-bound)."""
+
+    slots: asyncio.Semaphore
+    idle: list[_Connection] = field(default_factory=list)
+
+
+class ConnectionPool:
+    """Keep-alive connections to one host.
+
+    At most `max_size` connections are in use at once per event loop, and up
+    to `max_size` idle ones are kept for reuse.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        tls: Optional[ssl.SSLContext] = None,
+        max_size: int = DEFAULT_POOL_SIZE,
+        stats: Optional[RegistryClientStats] = None,
+    ) -> None:
+        self._host = host
+        self._port = port
+        self._tls = tls
+        self._max_size = max_size
+        self.stats = stats if stats is not None else RegistryClientStats()
+        self._loops: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopPool] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _pool(self) -> _LoopPool:
+        loop = asyncio.get_running_loop()
+        pool = self._loops.get(loop)
+        if pool is None:
+            pool = self._loops[loop] = _LoopPool(asyncio.Semaphore(self._max_size))
+        return pool
+
+    async def acquire(self, fresh: bool = False) -> _Connection:
+        """An idle connection (unless `fresh`) or a new one.
+
+        Waits for a free slot; every acquired connection must be passed to
+        `release`.
+        """
+
+        pool = self._pool()
+        await pool.slots.acquire()
+        try:
+            while pool.idle and not fresh:
+                conn = pool.idle.pop()
+                if not conn.writer.is_closing() and not conn.reader.at_eof():
+                    self.stats.connections_reused += 1
+                    return conn
+                conn.close()
+            reader, writer = await asyncio.open_connection(
+                self._host,
+                self._port,
+                ssl=self._tls,
+                server_hostname=self._host if self._tls else None,
+            )
+            self.stats.connections_opened += 1
+            return _Connection(reader, writer)
+        except BaseException:
+            pool.slots.release()
+            raise
+
+    def release(self, conn: _Connection, reuse: bool) -> None:
+        """Return a connection; it is closed unless `reuse` and there is room."""
+
+        pool = self._pool()
+        pool.slots.release()
+        if reuse and len(pool.idle) < self._max_size:
+            conn.reused = True
+            pool.idle.append(conn)
+        else:
+            conn.close()
+
+    def close(self) -> None:
+        """Close every idle connection."""
+
+        for pool in list(self._loops.values()):
+            while pool.idle:
+                pool.idle.pop().close()
+
+
+async def _read_response(reader: asyncio.StreamReader) -> tuple[int, bytes, bool]:
+    """Read one response: `(status, body, connection reusable)`."""
+
+    try:
+        return await _read_message(reader)
+    except ValueError as e:
+        # Bad lengths or chunk sizes, or a line over the reader's limit.
+        raise RegistryError(f"Malformed response: {e}") from e
+
+
+async def _read_message(reader: asyncio.StreamReader) -> tuple[int, bytes, bool]:
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError("Connection closed by registry")
+    try:
+        version, status, _ = status_line.decode("latin-1").split(" ", 2)
+        code = int(status)
+    except ValueError as e:
+        raise RegistryError(f"Malformed status line: {status_line!r}") from e
+    headers: dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    reusable = version == "HTTP/1.1" and headers.get("connection") != "close"
+    if "content-length" in headers:
+        length = int(headers["content-length"])
+        if length > MAX_BODY_BYTES:
+            raise RegistryError(f"Response too large: {length} bytes")
+        body = await reader.readexactly(length)
+    elif headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = bytearray()
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                break
+            if len(chunks) + size > MAX_BODY_BYTES:
+                raise RegistryError("Response too large")
+            chunks += await reader.readexactly(size)
+            await reader.readexactly(2)
+        body = bytes(chunks)
+    else:
+        # Delimited by the end of the connection.
+        body = await reader.read(MAX_BODY_BYTES)
+        reusable = False
+    return code, body, reusable
+
+
+class RegistryClient:
+    """JSON-over-HTTP client for one registry base URL.
+
+    Parameters:
+      base_url: `http://` or `https://` URL; request paths are appended.
+      timeout: Seconds per attempt (shortened by the current deadline).
+      pool_size: Connections per event loop (see `ConnectionPool`).
+      max_attempts: Attempts per call, retries included.
+      breaker: Circuit breaker (default: 5 failures, 30 s).
+      retry_budget: Retry budget (default: 10% of requests).
+      stats: Counters to update; pass a shared instance to aggregate clients.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        breaker: Optional[CircuitBreaker] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        stats: Optional[RegistryClientStats] = None,
+    ) -> None:
+        url = urlsplit(base_url)
+        if url.scheme not in ("http", "https") or not url.hostname:
+            raise ValueError(f"Invalid registry URL: {base_url!r}")
+        tls = ssl.create_default_context() if url.scheme == "https" else None
+        self.host = url.hostname
+        self._host_header = url.netloc
+        self._prefix = url.path.rstrip("/")
+        self._timeout = timeout
+        self._max_attempts = max_attempts
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.retry_budget = retry_budget if retry_budget is not None else RetryBudget()
+        self.stats = stats if stats is not None else RegistryClientStats()
+        self._pool = ConnectionPool(
+            url.hostname,
+            url.port or (443 if tls else 80),
+            tls=tls,
+            max_size=pool_size,
+            stats=self.stats,
+        )
+
+    async def get_json(
+        self,
+        path: str,
+        params: Optional[dict[str, str]] = None,
+        parse: Optional[Callable[[int, Any], Any]] = None,
+    ) -> tuple[int, Any]:
+        """GET `path` and return `(status, decoded JSON body or None)`, the
+        body passed through `parse` if given.
+
+        Answers are 404, whatever its body (which is not decoded), and 2xx
+        responses whose body decodes and passes `parse` (which maps
+        `(status, body)` to the returned value and raises ValueError for
+        unusable ones). Transport errors, timeouts, malformed bodies, 408,
+        429 and 5xx are retried within the budget and the deadline, and a
+        call that ends in one of them counts against the circuit breaker.
+        Other 4xx are client errors: not retried and not held against the
+        registry. Every call without an answer raises `RegistryUnavailable`,
+        as does an open circuit.
+        """
+
+        self.stats.requests += 1
+        if not self.breaker.allow():
+            self.stats.rejected += 1
+            raise RegistryUnavailable(f"{self.host}: circuit open")
+        self.retry_budget.deposit()
+        target = self._prefix + path + ("?" + urlencode(params) if params else "")
+        attempt = 0
+        while True:
+            attempt += 1
+            self.stats.attempts += 1
+            try:
+                status, body = await self._attempt(target)
+            except (
+                OSError,
+                TimeoutError,
+                asyncio.IncompleteReadError,
+                RegistryError,
+            ) as e:
+                error = f"{type(e).__name__}: {e}"
+            else:
+                if 200 <= status < 300 or status == 404:
+                    try:
+                        value = None
+                        if body and status != 404:
+                            value = json.loads(body)
+                        if parse is not None:
+                            value = parse(status, value)
+                    except ValueError as e:
+                        error = f"invalid HTTP {status} response: {e}"
+                    else:
+                        self.breaker.record_success()
+                        return status, value
+                elif 400 <= status < 500 and status not in (408, 429):
+                    # The registry is up and will answer the same again.
+                    self.breaker.record_success()
+                    self.stats.failures += 1
+                    raise RegistryUnavailable(f"{self.host}: HTTP {status}")
+                else:
+                    error = f"HTTP {status}"
+
+            left = time_left()
+            if attempt >= self._max_attempts:
+                break
+            if left is not None and left <= 0:
+                break
+            if not self.retry_budget.withdraw():
+                self.stats.retries_denied += 1
+                break
+            self.stats.retries += 1
+        self.stats.failures += 1
+        self.breaker.record_failure()
+        raise RegistryUnavailable(f"{self.host}: {error} after {attempt} attempt(s)")
+
+    async def _attempt(self, target: str) -> tuple[int, bytes]:
+        timeout = self._timeout
+        left = time_left()
+        if left is not None:
+            timeout = min(timeout, left)
+        if timeout <= 0:
+            raise TimeoutError("Deadline exceeded")
+        request = (
+            f"GET {target} HTTP/1.1\r\n"
+            f"Host: {self._host_header}\r\n"
+            "Accept: application/json\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        ).encode("latin-1")
+        async with asyncio.timeout(timeout):
+            conn = await self._pool.acquire()
+            try:
+                return await self._send(conn, request)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                if not conn.reused:
+                    raise
+            # The registry closed an idle keep-alive connection; that is not
+            # a failed attempt.
+            return await self._send(await self._pool.acquire(fresh=True), request)
+
+    async def _send(self, conn: _Connection, request: bytes) -> tuple[int, bytes]:
+        """Send `request` on `conn` and release it back to the pool."""
+
+        try:
+            conn.writer.write(request)
+            await conn.writer.drain()
+            status, body, reuse = await _read_response(conn.reader)
+        except BaseException:
+            self._pool.release(conn, reuse=False)
+            raise
+        self._pool.release(conn, reuse=reuse)
+        return status, body
+
+    def close(self) -> None:
+        """Close idle pooled connections."""
+
+        self._pool.close()
+
+
+class HTTPRegistry(AsyncDataProvider):
+    """Registry provider over a `RegistryClient` (see the module docstring
+    for the wire format)."""
+
+    def __init__(self, client: RegistryClient, name: Optional[str] = None) -> None:
+        self.client = client
+        self.name = name or client.host
+
+    async def lookup_business(
+        self, name: str, country: str
+    ) -> Optional[BusinessRecord]:
+        rec: Optional[BusinessRecord]
+        _, rec = await self.client.get_json(
+            "/businesses",
+            {"name": name.strip(), "country": country.strip().upper()},
+            parse=_parse_business,
+        )
+        return rec
+
+
+def _parse_business(status: int, body: Any) -> Optional[BusinessRecord]:
+    """The record in a 200 response, None for 404; ValueError otherwise."""
+
+    if status == 404:
+        return None
+    if status != 200:
+        raise ValueError("expected 200 or 404")
+    return _to_record(0, body)
+
+
+def create_http_registries(
+    settings: Settings, stats: Optional[RegistryClientStats] = None
+) -> list[HTTPRegistry]:
+    """One `HTTPRegistry` per `settings.registry_urls` entry, sharing `stats`."""
+
+    return [
+        HTTPRegistry(
+            RegistryClient(
+                url,
+                timeout=settings.registry_timeout,
+                pool_size=settings.registry_pool_size,
+                breaker=CircuitBreaker(
+                    settings.registry_breaker_failures, settings.registry_breaker_reset
+                ),
+                retry_budget=RetryBudget(settings.registry_retry_ratio),
+                stats=stats,
+            )
+        )
+        for url in settings.registry_urls
+    ]
@@ -0,0 +1,127 @@
+"""
+Hot-reloadable resources
+
+`Reloadable` holds the current value of something built from a file (a data
+provider, a compiled watchlist, ...) and rebuilds it off the request path when
+the file changes. Readers just read `.current`: the new value is built fully in
+a background thread and then published with a single reference assignment, so
+in-flight requests keep the object they already hold and never observe a
+half-built one.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# (inode, size, mtime_ns) of a watched file, or None when it is missing.
+_Signature = Optional[tuple[int, int, int]]
+
+
+def _signature(path: Path) -> _Signature:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+class Reloadable(Generic[T]):
+    """A value rebuilt in the background whenever a watched file changes.
+
+    Parameters:
+      loader: Builds a fresh value; called once eagerly and again per change.
+      watch: File whose changes trigger a reload. None disables watching.
+      interval: Seconds between change checks once `start()` is called.
+      name: Label used in log messages.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], T],
+        watch: Optional[Path] = None,
+        interval: float = 2.0,
+        name: str = "resource",
+    ) -> None:
+        self._loader = loader
+        self._watch = watch
+        self._interval = interval
+        self._name = name
+        self._lock = threading.Lock()  # serializes reloads, never held by readers
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._signature = _signature(watch) if watch is not None else None
+        self._current = loader()
+        self.generation = 0
+
+    @property
+    def current(self) -> T:
+        """The most recently published value."""
+
+        return self._current
+
+    def reload(self) -> None:
+        """Build a new value and publish it atomically.
+
+        Exceptions from the loader propagate and leave the current value in
+        place.
+        """
+
+        with self._lock:
+            signature = _signature(self._watch) if self._watch is not None else None
+            value = self._loader()
+            self._signature = signature
+            self._current = value
+            self.generation += 1
+        logger.info("Reloaded %s (generation %d)", self._name, self.generation)
+
+    def check(self) -> bool:
+        """Reload if the watched file changed since the last load.
+
+        Returns True when a new value was published. A missing file keeps the
+        current value; failed rebuilds are logged and retried on the next check.
+        """
+
+        if self._watch is None:
+            return False
+        signature = _signature(self._watch)
+        if signature is None or signature == self._signature:
+            return False
+        try:
+            self.reload()
+        except Exception:
+            logger.exception("Failed to reload %s from %s", self._name, self._watch)
+            # Remember the bad version so it is not rebuilt every interval.
+            self._signature = signature
+            return False
+        return True
+
+    def start(self) -> None:
+        """Start the background watcher thread (no-op if not watching)."""
+
+        if self._watch is None or self._interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"reload-{self._name}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the watcher thread and wait for it to exit."""
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self.check()
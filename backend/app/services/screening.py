@@ -0,0 +1,240 @@
+"""
+Watchlist screening
+
+Checks business names against local sanctions / PEP watchlists. A watchlist
+file uses the same JSON array or JSON Lines framing as seed files, one entry
+per item:
+
+    {"id": "OFAC-1234", "list": "sanctions", "name": "Evil Corp",
+     "aliases": ["Evil Corporation", "EC Holdings"]}
+
+Every name and alias is normalized to tokens (see `fuzzy_key`) and compiled
+into a token-level Aho-Corasick automaton, so screening a name is a single
+pass over its tokens regardless of how many aliases are listed. Matches are
+whole-token: "EC Holdings" hits "The EC Holdings Group" but not
+"Deck Holdings".
+
+Without a configured watchlist the MVP placeholder rule applies (names
+containing "test" are flagged `possible_match`).
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+from ..config import Settings
+from .fuzzy import fuzzy_key
+from .reloader import Reloadable
+from .seedfile import iter_seed_items
+
+logger = logging.getLogger(__name__)
+
+# Risk flag raised by the placeholder rule when no watchlist is configured.
+PLACEHOLDER_FLAG = "possible_match"
+
+
+@dataclass(frozen=True)
+class WatchlistEntry:
+    """One listed party; `list_name` is e.g. "sanctions" or "pep"."""
+
+    id: str
+    list_name: str
+    name: str
+
+
+@dataclass(frozen=True)
+class ScreeningHit:
+    """A watchlist entry matched by the screened name via `alias`."""
+
+    entry: WatchlistEntry
+    alias: str
+
+
+@dataclass(frozen=True)
+class ScreeningResult:
+    """Risk flags for a name plus the watchlist entries behind them."""
+
+    risk_flags: tuple[str, ...] = ()
+    hits: tuple[ScreeningHit, ...] = ()
+
+
+_CLEAR = ScreeningResult()
+
+
+class Screener:
+    """Interface for name screening."""
+
+    def screen(self, name: str) -> ScreeningResult:  # noqa: D401
+        """Screen a business name."""
+
+        raise NotImplementedError
+
+
+class PlaceholderScreener(Screener):
+    """MVP rule: flag any name containing "test"."""
+
+    def screen(self, name: str) -> ScreeningResult:
+        if "test" in name.lower():
+            return ScreeningResult(risk_flags=(PLACEHOLDER_FLAG,))
+        return _CLEAR
+
+
+def tokenize(text: str) -> list[str]:
+    """Normalized tokens used for both watchlist patterns and input names."""
+
+    return fuzzy_key(text).split()
+
+
+class WatchlistScreener(Screener):
+    """Token-level Aho-Corasick automaton over watchlist names and aliases.
+
+    States are trie nodes over token ids. `_goto[s]` maps a token id to the
+    next state, `_fail[s]` is the longest proper suffix state, `_out[s]` lists
+    the patterns ending exactly at `s`, and `_report[s]` is the nearest state
+    on the failure chain (including `s`) with output, or -1.
+    """
+
+    def __init__(self, entries: Iterable[tuple[WatchlistEntry, list[str]]]) -> None:
+        self._vocab: dict[str, int] = {}
+        self._goto: list[dict[int, int]] = [{}]
+        self._out: list[list[int]] = [[]]
+        # Pattern index -> (entry, alias text); one per distinct alias/entry.
+        self._patterns: list[tuple[WatchlistEntry, str]] = []
+        self.entry_count = 0
+
+        for entry, aliases in entries:
+            self.entry_count += 1
+            seen: set[tuple[str, ...]] = set()
+            for alias in (entry.name, *aliases):
+                tokens = tuple(tokenize(alias))
+                if not tokens or tokens in seen:
+                    continue
+                seen.add(tokens)
+                self._insert(tokens, entry, alias)
+
+        self._fail = [0] * len(self._goto)
+        self._report = [-1] * len(self._goto)
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def _insert(
+        self, tokens: tuple[str, ...], entry: WatchlistEntry, alias: str
+    ) -> None:
+        state = 0
+        for token in tokens:
+            tid = self._vocab.setdefault(token, len(self._vocab))
+            nxt = self._goto[state].get(tid)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][tid] = nxt
+                self._goto.append({})
+                self._out.append([])
+            state = nxt
+        self._out[state].append(len(self._patterns))
+        self._patterns.append((entry, alias))
+
+    def _link(self) -> None:
+        """Compute failure and output links breadth-first."""
+
+        queue: deque[int] = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            fail = self._fail[state]
+            self._report[state] = state if self._out[state] else self._report[fail]
+            for tid, child in self._goto[state].items():
+                f = fail
+                while f and tid not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(tid, 0)
+                self._fail[child] = target if target != child else 0
+                queue.append(child)
+
+    def screen(self, name: str) -> ScreeningResult:
+        """Return every listed entry whose name or alias occurs in `name`."""
+
+        goto, fail, report, out = self._goto, self._fail, self._report, self._out
+        matched: dict[int, None] = {}
+        state = 0
+        for token in tokenize(name):
+            tid = self._vocab.get(token)
+            if tid is None:
+                # A token no pattern contains can't be part of any match.
+                state = 0
+                continue
+            while state and tid not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(tid, 0)
+            s = report[state]
+            while s > 0:
+                matched.update(dict.fromkeys(out[s]))
+                s = report[fail[s]]
+
+        if not matched:
+            return _CLEAR
+        hits: dict[WatchlistEntry, ScreeningHit] = {}
+        for idx in matched:
+            entry, alias = self._patterns[idx]
+            hits.setdefault(entry, ScreeningHit(entry, alias))
+        flags = sorted({f"{entry.list_name}_hit" for entry in hits})
+        return ScreeningResult(risk_flags=tuple(flags), hits=tuple(hits.values()))
+
+
+class _EntryModel(BaseModel):
+    id: str = Field(..., min_length=1)
+    list_name: str = Field(..., min_length=1, alias="list")
+    name: str = Field(..., min_length=1)
+    aliases: list[str] = []
+
+
+def _iter_entries(path: Path) -> Iterable[tuple[WatchlistEntry, list[str]]]:
+    for idx, item in enumerate(iter_seed_items(path)):
+        try:
+            m = _EntryModel.model_validate(item)
+        except ValidationError as e:
+            raise ValueError(f"Invalid watchlist entry at index {idx}: {e}") from e
+        entry = WatchlistEntry(
+            id=m.id, list_name=m.list_name.strip().lower(), name=m.name
+        )
+        yield entry, m.aliases
+
+
+def load_watchlist(path: Path) -> WatchlistScreener:
+    """Compile a watchlist file into a `WatchlistScreener`."""
+
+    screener = WatchlistScreener(_iter_entries(path))
+    logger.info(
+        "Compiled watchlist %s: %d entries, %d patterns",
+        path,
+        screener.entry_count,
+        len(screener),
+    )
+    return screener
+
+
+ScreenerRegistry = Reloadable[Screener]
+
+
+def create_screener_registry(settings: Settings) -> ScreenerRegistry:
+    """Compile the configured watchlist and recompile it when the file changes.
+
+    Falls back to `PlaceholderScreener` when `settings.watchlist_path` is
+    unset.
+    """
+
+    path: Optional[Path] = settings.watchlist_path
+    if path is None:
+        return Reloadable(PlaceholderScreener, name="screener")
+    return Reloadable(
+        lambda: load_watchlist(path),
+        watch=path,
+        interval=settings.reload_interval,
+        name="watchlist",
+    )
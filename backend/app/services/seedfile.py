@@ -0,0 +1,362 @@
+"""
+Incremental seed file readers
+
+Yields raw seed items one at a time so large `DATA_SEED_PATH` files can be
+validated and indexed without materializing the whole document. Two layouts
+are supported:
+
+- A JSON array (the default `seed_entities.json` layout), decoded element by
+  element from a bounded text buffer.
+- JSON Lines (`.jsonl` / `.ndjson`), one object per non-blank line.
+
+Readers only deal with JSON framing; record validation stays with the
+providers so error messages are identical regardless of how a file is read.
+
+For parallel loads, `split_seed` cuts a file into byte ranges that worker
+processes read and decode on their own (`read_range`, `iter_chunk_items`).
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Optional, TextIO
+
+# File suffixes treated as JSON Lines.
+JSONL_SUFFIXES = frozenset({".jsonl", ".ndjson"})
+
+# Characters read from disk per refill of the array decoder's buffer.
+_CHUNK_CHARS = 1 << 20
+
+_WHITESPACE = " \t\n\r"
+
+# A decode error this close to the end of the buffer may just be a value cut
+# off by the chunk boundary (a partial literal, number or `\uXXXX` escape).
+_TOKEN_SLACK = 16
+
+
+# Bytes read at a time while looking for a place to cut a JSON array, and the
+# tail kept between reads so a match spanning two reads is still found.
+_CUT_WINDOW = 1 << 16
+_CUT_OVERLAP = 1 << 10
+
+
+def is_jsonl(path: Path) -> bool:
+    """Return True when `path` should be read as JSON Lines."""
+
+    return path.suffix.lower() in JSONL_SUFFIXES
+
+
+def iter_seed_items(path: Path) -> Iterator[Any]:
+    """Yield the raw items of a seed file without loading it whole.
+
+    Raises:
+      FileNotFoundError: when `path` does not exist.
+      ValueError: on malformed JSON or when a JSON document is not an array.
+    """
+
+    try:
+        fp = path.open("r", encoding="utf-8")
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"Seed file not found: {path}") from e
+
+    with fp:
+        if is_jsonl(path):
+            yield from _iter_lines(fp, path)
+        else:
+            yield from _iter_array(fp, path)
+
+
+def split_seed(path: Path, chunk_bytes: int) -> list[int]:
+    """Byte offsets cutting a seed file into chunks of about `chunk_bytes`.
+
+    Returns `[0, ..., file size]`. JSON Lines files are cut after a newline.
+    JSON arrays are cut before an element that looks like the first one: an
+    object opening with the same key, right after `},`. That cannot occur
+    inside a string, but can inside a nested value, so the cut is a guess; a
+    wrong one makes `iter_chunk_items` fail for the chunk before it.
+    """
+
+    try:
+        fp = path.open("rb")
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"Seed file not found: {path}") from e
+
+    with fp:
+        size = os.fstat(fp.fileno()).st_size
+        offsets = [0]
+        pattern = None if is_jsonl(path) else _element_start(fp.read(_CUT_WINDOW))
+        target = chunk_bytes
+        while target < size:
+            if is_jsonl(path):
+                fp.seek(target)
+                fp.readline()
+                cut: Optional[int] = fp.tell()
+            elif pattern is not None:
+                cut = _find_cut(fp, target, pattern)
+            else:
+                cut = None
+            if cut is None or cut >= size:
+                break
+            offsets.append(cut)
+            target = cut + chunk_bytes
+    offsets.append(size)
+    return offsets
+
+
+def _element_start(head: bytes) -> Optional[re.Pattern[bytes]]:
+    """Pattern finding `},` before an object keyed like the array's first."""
+
+    m = re.match(rb'\s*\[\s*\{\s*("(?:[^"\\]|\\.)*")\s*:', head)
+    if m is None:
+        return None
+    return re.compile(rb"\}\s*,\s*(\{\s*" + re.escape(m.group(1)) + rb"\s*:)")
+
+
+def _find_cut(fp: BinaryIO, target: int, pattern: re.Pattern[bytes]) -> Optional[int]:
+    """Offset of the first element start `pattern` finds from `target` on."""
+
+    fp.seek(target)
+    base, buf = target, b""
+    while True:
+        block = fp.read(_CUT_WINDOW)
+        if not block:
+            return None
+        buf += block
+        m = pattern.search(buf)
+        if m is not None:
+            return base + m.start(1)
+        base += max(0, len(buf) - _CUT_OVERLAP)
+        buf = buf[-_CUT_OVERLAP:]
+
+
+def read_range(path: Path, start: int, end: int) -> bytes:
+    """The bytes of `path` from `start` up to `end`."""
+
+    with path.open("rb") as fp:
+        fp.seek(start)
+        return fp.read(end - start)
+
+
+def line_count(data: bytes) -> int:
+    """Lines in `data` as text-mode reading counts them ("\\r" ends one too)."""
+
+    return data.count(b"\n") + data.count(b"\r") - data.count(b"\r\n")
+
+
+def iter_chunk_items(
+    path: Path, data: bytes, at_start: bool, at_end: bool, first_line: int = 1
+) -> Iterator[Any]:
+    """Yield the raw items of one `split_seed` chunk, `data`.
+
+    `at_start` / `at_end` say whether the chunk begins / ends the file, and
+    JSON Lines errors count lines from `first_line`. An array chunk must hold
+    whole elements, each followed by a comma (or by the closing bracket at
+    the end of the file); anything else raises ValueError, including a chunk
+    cut at a wrong guess.
+    """
+
+    if is_jsonl(path):
+        text = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8")
+        for lineno, line in enumerate(text, start=first_line):
+            if line.strip():
+                yield decode_line(line, lineno, path)
+        return
+
+    buf = data.decode("utf-8")
+    decoder = json.JSONDecoder()
+    pos = _skip(buf, 0)
+    if at_start:
+        if buf[pos : pos + 1] != "[":
+            raise ValueError(f"Invalid JSON in seed file: {path}")
+        pos = _skip(buf, pos + 1)
+        if buf[pos : pos + 1] == "]":
+            if _skip(buf, pos + 1) != len(buf):
+                raise ValueError(f"Invalid JSON in seed file: {path}")
+            return
+    while pos < len(buf):
+        try:
+            item, pos = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in seed file: {path}") from e
+        yield item
+        pos = _skip(buf, pos)
+        sep = buf[pos : pos + 1]
+        pos = _skip(buf, pos + 1)
+        if sep == "]" and at_end and pos == len(buf):
+            return
+        if sep != "," or (at_end and pos == len(buf)):
+            raise ValueError(f"Invalid JSON in seed file: {path}")
+    if at_end and not at_start:
+        raise ValueError(f"Invalid JSON in seed file: {path}")
+
+
+def _skip(buf: str, pos: int) -> int:
+    """Position of the first non-whitespace character from `pos` on."""
+
+    while pos < len(buf) and buf[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def decode_line(line: str, lineno: int, path: Path) -> Any:
+    """Decode one JSON Lines line, naming the file and line on errors."""
+
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON in seed file: {path} (line {lineno})") from e
+
+
+def _iter_lines(fp: TextIO, path: Path) -> Iterator[Any]:
+    """Decode one JSON value per non-blank line."""
+
+    for lineno, line in enumerate(fp, start=1):
+        if line.strip():
+            yield decode_line(line, lineno, path)
+
+
+class _ArrayReader:
+    """Pull-based decoder for the elements of a top-level JSON array.
+
+    Only the unconsumed tail of the file is buffered, so memory stays bounded
+    by the chunk size plus the largest single element. Refills for an element
+    that outgrows the buffer read as much again as is buffered, so large
+    elements cost linear rather than quadratic copying.
+    """
+
+    def __init__(self, fp: TextIO, path: Path) -> None:
+        self._fp = fp
+        self._path = path
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+        self._items = 0
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer; return False at end of file."""
+
+        if self._eof:
+            return False
+        chunk = self._fp.read(max(_CHUNK_CHARS, len(self._buf) - self._pos))
+        if not chunk:
+            self._eof = True
+            return False
+        # Drop the consumed prefix before growing the buffer.
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def _invalid(self) -> ValueError:
+        return ValueError(f"Invalid JSON in seed file: {self._path}")
+
+    def _truncated(self, e: json.JSONDecodeError) -> bool:
+        """Whether `e` may come from a value cut off at the end of the buffer
+        rather than from a syntax error inside it."""
+
+        if self._eof:
+            return False
+        # The string scanner reports where the string starts, not where the
+        # buffer ran out.
+        if e.msg.startswith("Unterminated string"):
+            return True
+        return e.pos >= len(self._buf) - _TOKEN_SLACK
+
+    def next_char(self) -> str:
+        """Skip whitespace and return the next character ("" at end)."""
+
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def advance(self) -> None:
+        self._pos += 1
+
+    def decode(self) -> Any:
+        """Decode the next JSON value, skipping leading whitespace.
+
+        Malformed values fail as soon as they are seen, naming their
+        zero-based position in the array.
+        """
+
+        self.next_char()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                if self._truncated(e) and self._fill():
+                    continue
+                raise ValueError(
+                    f"Invalid JSON in seed file: {self._path} (item {self._items})"
+                ) from e
+            # A value ending exactly at the buffer edge may be a truncated
+            # scalar (e.g. a number split across chunks); read on to be sure.
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            self._items += 1
+            return value
+
+
+def _iter_array(fp: TextIO, path: Path) -> Iterator[Any]:
+    """Decode the elements of a top-level JSON array one by one."""
+
+    reader = _ArrayReader(fp, path)
+    first = reader.next_char()
+    if first != "[":
+        if first:
+            # Distinguish "valid JSON, wrong shape" from "not JSON at all" the
+            # same way a whole-document parse would.
+            try:
+                reader.decode()
+            except ValueError as e:
+                raise reader._invalid() from e.__cause__
+            raise ValueError("Seed JSON must be a list of records")
+        raise reader._invalid()
+
+    reader.advance()
+    if reader.next_char() == "]":
+        reader.advance()
+        if reader.next_char() != "":
+            raise reader._invalid()
+    else:
+        yield from _iter_elements(reader)
+
+
+def _iter_elements(reader: _ArrayReader) -> Iterator[Any]:
+    """Decode comma-separated elements up to the array's closing bracket."""
+
+    while True:
+        yield reader.decode()
+        sep = reader.next_char()
+        reader.advance()
+        if sep == "]":
+            break
+        if sep != ",":
+            raise reader._invalid()
+
+    if reader.next_char() != "":
+        raise reader._invalid()
+
+
+def iter_array_from(path: Path, offset: int, items: int) -> Iterator[Any]:
+    """Yield a JSON array seed's elements from byte `offset` on, where element
+    number `items` starts (0 and 0 for the whole file)."""
+
+    if offset == 0:
+        yield from iter_seed_items(path)
+        return
+    raw = path.open("rb")
+    raw.seek(offset)
+    with io.TextIOWrapper(raw, encoding="utf-8") as fp:
+        reader = _ArrayReader(fp, path)
+        reader._items = items
+        yield from _iter_elements(reader)
@@ -0,0 +1,137 @@
+"""
+Single-flight lookup coalescing
+
+Bursts of identical verifications (client retries, several services
+onboarding the same business) would otherwise each run their own lookup and,
+with external registries configured, each pay a registry round trip and
+quota. `SingleFlightProvider` keys in-flight lookups on the normalized
+`(name_lower, country_upper)` key: the first caller starts the lookup and
+every identical request arriving before it finishes awaits the same result.
+
+Nothing is cached. A key is forgotten as soon as its lookup completes, so the
+next request starts a fresh one; errors and timeouts reach every caller that
+was waiting on the failed lookup, and only those callers.
+
+Batches (`lookup_many`) join the same flights: keys already in flight are
+awaited, and the rest go to the inner provider in one `lookup_many` call
+whose per-key results other callers can join in turn.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import Coroutine, Optional, Sequence
+
+from .datasource import BusinessRecord, normalize_key
+from .registries import AsyncDataProvider
+
+# Default seconds one shared lookup may take before every waiter gets a
+# TimeoutError (the PRD's 3-second response target).
+DEFAULT_TIMEOUT_SECONDS = 3.0
+
+_Key = tuple[str, str]
+
+
+@dataclass
+class SingleFlightStats:
+    """Cumulative counters; `coalesced` calls reused another call's lookup."""
+
+    lookups: int = 0
+    coalesced: int = 0
+    failures: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class SingleFlightProvider(AsyncDataProvider):
+    """Shares one in-flight lookup among concurrent identical requests.
+
+    Parameters:
+      inner: Provider doing the actual lookup.
+      timeout: Seconds a shared single lookup may run; on expiry it is
+        cancelled and every waiter receives `TimeoutError`. Batch lookups
+        are bounded by the inner provider instead (e.g. a fan-out's
+        per-key budget), since one timeout cannot suit every batch size.
+      stats: Counters to update (a fresh instance by default).
+    """
+
+    name = "single-flight"
+
+    def __init__(
+        self,
+        inner: AsyncDataProvider,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        stats: Optional[SingleFlightStats] = None,
+    ) -> None:
+        self._inner = inner
+        self._timeout = timeout
+        self.stats = stats if stats is not None else SingleFlightStats()
+        self._flights: dict[_Key, asyncio.Task[Optional[BusinessRecord]]] = {}
+
+    def __len__(self) -> int:
+        """Number of lookups currently in flight."""
+
+        return len(self._flights)
+
+    async def lookup_business(
+        self, name: str, country: str
+    ) -> Optional[BusinessRecord]:
+        key = normalize_key(name, country)
+        flight = self._flights.get(key)
+        if flight is None:
+            self.stats.lookups += 1
+            flight = self._start(key, self._run(name, country))
+        else:
+            self.stats.coalesced += 1
+        # A caller that goes away (client disconnect) must not cancel the
+        # lookup the other callers are waiting on.
+        return await asyncio.shield(flight)
+
+    async def lookup_many(
+        self, keys: Sequence[tuple[str, str]]
+    ) -> list[Optional[BusinessRecord]]:
+        wanted = [normalize_key(name, country) for name, country in keys]
+        fresh: dict[_Key, int] = {}
+        fresh_keys: list[tuple[str, str]] = []
+        for key, name_country in zip(wanted, keys, strict=True):
+            if key in self._flights or key in fresh:
+                self.stats.coalesced += 1
+            else:
+                fresh[key] = len(fresh_keys)
+                fresh_keys.append(name_country)
+        if fresh_keys:
+            self.stats.lookups += len(fresh_keys)
+            batch = asyncio.create_task(self._inner.lookup_many(fresh_keys))
+            for key, i in fresh.items():
+                self._start(key, self._pick(batch, i))
+        # No await since the checks above, so every key is still in flight.
+        flights = {key: self._flights[key] for key in wanted}
+        results = await asyncio.shield(asyncio.gather(*flights.values()))
+        found = dict(zip(flights, results, strict=True))
+        return [found[key] for key in wanted]
+
+    def _start(
+        self, key: _Key, lookup: Coroutine[None, None, Optional[BusinessRecord]]
+    ) -> asyncio.Task[Optional[BusinessRecord]]:
+        flight = asyncio.create_task(lookup)
+        self._flights[key] = flight
+        flight.add_done_callback(lambda done: self._land(key, done))
+        return flight
+
+    async def _run(self, name: str, country: str) -> Optional[BusinessRecord]:
+        async with asyncio.timeout(self._timeout):
+            return await self._inner.lookup_business(name, country)
+
+    @staticmethod
+    async def _pick(
+        batch: asyncio.Task[list[Optional[BusinessRecord]]], i: int
+    ) -> Optional[BusinessRecord]:
+        return (await batch)[i]
+
+    def _land(self, key: _Key, flight: asyncio.Task[Optional[BusinessRecord]]) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if flight.cancelled() or flight.exception() is not None:
+            self.stats.failures += 1
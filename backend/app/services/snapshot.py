@@ -0,0 +1,333 @@
+"""
+Precompiled, memory-mapped dataset snapshots
+
+A snapshot is the seed file compiled offline into a flat binary layout that a
+provider can `mmap` read-only and query in place. Opening one only parses a
+small header, so worker startup takes milliseconds, and because the mapping is
+shared and never written, every worker on a host reads the same page-cache
+pages instead of holding a private copy of the dataset.
+
+Layout (little-endian):
+  header    magic "SAVSNAP1", u32 version, u32 section count, u64 record count
+  directory one entry per section: 4-byte tag, u64 offset, u64 length
+  sections  8-byte aligned:
+    POOL  JSON object of interned cities/countries/statuses
+    NAME  UTF-8 legal names, NOFF u64 offsets (records + 1)
+    LINE  UTF-8 address lines, LOFF u64 offsets (records + 1)
+    CITY  u32 city codes; CTRY/STAT u16 country/status codes
+    HASH  u32 open-addressing lookup table (ordinal + 1, 0 = empty)
+    TGRK  sorted u64 trigram keys (country code << 32 | crc32(trigram))
+    TGRO  u64 offsets into TGRP per key (keys + 1); TGRP u32 postings
+    BLMD  optional JSON metadata of per-country name filters; BLMB their bits
+    NSRT  optional u32 ordinals in name order, grouped by country code;
+          NSRO u64 offsets into NSRT per country code (countries + 1)
+
+Compile with `python -m backend.app.cli compile-snapshot SEED OUT`.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+from .autocomplete import PrefixIndex
+from .bloom import DEFAULT_FALSE_POSITIVE_RATE, NameFilter
+from .columnar import ColumnarDataProvider
+from .datasource import BusinessRecord, _MatchingDataProvider, normalize_key
+from .trigram import MIN_QUERY_LENGTH, PackedTrigramIndex
+
+MAGIC = b"SAVSNAP1"
+VERSION = 1
+
+# File suffix that selects the snapshot provider.
+SNAPSHOT_SUFFIX = ".snap"
+
+_HEADER = struct.Struct("<8sIIQ")
+_ENTRY = struct.Struct("<4sQQ")
+_ALIGN = 8
+
+
+def _key_hash(name_key: str, country: str) -> int:
+    """Stable hash of a lookup key (Python's `hash` is salted per process)."""
+
+    return zlib.crc32(f"{name_key}\x1f{country}".encode("utf-8"))
+
+
+def _text_section(values: Iterable[str]) -> tuple[bytes, array[int]]:
+    blob = bytearray()
+    offsets = array("Q", [0])
+    for value in values:
+        blob += value.encode("utf-8")
+        offsets.append(len(blob))
+    return bytes(blob), offsets
+
+
+def write_snapshot(
+    provider: ColumnarDataProvider,
+    out: Path,
+    fp_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+) -> None:
+    """Serialize a loaded columnar provider to `out` atomically.
+
+    The file is written next to `out` and renamed into place, so readers (and
+    file watchers) never observe a partially written snapshot. With a
+    positive `fp_rate` the snapshot also carries a `NameFilter` at that rate.
+    """
+
+    if sys.byteorder != "little":
+        raise RuntimeError("Snapshots can only be written on little-endian hosts")
+
+    n = len(provider)
+    names = [provider._names.get(i) for i in range(n)]
+    name_blob, name_offsets = _text_section(names)
+    line_blob, line_offsets = _text_section(provider._lines.get(i) for i in range(n))
+    countries = provider._countries.values
+
+    # Lookup table sized to a power of two at load factor <= 0.5.
+    capacity = 8
+    while capacity < 2 * n:
+        capacity *= 2
+    mask = capacity - 1
+    table = array("I", [0]) * capacity
+    for ordinal, name in enumerate(names):
+        country = countries[provider._country_codes[ordinal]]
+        slot = _key_hash(name.lower(), country) & mask
+        while table[slot]:
+            slot = (slot + 1) & mask
+        table[slot] = ordinal + 1
+
+    # The provider's trigram index is already packed in the snapshot layout.
+    grams = provider._trigrams
+
+    pools = {
+        "cities": provider._cities.values,
+        "countries": countries,
+        "statuses": provider._statuses.values,
+    }
+    sections: list[tuple[bytes, bytes]] = [
+        (b"POOL", json.dumps(pools).encode("utf-8")),
+        (b"NAME", name_blob),
+        (b"NOFF", name_offsets.tobytes()),
+        (b"LINE", line_blob),
+        (b"LOFF", line_offsets.tobytes()),
+        (b"CITY", array("I", provider._city_codes).tobytes()),
+        (b"CTRY", array("H", provider._country_codes).tobytes()),
+        (b"STAT", array("H", provider._status_codes).tobytes()),
+        (b"HASH", table.tobytes()),
+        (b"TGRK", array("Q", grams.keys).tobytes()),
+        (b"TGRO", array("Q", grams.offsets).tobytes()),
+        (b"TGRP", array("I", grams.postings_data).tobytes()),
+    ]
+    # The prefix index's sorted runs, so no reader has to sort the names.
+    runs = provider._prefix_index().runs()
+    sorted_ordinals = array("I")
+    sorted_offsets = array("Q", [0])
+    for country in countries:
+        sorted_ordinals.extend(runs.get(country, ()))
+        sorted_offsets.append(len(sorted_ordinals))
+    sections += [
+        (b"NSRT", sorted_ordinals.tobytes()),
+        (b"NSRO", sorted_offsets.tobytes()),
+    ]
+    if fp_rate > 0:
+        meta, bits = NameFilter.build(provider.name_keys, fp_rate).to_bytes()
+        sections += [(b"BLMD", meta), (b"BLMB", bits)]
+
+    offset = _HEADER.size + _ENTRY.size * len(sections)
+    directory = []
+    for tag, data in sections:
+        offset += -offset % _ALIGN
+        directory.append(_ENTRY.pack(tag, offset, len(data)))
+        offset += len(data)
+
+    tmp = out.with_name(out.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(sections), n))
+        f.write(b"".join(directory))
+        for _tag, data in sections:
+            f.write(b"\0" * (-f.tell() % _ALIGN))
+            f.write(data)
+    os.replace(tmp, out)
+
+
+def compile_snapshot(
+    seed: Path,
+    out: Path,
+    progress: Optional[Callable[[int], None]] = None,
+    workers: int = 1,
+    fp_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+) -> int:
+    """Compile a JSON / JSON Lines seed file into a snapshot at `out`.
+
+    `workers` processes decode, validate and index the seed (see
+    `iter_seed_chunks`); the name filter is built at `fp_rate` (0 omits it).
+    Returns the number of distinct records written.
+    """
+
+    provider = ColumnarDataProvider.from_seed(seed, progress=progress, workers=workers)
+    write_snapshot(provider, out, fp_rate=fp_rate)
+    return len(provider)
+
+
+class SnapshotDataProvider(_MatchingDataProvider):
+    """Read-only provider over a memory-mapped snapshot file.
+
+    All columns and indexes, including the autocomplete prefix index, are
+    `memoryview`s into the mapping; nothing is copied or sorted at open time
+    and pages are faulted in on demand. A name filter compiled into the file
+    is exposed as `stored_name_filter`.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        try:
+            with path.open("rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"Snapshot file not found: {path}") from e
+        except ValueError as e:  # mmap of an empty file
+            raise ValueError(f"Invalid snapshot file: {path}") from e
+
+        if len(self._mm) < _HEADER.size:
+            raise ValueError(f"Invalid snapshot file: {path}")
+        magic, version, count, size = _HEADER.unpack_from(self._mm, 0)
+        self._size: int = size
+        if magic != MAGIC:
+            raise ValueError(f"Invalid snapshot file: {path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}: {path}")
+
+        view = memoryview(self._mm)
+        sec: dict[bytes, memoryview] = {}
+        for i in range(count):
+            tag, offset, length = _ENTRY.unpack_from(
+                self._mm, _HEADER.size + i * _ENTRY.size
+            )
+            sec[tag] = view[offset : offset + length]
+
+        pools = json.loads(bytes(sec[b"POOL"]))
+        self._cities: list[str] = pools["cities"]
+        self._countries: list[str] = pools["countries"]
+        self._statuses: list[str] = pools["statuses"]
+        self._country_codes = {c: i for i, c in enumerate(self._countries)}
+
+        self._name_blob = sec[b"NAME"]
+        self._name_offsets = sec[b"NOFF"].cast("Q")
+        self._line_blob = sec[b"LINE"]
+        self._line_offsets = sec[b"LOFF"].cast("Q")
+        self._city_col = sec[b"CITY"].cast("I")
+        self._country_col = sec[b"CTRY"].cast("H")
+        self._status_col = sec[b"STAT"].cast("H")
+        self._table = sec[b"HASH"].cast("I")
+        grams = (sec[b"TGRK"].cast("Q"), sec[b"TGRO"].cast("Q"), sec[b"TGRP"].cast("I"))
+        self._trigrams = PackedTrigramIndex(*grams, countries=len(self._countries))
+        self.stored_name_filter: Optional[NameFilter] = None
+        if b"BLMD" in sec:
+            self.stored_name_filter = NameFilter.from_buffers(
+                bytes(sec[b"BLMD"]), sec[b"BLMB"]
+            )
+        self._views = [view, *sec.values(), *grams]
+        if b"NSRT" in sec:
+            self._prefix = PrefixIndex(self._stored_runs(sec), self._name_key)
+
+    def _stored_runs(self, sec: dict[bytes, memoryview]) -> dict[str, memoryview]:
+        ordinals = sec[b"NSRT"].cast("I")
+        offsets = sec[b"NSRO"].cast("Q")
+        runs = {
+            country: ordinals[offsets[code] : offsets[code + 1]]
+            for code, country in enumerate(self._countries)
+            if offsets[code + 1] > offsets[code]
+        }
+        self._views += [ordinals, offsets, *runs.values()]
+        return runs
+
+    def __len__(self) -> int:
+        return self._size
+
+    def close(self) -> None:
+        """Release the mapping. The provider must not be used afterwards."""
+
+        if self.stored_name_filter is not None:
+            self.stored_name_filter.release()
+        casts = [v for v in vars(self).values() if isinstance(v, memoryview)]
+        for v in casts + self._views:
+            v.release()
+        self._mm.close()
+
+    def _name(self, ordinal: int) -> str:
+        start, end = self._name_offsets[ordinal], self._name_offsets[ordinal + 1]
+        return str(self._name_blob[start:end], "utf-8")
+
+    def _name_key(self, ordinal: int) -> str:
+        return self._name(ordinal).lower()
+
+    def _postings(self, gram: str, code: str) -> Optional[Sequence[int]]:
+        country_code = self._country_codes.get(code)
+        if country_code is None:
+            return None
+        return self._trigrams.postings(gram, country_code)
+
+    def _entries(self) -> Iterator[tuple[int, str, str]]:
+        countries = self._countries
+        for ordinal in range(self._size):
+            country = countries[self._country_col[ordinal]]
+            yield ordinal, self._name_key(ordinal), country
+
+    def _record(self, ordinal: int) -> BusinessRecord:
+        start, end = self._line_offsets[ordinal], self._line_offsets[ordinal + 1]
+        return BusinessRecord(
+            legal_name=self._name(ordinal),
+            address_line1=str(self._line_blob[start:end], "utf-8"),
+            city=self._cities[self._city_col[ordinal]],
+            country=self._countries[self._country_col[ordinal]],
+            registration_status=self._statuses[self._status_col[ordinal]],
+        )
+
+    def lookup_business(self, name: str, country: str) -> Optional[BusinessRecord]:
+        """Retrieve a record by normalized name and country."""
+
+        name_key, code = normalize_key(name, country)
+        country_code = self._country_codes.get(code)
+        if country_code is None:
+            return None
+        mask = len(self._table) - 1
+        slot = _key_hash(name_key, code) & mask
+        while True:
+            entry = self._table[slot]
+            if entry == 0:
+                return None
+            ordinal = entry - 1
+            if (
+                self._country_col[ordinal] == country_code
+                and self._name(ordinal).lower() == name_key
+            ):
+                return self._record(ordinal)
+            slot = (slot + 1) & mask
+
+    def _iter_matches(self, q: str, code: Optional[str]) -> Iterator[BusinessRecord]:
+        """Yield records whose name contains `q`, in insertion order."""
+
+        country_code = None
+        if code is not None:
+            country_code = self._country_codes.get(code)
+            if country_code is None:
+                return
+
+        ordinals: Iterable[int]
+        if len(q) < MIN_QUERY_LENGTH:
+            ordinals = range(self._size)
+        else:
+            ordinals = self._trigrams.candidates(q, country_code)
+
+        for ordinal in ordinals:
+            if country_code is not None and self._country_col[ordinal] != country_code:
+                continue
+            if q in self._name(ordinal).lower():
+                yield self._record(ordinal)
@@ -0,0 +1,332 @@
+"""
+SQLite-backed dataset for registries larger than memory
+
+The seed is imported offline into a SQLite database and queried in place, so
+the process holds only SQLite's page cache (plus a memory map of the file)
+instead of the whole dataset:
+
+- `businesses` stores one row per `(name_key, country)` key, with `id` as the
+  insertion-order ordinal. A covering index on `(name_key, country, ...)`
+  answers exact lookups and prefix completions from the index alone.
+- `businesses_fts` is a contentless FTS5 table with the trigram tokenizer
+  over `name_key`. Substring searches and fuzzy blocking ask it for the rows
+  containing every query trigram and verify candidates like the in-memory
+  providers do, so results are identical.
+
+Readers open the file read-only in WAL mode, one connection per thread, so
+the threadpool FastAPI runs sync handlers (and blocking lookups) on never
+shares a connection. Import with
+`python -m backend.app.cli import-sqlite SEED OUT`.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+from .datasource import (
+    BusinessRecord,
+    _MatchingDataProvider,
+    iter_seed_records,
+    normalize_key,
+)
+from .fuzzy import MAX_POSTINGS_PER_GRAM
+from .trigram import MIN_QUERY_LENGTH, trigrams
+
+# File suffixes that select the SQLite provider.
+SQLITE_SUFFIXES = (".sqlite", ".db")
+
+# Stored in `PRAGMA user_version`; bump when the schema changes.
+SCHEMA_VERSION = 1
+
+# Bytes of the database file each connection memory-maps for reads.
+MMAP_SIZE = 1 << 30
+
+_IMPORT_BATCH = 10_000
+
+_COLUMNS = "legal_name, address_line1, city, country, registration_status"
+
+_SCHEMA = """
+CREATE TABLE businesses (
+    id INTEGER PRIMARY KEY,
+    name_key TEXT NOT NULL,
+    country TEXT NOT NULL,
+    legal_name TEXT NOT NULL,
+    address_line1 TEXT NOT NULL,
+    city TEXT NOT NULL,
+    registration_status TEXT NOT NULL
+);
+CREATE UNIQUE INDEX businesses_key ON businesses (name_key, country);
+"""
+
+# A repeated key replaces the record but keeps its original position.
+_UPSERT = """
+INSERT INTO businesses (name_key, country, legal_name, address_line1, city,
+                        registration_status)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (name_key, country) DO UPDATE SET
+    legal_name = excluded.legal_name,
+    address_line1 = excluded.address_line1,
+    city = excluded.city,
+    registration_status = excluded.registration_status
+"""
+
+_FINISH = f"""
+DROP INDEX businesses_key;
+CREATE UNIQUE INDEX businesses_lookup ON businesses (
+    name_key, country, legal_name, address_line1, city, registration_status
+);
+CREATE VIRTUAL TABLE businesses_fts USING fts5(
+    name_key, content='', tokenize='trigram', detail=none
+);
+INSERT INTO businesses_fts (rowid, name_key) SELECT id, name_key FROM businesses;
+INSERT INTO businesses_fts (businesses_fts) VALUES ('optimize');
+PRAGMA user_version = {SCHEMA_VERSION};
+"""
+
+
+def import_sqlite(
+    seed: Path,
+    out: Path,
+    progress: Optional[Callable[[int], None]] = None,
+    workers: int = 1,
+) -> int:
+    """Import a JSON / JSON Lines seed file into a SQLite database at `out`.
+
+    The database is built next to `out` and renamed into place, so readers
+    (and file watchers) never observe a partial import. `workers` processes
+    decode and validate the seed (see `iter_seed_records`). Returns the number of
+    distinct records written.
+    """
+
+    tmp = out.with_name(out.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(_SCHEMA)
+        conn.execute("BEGIN")
+        batch: list[tuple[str, ...]] = []
+        records = iter_seed_records(
+            seed, stream=True, progress=progress, workers=workers
+        )
+        for rec in records:
+            batch.append(
+                (
+                    rec.legal_name.lower(),
+                    rec.country,
+                    rec.legal_name,
+                    rec.address_line1,
+                    rec.city,
+                    rec.registration_status,
+                )
+            )
+            if len(batch) >= _IMPORT_BATCH:
+                conn.executemany(_UPSERT, batch)
+                batch = []
+        conn.executemany(_UPSERT, batch)
+        conn.execute("COMMIT")
+        # The covering index replaces the unique key used for upserts, so the
+        # file carries one index on the key rather than two.
+        conn.executescript(f"BEGIN; {_FINISH} COMMIT;")
+        count: int = conn.execute("SELECT count(*) FROM businesses").fetchone()[0]
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA journal_mode = WAL")
+    finally:
+        conn.close()
+    os.replace(tmp, out)
+    return count
+
+
+def _match_expression(grams: Iterable[str]) -> str:
+    """FTS5 query requiring every trigram (quoted, so any character is literal)."""
+
+    return " AND ".join('"' + g.replace('"', '""') + '"' for g in sorted(grams))
+
+
+class SqliteDataProvider(_MatchingDataProvider):
+    """Read-only provider over an imported SQLite database.
+
+    Queries hit the disk (or page cache), so the provider is `blocking`: async
+    callers run it on the threadpool, and each pool thread gets its own
+    read-only connection on first use.
+    """
+
+    blocking = True
+
+    def __init__(self, path: Path) -> None:
+        if not path.exists():
+            raise FileNotFoundError(f"SQLite database not found: {path}")
+        self._path = path
+        self._uri = f"{path.resolve().as_uri()}?mode=ro"
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: list[sqlite3.Connection] = []
+
+        conn = self._connection()
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f"Invalid SQLite database: {path}") from e
+        if version != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported SQLite schema version {version}: {path}")
+        # Upserts never leave gaps in ids, so the largest id is the row count
+        # (an index seek rather than a scan).
+        self._size: int = (
+            conn.execute("SELECT max(id) FROM businesses").fetchone()[0] or 0
+        )
+
+    def __len__(self) -> int:
+        return self._size
+
+    def close(self) -> None:
+        """Close every thread's connection. The provider must not be used
+        afterwards."""
+
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            # Closed from another thread by `close`, hence check_same_thread.
+            conn = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+            conn.execute("PRAGMA query_only = ON")
+            conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+            with self._lock:
+                self._connections.append(conn)
+            self._local.conn = conn
+        return conn
+
+    def lookup_business(self, name: str, country: str) -> Optional[BusinessRecord]:
+        """Retrieve a record by normalized name and country (index only)."""
+
+        return self._lookup(self._connection(), normalize_key(name, country))
+
+    def lookup_many(
+        self, keys: Sequence[tuple[str, str]]
+    ) -> list[Optional[BusinessRecord]]:
+        """Bulk exact-match lookups on one connection."""
+
+        conn = self._connection()
+        return [self._lookup(conn, normalize_key(n, c)) for n, c in keys]
+
+    def _lookup(
+        self, conn: sqlite3.Connection, key: tuple[str, str]
+    ) -> Optional[BusinessRecord]:
+        row = conn.execute(
+            f"SELECT {_COLUMNS} FROM businesses WHERE name_key = ? AND country = ?",
+            key,
+        ).fetchone()
+        return BusinessRecord(*row) if row is not None else None
+
+    def autocomplete(
+        self, prefix: str, country: Optional[str] = None, limit: int = 10
+    ) -> list[BusinessRecord]:
+        """First `limit` names starting with `prefix`, in name order.
+
+        A range scan of the covering index, which is already sorted by
+        `(name_key, country)`; no in-memory prefix index is built.
+        """
+
+        p = prefix.strip().lower()
+        # BINARY collation compares UTF-8 bytes, i.e. code points, like str.
+        params: list[object] = [p, p + "\U0010ffff"]
+        where = "name_key >= ? AND name_key < ?"
+        if country:
+            where += " AND country = ?"
+            params.append(country.strip().upper())
+        params.append(limit)
+        rows = self._connection().execute(
+            f"SELECT {_COLUMNS} FROM businesses WHERE {where} "
+            "ORDER BY name_key, country LIMIT ?",
+            params,
+        )
+        return [BusinessRecord(*row) for row in rows]
+
+    def _prefix_matches(
+        self, q: str, code: Optional[str]
+    ) -> Iterator[tuple[int, BusinessRecord]]:
+        """A range scan of the covering index, like `autocomplete`; row ids
+        are the ordinals."""
+
+        params: list[object] = [q, q + "\U0010ffff"]
+        where = "name_key >= ? AND name_key < ?"
+        if code is not None:
+            where += " AND country = ?"
+            params.append(code)
+        rows = self._connection().execute(
+            f"SELECT id, {_COLUMNS} FROM businesses WHERE {where}", params
+        )
+        for row in rows:
+            yield row[0], BusinessRecord(*row[1:])
+
+    def warm(self) -> None:
+        """Nothing to build: every index lives in the database file."""
+
+    def name_keys(self) -> Iterator[tuple[str, str]]:
+        """Every lookup key, read from the covering index."""
+
+        rows = self._connection().execute("SELECT name_key, country FROM businesses")
+        for name_key, country in rows:
+            yield name_key, country
+
+    def _name_key(self, ordinal: int) -> str:
+        row = (
+            self._connection()
+            .execute("SELECT name_key FROM businesses WHERE id = ?", (ordinal,))
+            .fetchone()
+        )
+        return str(row[0])
+
+    def _record(self, ordinal: int) -> BusinessRecord:
+        row = (
+            self._connection()
+            .execute(f"SELECT {_COLUMNS} FROM businesses WHERE id = ?", (ordinal,))
+            .fetchone()
+        )
+        return BusinessRecord(*row)
+
+    def _postings(self, gram: str, code: str) -> Optional[Sequence[int]]:
+        # Fuzzy blocking skips lists longer than MAX_POSTINGS_PER_GRAM, so
+        # one more id is enough to tell it a list is too long.
+        rows = self._connection().execute(
+            "SELECT b.id FROM businesses_fts JOIN businesses b "
+            "ON b.id = businesses_fts.rowid "
+            "WHERE businesses_fts MATCH ? AND b.country = ? "
+            "ORDER BY businesses_fts.rowid LIMIT ?",
+            (_match_expression({gram}), code, MAX_POSTINGS_PER_GRAM + 1),
+        )
+        return [row[0] for row in rows] or None
+
+    def _iter_matches(self, q: str, code: Optional[str]) -> Iterator[BusinessRecord]:
+        """Yield records whose name contains `q`, in insertion order."""
+
+        conn = self._connection()
+        country = " AND b.country = ?" if code is not None else ""
+        extra = (code,) if code is not None else ()
+        if len(q) < MIN_QUERY_LENGTH:
+            # No trigrams to look up: scan, letting SQLite do the containment
+            # check (instr on UTF-8 text agrees with `in` on str).
+            rows = conn.execute(
+                f"SELECT b.name_key, {_COLUMNS} FROM businesses b "
+                f"WHERE instr(b.name_key, ?) > 0{country} ORDER BY b.id",
+                (q, *extra),
+            )
+        else:
+            rows = conn.execute(
+                f"SELECT b.name_key, {_COLUMNS} FROM businesses_fts "
+                "JOIN businesses b ON b.id = businesses_fts.rowid "
+                f"WHERE businesses_fts MATCH ?{country} "
+                "ORDER BY businesses_fts.rowid",
+                (_match_expression(trigrams(q)), *extra),
+            )
+        for name_key, *fields in rows:
+            if q in name_key:
+                yield BusinessRecord(*fields)
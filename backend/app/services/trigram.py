@@ -0,0 +1,425 @@
+"""
+Trigram inverted index
+
+Maps every three-character window ("trigram") of a normalized business name to
+a posting list of record ordinals. A substring query can then only match
+records that contain all of the query's trigrams, so candidates come from
+intersecting a handful of posting lists instead of scanning the dataset.
+
+Ordinals are assigned by the owning provider in insertion order and appended
+monotonically, which keeps every posting list sorted and lets callers stream
+candidates in the same order a linear scan would visit them.
+
+`TrigramIndex` is the growable form. Read-only stores use a
+`PackedTrigramIndex` instead: three flat arrays (also the snapshot file layout)
+that hold the postings without an array object, dict entry and key string per
+trigram. `PackedTrigramBuilder` fills it without ever creating those
+per-trigram objects, whose freed memory the allocator would otherwise keep.
+"""
+
+from __future__ import annotations
+
+import heapq
+import zlib
+from array import array
+from bisect import bisect_left
+from itertools import chain, pairwise, repeat
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+# Queries shorter than this have no trigrams; callers fall back to a scan.
+MIN_QUERY_LENGTH = 3
+
+# Partition key used for every record when country partitioning is disabled.
+_ALL = ""
+
+# Whether a renumbered ordinal is kept by a merge (it is not negative).
+_KEPT = (-1).__lt__
+
+# One partition of a flattened index: its country ("" when not partitioned),
+# its trigrams, and their posting lists concatenated in that order, list `i`
+# spanning `offsets[i]:offsets[i + 1]`.
+FlatPartition = tuple[str, list[str], "array[int]", "array[int]"]
+
+
+def trigrams(text: str) -> set[str]:
+    """Return the distinct three-character windows of `text`."""
+
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Posting-list index over normalized names, optionally split by country.
+
+    Partitioning by country keeps country-filtered searches from touching other
+    countries' postings at the cost of one extra dict level; unfiltered
+    searches merge the per-country candidate streams by ordinal.
+    """
+
+    def __init__(self, partition_by_country: bool = True) -> None:
+        self._partitioned = partition_by_country
+        # partition -> trigram -> sorted ordinals ("I" keeps postings compact)
+        self._postings: dict[str, dict[str, array[int]]] = {}
+
+    @property
+    def partitioned(self) -> bool:
+        """Whether postings are split per country code."""
+
+        return self._partitioned
+
+    def partitions(self) -> Iterator[tuple[str, dict[str, array[int]]]]:
+        """Yield `(country, trigram -> postings)` pairs for serialization.
+
+        The country is "" when the index is not partitioned.
+        """
+
+        yield from self._postings.items()
+
+    def add(self, ordinal: int, name_key: str, country: str) -> None:
+        """Index `name_key` under `ordinal`.
+
+        Ordinals must be added in increasing order so posting lists stay sorted.
+        """
+
+        part = self._postings.setdefault(country if self._partitioned else _ALL, {})
+        for gram in trigrams(name_key):
+            postings = part.get(gram)
+            if postings is None:
+                postings = part[gram] = array("I")
+            postings.append(ordinal)
+
+    def flatten(self) -> list[FlatPartition]:
+        """Every partition's postings as one array, a form that pickles and
+        merges much faster than a dict of arrays (see `merge`)."""
+
+        out: list[FlatPartition] = []
+        for country, part in self._postings.items():
+            grams = list(part)
+            offsets = array("I", [0]) * (len(grams) + 1)
+            postings = array("I")
+            for i, gram in enumerate(grams):
+                postings.extend(part[gram])
+                offsets[i + 1] = len(postings)
+            out.append((country, grams, offsets, postings))
+        return out
+
+    def merge(self, parts: Iterable[FlatPartition], ordinals: Sequence[int]) -> None:
+        """Append the `flatten`ed postings of an index partitioned like this
+        one but built on its own (e.g. by a worker over a chunk of records).
+
+        Its ordinal `i` becomes `ordinals[i]`, or is dropped when that is
+        negative. New ordinals must exceed every ordinal already indexed.
+        """
+
+        renumber = ordinals.__getitem__
+        drop = min(ordinals, default=0) < 0
+        for country, grams, offsets, postings in parts:
+            mine = self._postings.setdefault(country, {})
+            if not drop:
+                postings = array("I", map(renumber, postings))
+            for i, gram in enumerate(grams):
+                target = mine.get(gram)
+                if target is None:
+                    target = mine[gram] = array("I")
+                chunk = postings[offsets[i] : offsets[i + 1]]
+                if drop:
+                    target.extend(filter(_KEPT, map(renumber, chunk)))
+                else:
+                    target.extend(chunk)
+
+    def postings(self, gram: str, country: str) -> Optional[array[int]]:
+        """Return one country's posting list for `gram`, if any.
+
+        Only meaningful for partitioned indexes.
+        """
+
+        if not self._partitioned:
+            raise ValueError("Per-country postings need a partitioned index")
+        return self._postings.get(country, {}).get(gram)
+
+    def candidates(self, query: str, country: Optional[str] = None) -> Iterator[int]:
+        """Yield ordinals of records containing every trigram of `query`.
+
+        `query` must already be normalized (lowercased) and at least
+        `MIN_QUERY_LENGTH` characters long. Ordinals are yielded in ascending
+        order. When the index is not partitioned, `country` is ignored and the
+        caller must apply the country filter itself.
+        """
+
+        grams = trigrams(query)
+        if not self._partitioned:
+            return _intersect(self._postings.get(_ALL, {}), grams)
+        if country is not None:
+            return _intersect(self._postings.get(country, {}), grams)
+        streams = [_intersect(part, grams) for part in self._postings.values()]
+        return heapq.merge(*streams)
+
+
+def _intersect(part: dict[str, array[int]], grams: set[str]) -> Iterator[int]:
+    """Lazily intersect the posting lists of `grams` within one partition."""
+
+    lists = []
+    for gram in grams:
+        postings = part.get(gram)
+        if postings is None:
+            return iter(())
+        lists.append(postings)
+    return intersect(lists)
+
+
+def intersect(lists: Sequence[Sequence[int]]) -> Iterator[int]:
+    """Lazily intersect sorted posting lists, driving from the smallest.
+
+    Accepts any indexable sorted sequences (arrays, memoryviews), so on-disk
+    indexes can share the same walk.
+    """
+
+    if not lists:
+        return iter(())
+    lists = sorted(lists, key=len)
+    return _walk(lists[0], lists[1:])
+
+
+def _walk(driver: Sequence[int], others: list[Sequence[int]]) -> Iterator[int]:
+    """Yield ordinals of `driver` present in every list of `others`.
+
+    Each other list keeps a moving lower bound, so the total cost is roughly
+    len(driver) binary searches per list.
+    """
+
+    cursors = [0] * len(others)
+    for ordinal in driver:
+        for i, postings in enumerate(others):
+            pos = bisect_left(postings, ordinal, cursors[i])
+            cursors[i] = pos
+            if pos == len(postings):
+                return
+            if postings[pos] != ordinal:
+                break
+        else:
+            yield ordinal
+
+
+def gram_key(country_code: int, gram: str) -> int:
+    """Sort key of one country's trigram posting list in a packed index.
+
+    crc32 collisions merge posting lists, which only widens the candidate set;
+    every candidate is still substring-checked.
+    """
+
+    return (country_code << 32) | zlib.crc32(gram.encode("utf-8"))
+
+
+class PackedTrigramIndex:
+    """Read-only per-country postings in three flat arrays.
+
+    Parameters:
+      keys: Sorted `gram_key`s.
+      offsets: Start of each key's postings in `postings` (keys + 1 entries).
+      postings: Sorted ordinals of every key, concatenated.
+      countries: Number of country codes (codes are `0..countries - 1`).
+
+    Any integer sequences work, e.g. `memoryview`s into a mapped file.
+    """
+
+    def __init__(
+        self,
+        keys: Sequence[int],
+        offsets: Sequence[int],
+        postings: Sequence[int],
+        countries: int,
+    ) -> None:
+        self.keys = keys
+        self.offsets = offsets
+        self.postings_data = postings
+        self._countries = countries
+
+    def postings(self, gram: str, country_code: int) -> Optional[Sequence[int]]:
+        """One country's posting list for `gram`, if any."""
+
+        key = gram_key(country_code, gram)
+        pos = bisect_left(self.keys, key)
+        if pos == len(self.keys) or self.keys[pos] != key:
+            return None
+        start, end = self.offsets[pos], self.offsets[pos + 1]
+        return self.postings_data[start:end]
+
+    def candidates(self, query: str, country_code: Optional[int]) -> Iterator[int]:
+        """Like `TrigramIndex.candidates`, for a country code (or all)."""
+
+        if country_code is None:
+            return heapq.merge(
+                *(self.candidates(query, c) for c in range(self._countries))
+            )
+        lists: list[Sequence[int]] = []
+        for gram in trigrams(query):
+            postings = self.postings(gram, country_code)
+            if postings is None:
+                return iter(())
+            lists.append(postings)
+        return intersect(lists)
+
+
+class PackedTrigramBuilder:
+    """Collects postings in flat arrays and packs them into the final layout.
+
+    Records are either added one by one, each (record, trigram) pair costing
+    four bytes until `build` places it with one counting-sort pass, or merged
+    a chunk at a time from `TrigramIndex.flatten` parts, whose posting lists
+    `build` copies whole. A builder takes one or the other.
+    """
+
+    def __init__(self) -> None:
+        # country code -> trigram -> dense id, in first-seen order
+        self._ids: dict[int, dict[str, int]] = {}
+        # postings per dense id
+        self._counts = array("I")
+        # ids of each added record's trigrams, concatenated
+        self._entries = array("I")
+        self._ordinals = array("I")
+        self._ends = array("Q")
+        # (dense ids, offsets, postings) of each merged partition
+        self._segments: list[tuple[array[int], array[int], array[int]]] = []
+
+    def add(self, ordinal: int, name_key: str, country_code: int) -> None:
+        """Index `name_key` under `ordinal`, which must exceed earlier ones."""
+
+        if self._segments:
+            raise ValueError("Cannot add to a builder that merged chunks")
+        ids = self._ids.setdefault(country_code, {})
+        counts, entries = self._counts, self._entries
+        for gram in trigrams(name_key):
+            gram_id = ids.get(gram)
+            if gram_id is None:
+                gram_id = ids[gram] = len(counts)
+                counts.append(1)
+            else:
+                counts[gram_id] += 1
+            entries.append(gram_id)
+        self._ordinals.append(ordinal)
+        self._ends.append(len(entries))
+
+    def merge(
+        self,
+        parts: Iterable[FlatPartition],
+        ordinals: Sequence[int],
+        country_code: Callable[[str], int],
+    ) -> None:
+        """Append the `TrigramIndex.flatten` parts of a chunk's index.
+
+        Its ordinal `i` becomes `ordinals[i]`, or is dropped when that is
+        negative, and `country_code` gives the code of each partition's
+        country. Ordinals must keep increasing.
+        """
+
+        if self._ordinals:
+            raise ValueError("Cannot merge into a builder records were added to")
+        renumber = ordinals.__getitem__
+        drop = min(ordinals, default=0) < 0
+        counts = self._counts
+        for country, grams, offsets, postings in parts:
+            if drop:
+                kept = array("I")
+                kept_offsets = array("I", [0]) * len(offsets)
+                for i in range(len(grams)):
+                    chunk = postings[offsets[i] : offsets[i + 1]]
+                    kept.extend(filter(_KEPT, map(renumber, chunk)))
+                    kept_offsets[i + 1] = len(kept)
+                postings, offsets = kept, kept_offsets
+            else:
+                postings = array("I", map(renumber, postings))
+            ids = self._ids.setdefault(country_code(country), {})
+            gram_ids = array("I", [0]) * len(grams)
+            for i, gram in enumerate(grams):
+                gram_id = ids.get(gram)
+                if gram_id is None:
+                    gram_id = ids[gram] = len(counts)
+                    counts.append(0)
+                counts[gram_id] += offsets[i + 1] - offsets[i]
+                gram_ids[i] = gram_id
+            self._segments.append((gram_ids, offsets, postings))
+
+    def build(self) -> PackedTrigramIndex:
+        """Return the packed index; the builder is left empty."""
+
+        keyed = sorted(
+            (gram_key(code, gram), gram_id)
+            for code, ids in self._ids.items()
+            for gram, gram_id in ids.items()
+        )
+        countries = 1 + max(self._ids, default=-1)
+        self._ids.clear()
+        keys = array("Q")
+        # gram id -> position of its key; crc32 collisions share a position
+        slot = array("I", [0]) * len(keyed)
+        for key, gram_id in keyed:
+            if not keys or keys[-1] != key:
+                keys.append(key)
+            slot[gram_id] = len(keys) - 1
+
+        offsets = array("Q", [0]) * (len(keys) + 1)
+        for gram_id, count in enumerate(self._counts):
+            offsets[slot[gram_id] + 1] += count
+        for pos in range(len(keys)):
+            offsets[pos + 1] += offsets[pos]
+        self._counts = array("I")
+
+        # Lists index faster than arrays in these, the hottest loops.
+        positions, next_free = slot.tolist(), offsets[:-1].tolist()
+        postings = array("I", [0]) * offsets[-1]
+        for gram_id, ordinal in zip(self._entries, self._entry_ordinals(), strict=True):
+            pos = positions[gram_id]
+            at = next_free[pos]
+            postings[at] = ordinal
+            next_free[pos] = at + 1
+        for gram_ids, starts, chunk in self._segments:
+            for i, gram_id in enumerate(gram_ids):
+                pos = positions[gram_id]
+                at = next_free[pos]
+                end = at + starts[i + 1] - starts[i]
+                postings[at:end] = chunk[starts[i] : starts[i + 1]]
+                next_free[pos] = end
+        self._entries = array("I")
+        self._ordinals = array("I")
+        self._ends = array("Q")
+        self._segments = []
+
+        if len(keys) < len(keyed):
+            postings, offsets = _merge_collisions(keyed, keys, offsets, postings)
+        # Slices of a memoryview share the buffer instead of copying it.
+        return PackedTrigramIndex(keys, offsets, memoryview(postings), countries)
+
+    def _entry_ordinals(self) -> Iterator[int]:
+        """Yield the ordinal of each entry, in entry order."""
+
+        # One start too many: the last end starts nothing.
+        starts = chain((0,), self._ends)
+        rows = zip(self._ordinals, starts, self._ends, strict=False)
+        return chain.from_iterable(
+            repeat(ordinal, end - start) for ordinal, start, end in rows
+        )
+
+
+def _merge_collisions(
+    keyed: list[tuple[int, int]],
+    keys: array[int],
+    offsets: array[int],
+    postings: array[int],
+) -> tuple[array[int], array[int]]:
+    """Sort and dedupe the postings of keys several trigrams share.
+
+    Their lists were placed one after the other, and a record holding more
+    than one of the trigrams was posted once for each.
+    """
+
+    shared = {
+        bisect_left(keys, key) for (key, _), (nxt, _) in pairwise(keyed) if key == nxt
+    }
+    out = array("I")
+    out_offsets = array("Q", [0]) * len(offsets)
+    for pos in range(len(keys)):
+        chunk = postings[offsets[pos] : offsets[pos + 1]]
+        if pos in shared:
+            chunk = array("I", sorted(set(chunk)))
+        out.extend(chunk)
+        out_offsets[pos + 1] = len(out)
+    return out, out_offsets
@@ -0,0 +1,12 @@
+"""
+Performance benchmarks for the backend
+
+Run with `python -m backend.bench <command>`:
+
+- `generate`: deterministic synthetic seed files (10k / 1M / 10M records).
+- `micro`: provider load time, peak memory, lookup and search latency.
+- `load`: in-process HTTP load against `/v1/verify` and `/v1/verify/search`.
+
+Every command writes a JSON report (results plus environment and git commit)
+so numbers can be compared between commits.
+"""
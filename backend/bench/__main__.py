@@ -0,0 +1,134 @@
+"""
+Benchmark command line
+
+Usage:
+    python -m backend.bench generate SIZE OUT [--seed N]
+    python -m backend.bench micro SEED [--store dict|columnar] [--out FILE]
+    python -m backend.bench load [--seed-file SEED] [--requests N] [--out FILE]
+    python -m backend.bench memory PID [--out FILE]
+    python -m backend.bench startup SEED [--store dict|columnar] [--workers 1,2,4]
+
+SIZE is 10k, 1m, 10m or a record count. PID is a running pre-fork server's
+master (e.g. gunicorn with backend/gunicorn.conf.py). Reports are JSON (stdout unless
+--out is given) and include the git commit they were measured at.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+
+
+def _generate(args: argparse.Namespace) -> int:
+    from .generate import parse_size, write_seed
+
+    started = time.perf_counter()
+    count = write_seed(Path(args.out), parse_size(args.size), seed=args.seed)
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {count:,} records to {args.out} in {elapsed:.1f}s", file=sys.stderr)
+    return 0
+
+
+def _micro(args: argparse.Namespace) -> int:
+    from .micro import run_micro
+    from .report import write_report
+
+    results = run_micro(
+        Path(args.seed),
+        store=args.store,
+        lookups=args.lookups,
+        searches=args.searches,
+        workers=args.workers,
+    )
+    write_report(Path(args.out) if args.out else None, "micro", results)
+    return 0
+
+
+def _load(args: argparse.Namespace) -> int:
+    from .load import run_load
+    from .report import write_report
+
+    results = run_load(
+        Path(args.seed_file) if args.seed_file else None,
+        requests=args.requests,
+        concurrency=args.concurrency,
+    )
+    write_report(Path(args.out) if args.out else None, "load", results)
+    return 0
+
+
+def _memory(args: argparse.Namespace) -> int:
+    from .memory import memory_report
+    from .report import write_report
+
+    write_report(
+        Path(args.out) if args.out else None, "memory", memory_report(args.pid)
+    )
+    return 0
+
+
+def _startup(args: argparse.Namespace) -> int:
+    from .report import write_report
+    from .startup import run_startup
+
+    workers = [int(w) for w in args.workers.split(",")]
+    results = run_startup(
+        Path(args.seed), store=args.store, workers=workers, repeat=args.repeat
+    )
+    write_report(Path(args.out) if args.out else None, "startup", results)
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from .micro import STORES
+
+    parser = argparse.ArgumentParser(prog="python -m backend.bench")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("generate", help="Write a deterministic synthetic seed")
+    p.add_argument("size", help="10k, 1m, 10m or a record count")
+    p.add_argument("out", help="Output path (.jsonl for JSON Lines, else JSON)")
+    p.add_argument("--seed", type=int, default=42, help="Random seed")
+    p.set_defaults(func=_generate)
+
+    p = sub.add_parser("micro", help="Provider load/lookup/search benchmarks")
+    p.add_argument("seed", help="Seed file (JSON array or JSON Lines)")
+    p.add_argument("--store", choices=STORES, default="dict")
+    p.add_argument("--lookups", type=int, default=20_000)
+    p.add_argument("--searches", type=int, default=500)
+    p.add_argument(
+        "--workers", type=int, default=1, help="Seed loading processes (0: all)"
+    )
+    p.add_argument("--out", help="Write the JSON report here")
+    p.set_defaults(func=_micro)
+
+    p = sub.add_parser("load", help="In-process HTTP load on verify and search")
+    p.add_argument("--seed-file", help="Seed to serve (default: DATA_SEED_PATH)")
+    p.add_argument("--requests", type=int, default=5_000)
+    p.add_argument("--concurrency", type=int, default=32)
+    p.add_argument("--out", help="Write the JSON report here")
+    p.set_defaults(func=_load)
+
+    p = sub.add_parser("memory", help="Shared vs private memory per worker")
+    p.add_argument("pid", type=int, help="Master process id")
+    p.add_argument("--out", help="Write the JSON report here")
+    p.set_defaults(func=_memory)
+
+    p = sub.add_parser("startup", help="Seed load time per worker count")
+    p.add_argument("seed", help="Seed file (JSON array or JSON Lines)")
+    p.add_argument("--store", choices=STORES, default="dict")
+    p.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts")
+    p.add_argument("--repeat", type=int, default=1, help="Best of N loads each")
+    p.add_argument("--out", help="Write the JSON report here")
+    p.set_defaults(func=_startup)
+
+    args = parser.parse_args(argv)
+    result: int = args.func(args)
+    return result
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Synthetic registry generator
+
+Writes deterministic seed files shaped like real registry extracts: a skewed
+country mix (most records from a few large registries), country-specific
+legal forms and cities, multi-token names drawn from shared word pools (so
+common words like "global" or "holdings" produce long search posting lists),
+and a mostly-Active status mix. The same `size` and `seed` always produce a
+byte-identical file.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+from typing import Iterator
+
+from ..app.services.seedfile import is_jsonl
+
+# Named sizes accepted by the CLI.
+SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+
+# (country, relative weight, legal forms, cities)
+_COUNTRIES: list[tuple[str, float, tuple[str, ...], tuple[str, ...]]] = [
+    ("US", 30, ("Inc", "LLC", "Corp", "Co"), ("New York", "Austin", "Chicago")),
+    ("GB", 12, ("Ltd", "PLC", "LLP"), ("London", "Manchester", "Leeds")),
+    ("DE", 10, ("GmbH", "AG", "KG"), ("Berlin", "München", "Köln")),
+    ("FR", 7, ("SAS", "SARL", "SA"), ("Paris", "Lyon", "Marseille")),
+    ("CA", 6, ("Inc", "Ltd", "Corp"), ("Toronto", "Montréal", "Calgary")),
+    ("IN", 5, ("Pvt Ltd", "Ltd", "LLP"), ("Mumbai", "Bengaluru", "Delhi")),
+    ("AU", 5, ("Pty Ltd", "Ltd"), ("Sydney", "Melbourne", "Perth")),
+    ("NL", 4, ("BV", "NV"), ("Amsterdam", "Rotterdam", "Utrecht")),
+    ("ES", 4, ("SL", "SA"), ("Madrid", "Barcelona", "Valencia")),
+    ("IT", 4, ("SRL", "SpA"), ("Milano", "Roma", "Torino")),
+    ("JP", 4, ("KK", "GK"), ("Tokyo", "Osaka", "Nagoya")),
+    ("BR", 3, ("Ltda", "SA"), ("São Paulo", "Rio de Janeiro", "Curitiba")),
+    ("CH", 2, ("AG", "GmbH", "SA"), ("Zürich", "Genève", "Basel")),
+    ("SE", 2, ("AB",), ("Stockholm", "Göteborg", "Malmö")),
+    ("IE", 2, ("Ltd", "DAC"), ("Dublin", "Cork", "Galway")),
+]
+
+_PREFIXES = (
+    "Acme Apex Atlas Aurora Beacon Blue Bright Cedar Summit Crest Delta Eagle "
+    "Echo Ember Evergreen Falcon Firefly Frontier Gold Granite Harbor Horizon "
+    "Iron Juniper Keystone Lakeside Liberty Lumen Maple Meridian Nova Oak "
+    "Orion Pacific Pinnacle Polar Prime Quantum Redwood River Sapphire Silver "
+    "Stone Sterling Sun Terra Titan True Union Vertex Vista Willow Zenith"
+).split()
+_SURNAMES = (
+    "Smith Müller Martin Rossi García Tanaka Silva Johnson Schmidt Dubois "
+    "Brown Williams Jones Fischer Bernard Romano López Suzuki Santos Taylor "
+    "Wilson Weber Moreau Ricci Martínez Sato Oliveira Evans Walker O'Brien"
+).split()
+_INDUSTRY = (
+    "Analytics Bakery Biotech Builders Capital Consulting Design Dynamics "
+    "Electric Energy Engineering Foods Freight Global Health Holdings Imports "
+    "Industries Insurance Labs Logistics Logic Media Metals Mining Motors "
+    "Networks Partners Pharma Properties Retail Robotics Security Services "
+    "Software Solutions Systems Technologies Textiles Trading Ventures Works"
+).split()
+
+_STATUSES = ("Active", "Inactive", "Unknown")
+_STATUS_WEIGHTS = (82, 16, 2)
+
+
+def _name(rng: random.Random, legal_forms: tuple[str, ...]) -> str:
+    shape = rng.random()
+    if shape < 0.45:
+        words = [rng.choice(_PREFIXES), rng.choice(_INDUSTRY)]
+    elif shape < 0.7:
+        words = [rng.choice(_SURNAMES), rng.choice(_INDUSTRY)]
+    elif shape < 0.85:
+        words = [rng.choice(_SURNAMES), "&", rng.choice(_SURNAMES)]
+    else:
+        words = [rng.choice(_PREFIXES), rng.choice(_PREFIXES), rng.choice(_INDUSTRY)]
+    # A numeric discriminator keeps large files mostly free of duplicate keys,
+    # as real registries distinguish same-named companies.
+    return f"{' '.join(words)} {rng.randrange(10_000)} {rng.choice(legal_forms)}"
+
+
+def iter_records(count: int, seed: int = 42) -> Iterator[dict[str, str]]:
+    """Yield `count` deterministic seed records."""
+
+    rng = random.Random(seed)
+    weights = [w for _, w, _, _ in _COUNTRIES]
+    for _ in range(count):
+        country, _, forms, cities = rng.choices(_COUNTRIES, weights)[0]
+        yield {
+            "legal_name": _name(rng, forms),
+            "address_line1": f"{rng.randrange(1, 2000)} {rng.choice(_INDUSTRY)} St",
+            "city": rng.choice(cities),
+            "country": country,
+            "registration_status": rng.choices(_STATUSES, _STATUS_WEIGHTS)[0],
+        }
+
+
+def write_seed(out: Path, count: int, seed: int = 42) -> int:
+    """Write `count` records to `out` (JSON Lines by suffix, else a JSON array).
+
+    Returns the number of records written.
+    """
+
+    jsonl = is_jsonl(out)
+    with out.open("w", encoding="utf-8") as f:
+        if not jsonl:
+            f.write("[\n")
+        for i, item in enumerate(iter_records(count, seed)):
+            line = json.dumps(item, ensure_ascii=False)
+            if jsonl:
+                f.write(line + "\n")
+            else:
+                f.write(("" if i == 0 else ",\n") + line)
+        if not jsonl:
+            f.write("\n]\n")
+    return count
+
+
+def parse_size(value: str) -> int:
+    """Accept a named size ("1m") or a plain record count."""
+
+    named = SIZES.get(value.strip().lower())
+    return named if named is not None else int(value.replace("_", ""))
@@ -0,0 +1,171 @@
+"""
+In-process HTTP load driver
+
+Drives the ASGI app directly (no sockets, no extra client dependency) with a
+fixed number of concurrent workers and reports latency percentiles and
+throughput per endpoint. Requests go through the full FastAPI stack (routing,
+validation, dependencies, middleware, serialization), so results track what
+the API adds on top of the provider micro-benchmarks without network noise.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+from urllib.parse import urlencode
+
+from ..app.config import Settings
+from ..app.main import create_app
+from .micro import sample_names
+from .report import summarize
+
+# (method, path, query string, body)
+_Request = tuple[str, str, str, bytes]
+
+
+class ASGIDriver:
+    """Minimal HTTP/1.1 request runner for an ASGI app."""
+
+    def __init__(self, app: Callable[..., Any]) -> None:
+        self._app = app
+
+    async def request(
+        self, method: str, path: str, query: str = "", body: bytes = b""
+    ) -> tuple[int, bytes]:
+        """Send one request and return `(status, body)`."""
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": [
+                (b"host", b"bench"),
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": ("bench", 80),
+        }
+        done = asyncio.Event()
+        delivered = False
+        status = 0
+        chunks: list[bytes] = []
+
+        async def receive() -> dict[str, Any]:
+            nonlocal delivered
+            if not delivered:
+                delivered = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    done.set()
+
+        await self._app(scope, receive, send)
+        done.set()
+        return status, b"".join(chunks)
+
+
+def _verify_requests(
+    names: list[tuple[str, str]], rng: random.Random, miss_ratio: float
+) -> Iterator[_Request]:
+    while True:
+        name, country = rng.choice(names)
+        if rng.random() < miss_ratio:
+            name = f"{name} Zzqx"
+        body = json.dumps({"name": name, "country": country}).encode()
+        yield "POST", "/v1/verify", "", body
+
+
+def _search_requests(
+    names: list[tuple[str, str]], rng: random.Random
+) -> Iterator[_Request]:
+    while True:
+        name, country = rng.choice(names)
+        params = {"q": name.split()[0], "limit": 10}
+        if rng.random() < 0.5:
+            params["country"] = country
+        yield "GET", "/v1/verify/search", urlencode(params), b""
+
+
+async def _drive(
+    driver: ASGIDriver,
+    requests: Iterator[_Request],
+    total: int,
+    concurrency: int,
+) -> dict:
+    samples: list[int] = []
+    statuses: dict[str, int] = {}
+    remaining = total
+    clock = time.perf_counter_ns
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            method, path, query, body = next(requests)
+            t0 = clock()
+            status, _ = await driver.request(method, path, query, body)
+            samples.append(clock() - t0)
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    started = clock()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = (clock() - started) / 1e9
+    return {**summarize(samples, elapsed), "statuses": statuses}
+
+
+def run_load(
+    seed: Optional[Path],
+    requests: int = 5_000,
+    concurrency: int = 32,
+    warmup: int = 200,
+    miss_ratio: float = 0.2,
+    rng_seed: int = 1,
+) -> dict:
+    """Load `/v1/verify` and `/v1/verify/search` in turn and report results.
+
+    `seed` defaults to the app's configured dataset; names for the workload
+    are sampled from it.
+    """
+
+    settings = Settings.from_env()
+    if seed is not None:
+        settings = dataclasses.replace(settings, seed_path=seed)
+    app = create_app(settings)
+    driver = ASGIDriver(app)
+    names = sample_names(settings.seed_path, 5_000, rng_seed)
+    rng = random.Random(rng_seed)
+
+    workloads = {
+        "verify": lambda: _verify_requests(names, rng, miss_ratio),
+        "search": lambda: _search_requests(names, rng),
+    }
+    results: dict[str, Any] = {}
+    for label, make in workloads.items():
+        asyncio.run(_drive(driver, make(), warmup, concurrency))
+        results[label] = asyncio.run(_drive(driver, make(), requests, concurrency))
+    return {
+        "seed": str(settings.seed_path),
+        "requests": requests,
+        "concurrency": concurrency,
+        "results": results,
+    }
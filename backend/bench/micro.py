@@ -0,0 +1,143 @@
+"""
+Provider micro-benchmarks
+
+Measures, for one seed file and storage backend:
+
+- `FileDataProvider` (or columnar) load time and memory (resident set
+  before/after and the process peak),
+- `lookup_business` latency for hits and misses,
+- `search_businesses` latency for common-word, short and full-name queries.
+
+Query names are sampled deterministically from the seed itself, so the same
+seed file and sample seed give the same workload on every run.
+"""
+
+from __future__ import annotations
+
+import gc
+import random
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, Sequence, Union
+
+from ..app.services.columnar import ColumnarDataProvider
+from ..app.services.datasource import FileDataProvider
+from ..app.services.seedfile import iter_seed_items
+from .report import current_rss_bytes, peak_rss_bytes, summarize
+
+STORES = ("dict", "columnar")
+
+
+def sample_names(seed: Path, count: int, rng_seed: int = 1) -> list[tuple[str, str]]:
+    """Reservoir-sample `count` `(legal_name, country)` pairs from a seed file."""
+
+    rng = random.Random(rng_seed)
+    sample: list[tuple[str, str]] = []
+    for i, item in enumerate(iter_seed_items(seed)):
+        pair = (str(item["legal_name"]), str(item["country"]))
+        if len(sample) < count:
+            sample.append(pair)
+        else:
+            j = rng.randrange(i + 1)
+            if j < count:
+                sample[j] = pair
+    return sample
+
+
+def _open(
+    seed: Path, store: str, workers: int
+) -> Union[FileDataProvider, ColumnarDataProvider]:
+    if store == "columnar":
+        return ColumnarDataProvider.from_seed(seed, workers=workers)
+    return FileDataProvider(seed, stream=True, workers=workers)
+
+
+def _time_each(fn: Callable[..., Any], calls: Sequence[tuple[Any, ...]]) -> dict:
+    """Time `fn(*args)` for every argument tuple in `calls`."""
+
+    samples: list[int] = []
+    clock = time.perf_counter_ns
+    started = clock()
+    for args in calls:
+        t0 = clock()
+        fn(*args)
+        samples.append(clock() - t0)
+    return summarize(samples, (clock() - started) / 1e9)
+
+
+def run_micro(
+    seed: Path,
+    store: str = "dict",
+    lookups: int = 20_000,
+    searches: int = 500,
+    rng_seed: int = 1,
+    workers: int = 1,
+) -> dict:
+    """Run the provider micro-benchmarks and return their results.
+
+    `workers` processes decode, validate and index the seed (see
+    `iter_seed_chunks`).
+    """
+
+    names = sample_names(seed, max(lookups, searches, 1), rng_seed)
+    if not names:
+        raise ValueError(f"Seed file has no records: {seed}")
+    rng = random.Random(rng_seed)
+
+    gc.collect()
+    rss_before = current_rss_bytes()
+    started = time.perf_counter()
+    provider = _open(seed, store, workers)
+    load_s = time.perf_counter() - started
+    gc.collect()
+    rss_after = current_rss_bytes()
+
+    keys = [rng.choice(names) for _ in range(lookups)]
+    # Differently-cased input exercises the same normalization clients hit.
+    hit_calls = [(n.upper(), c.lower()) for n, c in keys]
+    miss_calls = [(f"{n} Zzqx", c) for n, c in keys]
+
+    def queries(
+        pick: Callable[[str], str], with_country: bool
+    ) -> list[tuple[str, Optional[str], int]]:
+        chosen = [rng.choice(names) for _ in range(searches)]
+        return [(pick(n), c if with_country else None, 10) for n, c in chosen]
+
+    def first_word(name: str) -> str:
+        return name.split()[0]
+
+    lookup = provider.lookup_business
+    search = provider.search_businesses
+
+    results = {
+        "load": {
+            "seconds": round(load_s, 3),
+            "records": len(provider),
+            "workers": workers,
+        },
+        "memory": {
+            "rss_before_mb": _mb(rss_before),
+            "rss_after_mb": _mb(rss_after),
+            "rss_delta_mb": (
+                _mb(rss_after - rss_before)
+                if rss_before is not None and rss_after is not None
+                else None
+            ),
+            "peak_rss_mb": _mb(peak_rss_bytes()),
+        },
+        "lookup_business": {
+            "hit": _time_each(lookup, hit_calls),
+            "miss": _time_each(lookup, miss_calls),
+        },
+        "search_businesses": {
+            "common_word": _time_each(search, queries(first_word, False)),
+            "common_word_country": _time_each(search, queries(first_word, True)),
+            "two_chars": _time_each(search, queries(lambda n: n[:2], False)),
+            "full_name": _time_each(search, queries(lambda n: n, True)),
+        },
+    }
+    return {"seed": str(seed), "store": store, "results": results}
+
+
+def _mb(value: Optional[int]) -> Optional[float]:
+    return None if value is None else round(value / (1 << 20), 1)
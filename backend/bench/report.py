@@ -0,0 +1,110 @@
+"""
+Benchmark result helpers
+
+Latency summaries and the JSON report envelope shared by all benchmarks.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+try:  # Unix only; memory figures are omitted elsewhere.
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
+
+def summarize(samples_ns: Sequence[int], elapsed_s: Optional[float] = None) -> dict:
+    """Latency percentiles (microseconds) and throughput for timed operations.
+
+    `elapsed_s` is the wall time the samples were collected over; when omitted
+    throughput assumes the operations ran back to back.
+    """
+
+    if not samples_ns:
+        return {"count": 0}
+    ordered = sorted(samples_ns)
+    n = len(ordered)
+
+    def pct(p: float) -> float:
+        return round(ordered[min(n - 1, int(p * n))] / 1000, 2)
+
+    total_s = elapsed_s if elapsed_s is not None else sum(ordered) / 1e9
+    return {
+        "count": n,
+        "mean_us": round(sum(ordered) / n / 1000, 2),
+        "p50_us": pct(0.50),
+        "p95_us": pct(0.95),
+        "p99_us": pct(0.99),
+        "max_us": round(ordered[-1] / 1000, 2),
+        "ops_per_s": round(n / total_s, 1) if total_s > 0 else None,
+    }
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process so far."""
+
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Current resident set size (Linux), else None."""
+
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def environment() -> dict[str, Any]:
+    """Where and when a benchmark ran."""
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_report(path: Optional[Path], benchmark: str, results: dict) -> dict:
+    """Wrap `results` with environment metadata and write it as JSON.
+
+    Prints to stdout when `path` is None. Returns the full report.
+    """
+
+    report = {"benchmark": benchmark, "environment": environment(), **results}
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if path is None:
+        print(text)
+    else:
+        path.write_text(text + "\n", encoding="utf-8")
+    return report
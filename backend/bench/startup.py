@@ -0,0 +1,57 @@
+"""
+Seed load time vs worker count
+
+Loads one seed file with each of several `workers` settings (see
+`iter_seed_chunks`) and reports the wall time of each against the first,
+so the scaling of parallel loads can be checked on the hardware at hand.
+The best of `repeat` runs is kept to smooth out page-cache and scheduling
+noise. Each run also reports the CPU time of this process alone: with
+workers that is the part that stays serial (splitting the file, receiving
+chunks and merging their indexes), which bounds the speedup more cores can
+give.
+"""
+
+from __future__ import annotations
+
+import gc
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+
+from .micro import _open
+
+
+def run_startup(
+    seed: Path,
+    store: str = "dict",
+    workers: Sequence[int] = (1, 2, 4, 8),
+    repeat: int = 1,
+) -> dict:
+    """Time loading `seed` into `store` with each worker count in turn."""
+
+    runs: list[dict] = []
+    for count in workers:
+        best: Optional[tuple[float, float]] = None
+        records = 0
+        for _ in range(max(1, repeat)):
+            gc.collect()
+            started, cpu = time.perf_counter(), time.process_time()
+            provider = _open(seed, store, count)
+            elapsed = (time.perf_counter() - started, time.process_time() - cpu)
+            records = len(provider)
+            del provider
+            best = elapsed if best is None else min(best, elapsed)
+        assert best is not None
+        runs.append(
+            {
+                "workers": count,
+                "seconds": round(best[0], 3),
+                "parent_cpu_seconds": round(best[1], 3),
+                "records": records,
+            }
+        )
+
+    baseline = runs[0]["seconds"] if runs else 0
+    for run in runs:
+        run["speedup"] = round(baseline / run["seconds"], 2) if run["seconds"] else None
+    return {"seed": str(seed), "store": store, "results": {"loads": runs}}
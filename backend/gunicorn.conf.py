@@ -0,0 +1,57 @@
+"""
+Gunicorn configuration for multi-worker deployments
+
+Usage:
+    gunicorn -c backend/gunicorn.conf.py backend.app.main:app
+
+The app (and with it the dataset and its indexes) is imported once in the
+master before workers are forked, so workers start serving immediately and
+share the loaded data through copy-on-write pages instead of each holding a
+private copy.
+
+Sharing only lasts while pages aren't written to. To keep the garbage
+collector from writing to every object it scans:
+
+- collection is disabled in the master while the app loads, so no freed
+  slots are left between loaded objects for later allocations to fill;
+- `gc.freeze()` moves everything loaded into the permanent generation right
+  before each fork, so workers' collections never visit it;
+- workers re-enable collection after the fork.
+
+Reference counting still writes to objects as requests touch them, so
+object-per-record stores (`DATA_STORE=dict`) slowly unshare pages that hold
+hot records. The columnar store and `.snap` snapshots keep records in a few
+large buffers and stay almost entirely shared. Compare workers with
+`python -m backend.bench memory <master pid>`. A seed change picked up by
+the reload watcher is rebuilt in each worker separately, so restart the
+workers (HUP the master) after deploying new data to share it again.
+
+Settings (environment):
+  BIND: Listen address (default 0.0.0.0:8000).
+  WEB_CONCURRENCY: Worker count (default 2 x CPUs + 1).
+  WARM_INDEXES: Defaults to on here, so lazily built indexes are built once
+    in the master and shared too.
+"""
+
+import gc
+import multiprocessing
+import os
+from typing import Any
+
+os.environ.setdefault("WARM_INDEXES", "1")
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count() * 2 + 1)))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+# Collection stays off in the master until workers take over (see above).
+gc.disable()
+
+
+def pre_fork(server: Any, worker: Any) -> None:
+    gc.freeze()
+
+
+def post_fork(server: Any, worker: Any) -> None:
+    gc.enable()
@@ -0,0 +1,71 @@
+"""
+Shared test fixtures
+
+`make_seed` builds reproducible random seed records and `write_seed` writes
+records to a seed file in the test's temporary directory: a JSON array, or
+JSON Lines for `.jsonl` / `.ndjson` names.
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping, Sequence
+
+import pytest
+
+from backend.app.services.seedfile import is_jsonl
+
+SeedItems = list[dict[str, str]]
+
+
+def _make_seed(
+    count: int,
+    words: Sequence[str],
+    *,
+    seed: int = 7,
+    repeat: int = 0,
+    countries: Sequence[str] = ("US", "GB", "DE"),
+    statuses: Sequence[str] = ("Active", "Inactive"),
+    cities: Sequence[str] = ("Springfield",),
+    street: str = "Main St",
+) -> SeedItems:
+    """`count` records named "<word> <word> <n>", where n is the record index
+    (modulo `repeat` when set, so names recur); the rest is drawn from the
+    given choices with `random.Random(seed)`."""
+
+    rng = random.Random(seed)
+    return [
+        {
+            "legal_name": (
+                f"{rng.choice(words)} {rng.choice(words)} {i % repeat if repeat else i}"
+            ),
+            "address_line1": f"{i} {street}",
+            "city": rng.choice(cities),
+            "country": rng.choice(countries),
+            "registration_status": rng.choice(statuses),
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def make_seed() -> Callable[..., SeedItems]:
+    return _make_seed
+
+
+@pytest.fixture
+def write_seed(tmp_path: Path) -> Callable[..., Path]:
+    """`write(items, name="seed.json") -> path` under `tmp_path`; rewriting a
+    name replaces the file."""
+
+    def write(items: Iterable[Mapping[str, Any]], name: str = "seed.json") -> Path:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if is_jsonl(path):
+            text = "".join(json.dumps(item) + "\n" for item in items)
+        else:
+            text = json.dumps(list(items))
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    return write
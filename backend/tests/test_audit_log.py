@@ -0,0 +1,150 @@
+"""
+Audit log tests
+
+Events are queued without touching the database and written in batches by
+the background writer (on size or interval), overflow follows the configured
+policy, stopping drains the queue, and the API records verifications and
+searches and serves them from `/v1/audit/history`.
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.config import Settings
+from backend.app.main import create_app
+from backend.app.services.audit import AuditEvent, AuditLog
+
+
+def _event(i: int, country: str = "US") -> AuditEvent:
+    return AuditEvent(kind="search", query=f"Query {i}", country=country, ts=i)
+
+
+def test_events_are_queued_until_written() -> None:
+    with tempfile.TemporaryDirectory() as td:
+        log = AuditLog(Path(td) / "audit.sqlite", batch_size=4, flush_interval=60)
+        assert log.record_many(_event(i) for i in range(10)) == 10
+        assert len(log) == 10 and log.history() == []
+
+        log.start()
+        # Two full batches go out without waiting for the interval.
+        deadline = time.monotonic() + 5
+        while log.stats.written < 8 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert log.stats.written == 8 and len(log) == 2
+
+        log.stop()
+        assert log.stats.as_dict() == {
+            "enqueued": 10,
+            "written": 10,
+            "dropped": 0,
+            "failed": 0,
+            "batches": 3,
+        }
+        assert [e.query for e in log.history(limit=3)] == [
+            "Query 9",
+            "Query 8",
+            "Query 7",
+        ]
+        # Stopped: later events are refused.
+        assert log.record(_event(10)) is False
+        assert log.stats.dropped == 1
+
+
+def test_flush_interval_writes_partial_batch() -> None:
+    with tempfile.TemporaryDirectory() as td:
+        log = AuditLog(Path(td) / "audit.sqlite", batch_size=100, flush_interval=0.05)
+        log.start()
+        try:
+            log.record(_event(1))
+            deadline = time.monotonic() + 5
+            while not log.history() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert [e.query for e in log.history()] == ["Query 1"]
+        finally:
+            log.stop()
+
+
+@pytest.mark.parametrize(
+    ("overflow", "kept"),
+    [("drop_newest", [0, 1, 2]), ("drop_oldest", [3, 4, 5])],
+)
+def test_overflow_policy(overflow: str, kept: list[int]) -> None:
+    with tempfile.TemporaryDirectory() as td:
+        log = AuditLog(
+            Path(td) / "audit.sqlite", max_queue=3, overflow=overflow, batch_size=10
+        )
+        accepted = [log.record(_event(i)) for i in range(6)]
+        assert accepted == [True] * 3 + [overflow == "drop_oldest"] * 3
+        log.start()
+        log.stop()
+        assert sorted(e.ts for e in log.history()) == kept
+        assert log.stats.dropped == 3 and log.stats.written == 3
+
+
+def test_history_filters_and_pages() -> None:
+    with tempfile.TemporaryDirectory() as td:
+        log = AuditLog(Path(td) / "audit.sqlite")
+        log.record_many(_event(i, "US" if i % 2 else "GB") for i in range(20))
+        log.record(AuditEvent(kind="verify", query=" Acme Corp", country="US", ts=30))
+        log.start()
+        log.stop()
+
+        assert [e.ts for e in log.history(kind="verify")] == [30]
+        assert [e.ts for e in log.history(query="acme corp ")] == [30]
+        assert [e.ts for e in log.history(country="gb", limit=3)] == [18, 16, 14]
+        assert [e.ts for e in log.history(since=5, until=8)] == [7, 6, 5]
+
+        page = log.history(kind="search", limit=8)
+        rest = log.history(kind="search", before_id=page[-1].id, limit=100)
+        assert [e.ts for e in page + rest] == list(range(19, -1, -1))
+
+        with pytest.raises(ValueError, match="overflow policy"):
+            AuditLog(Path(td) / "audit.sqlite", overflow="block")
+
+
+def test_api_records_and_serves_history() -> None:
+    with tempfile.TemporaryDirectory() as td:
+        settings = Settings(reload_interval=0, audit_log_path=Path(td) / "audit.sqlite")
+        with TestClient(create_app(settings)) as client:
+            client.post("/v1/verify", json={"name": "Acme Corp", "country": "us"})
+            client.get("/v1/verify/search", params={"q": "acme", "country": "US"})
+            client.post(
+                "/v1/verify/batch",
+                json=[{"name": "Nope Ltd", "country": "GB"}, {"name": ""}],
+            )
+            stats = client.get("/stats").json()["audit"]
+            assert stats["enabled"] is True and stats["enqueued"] == 3
+
+        # Shutdown drained the queue.
+        with TestClient(create_app(settings)) as client:
+            resp = client.get("/v1/audit/history")
+            assert resp.status_code == 200
+            items = resp.json()["items"]
+            assert [
+                (i["kind"], i["query"], i["country"], i["matched"], i["status"])
+                for i in items
+            ] == [
+                ("verify", "Nope Ltd", "GB", None, "clear"),
+                ("search", "acme", "US", "Acme Corp", None),
+                ("verify", "Acme Corp", "US", "Acme Corp", "clear"),
+            ]
+            assert items[1]["results"] >= 1
+            assert resp.json()["next_before"] is None
+
+            resp = client.get(
+                "/v1/audit/history", params={"kind": "verify", "limit": 1}
+            )
+            body = resp.json()
+            assert [i["query"] for i in body["items"]] == ["Nope Ltd"]
+            assert body["next_before"] == body["items"][0]["id"]
+
+
+def test_history_requires_audit_log() -> None:
+    client = TestClient(create_app(Settings(reload_interval=0)))
+    resp = client.get("/v1/audit/history")
+    assert resp.status_code == 404
+    assert client.get("/stats").json()["audit"]["enabled"] is False
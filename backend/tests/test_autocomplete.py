@@ -0,0 +1,104 @@
+"""
+Autocomplete tests
+
+Checks that prefix completions from the sorted per-country index match a
+brute-force filter-and-sort over the records for every storage backend, and
+that the endpoint's optional per-prefix cache serves repeats and is rebuilt
+with the provider.
+"""
+
+from pathlib import Path
+from typing import Callable, Optional
+
+from fastapi.testclient import TestClient
+
+from backend.app.config import Settings
+from backend.app.main import create_app
+from backend.app.services.columnar import ColumnarDataProvider
+from backend.app.services.datasource import BusinessRecord, FileDataProvider
+from backend.app.services.snapshot import SnapshotDataProvider, compile_snapshot
+
+_WORDS = ["acme", "acmes", "ac", "globex", "glob", "zürich", "hooli", "a"]
+_COUNTRIES = ["US", "GB", "DE"]
+
+
+def _reference(
+    provider: FileDataProvider, prefix: str, country: Optional[str], limit: int
+) -> list[BusinessRecord]:
+    p = prefix.strip().lower()
+    code = country.upper() if country else None
+    rows = sorted(
+        (name_key, ctry, rec)
+        for (name_key, ctry), rec in provider._data.items()
+        if name_key.startswith(p) and (code is None or ctry == code)
+    )
+    return [rec for _, _, rec in rows[:limit]]
+
+
+def test_completions_match_reference_for_all_stores(
+    make_seed: Callable[..., list[dict[str, str]]], write_seed: Callable[..., Path]
+) -> None:
+    seed = write_seed(make_seed(800, _WORDS, seed=13, repeat=7, countries=_COUNTRIES))
+    snap = seed.with_suffix(".snap")
+    compile_snapshot(seed, snap)
+
+    expected = FileDataProvider(seed)
+    columnar = ColumnarDataProvider.from_seed(seed)
+    snapshot = SnapshotDataProvider(snap)
+    try:
+        for prefix in ["a", "AC", "acme a", "glob", "zü", "hooli hooli 3", "x"]:
+            for country in [None, "us", "GB", "FR"]:
+                for limit in [1, 7, 1000]:
+                    want = _reference(expected, prefix, country, limit)
+                    for provider in (expected, columnar, snapshot):
+                        got = provider.autocomplete(prefix, country, limit)
+                        assert got == want, (prefix, country, limit)
+    finally:
+        snapshot.close()
+
+
+def test_autocomplete_endpoint() -> None:
+    client = TestClient(create_app())
+
+    r = client.get("/v1/verify/autocomplete", params={"q": "ac"})
+    assert r.status_code == 200
+    assert r.json() == [
+        {"legal_name": "Acme Corp", "country": "US", "registration_status": "Active"}
+    ]
+    r = client.get("/v1/verify/autocomplete", params={"q": "ac", "country": "GB"})
+    assert r.json() == []
+
+    assert client.get("/v1/verify/autocomplete", params={"q": ""}).status_code == 422
+    r = client.get("/v1/verify/autocomplete", params={"q": "a", "limit": 500})
+    assert r.status_code == 422
+
+
+def test_prefix_cache_hits_and_resets_on_reload(
+    make_seed: Callable[..., list[dict[str, str]]], write_seed: Callable[..., Path]
+) -> None:
+    seed = write_seed(make_seed(50, _WORDS, seed=13, repeat=7, countries=_COUNTRIES))
+    settings = Settings(seed_path=seed, reload_interval=0, autocomplete_cache_size=16)
+    app = create_app(settings)
+    client = TestClient(app)
+
+    first = client.get("/v1/verify/autocomplete", params={"q": "acme"}).json()
+    again = client.get("/v1/verify/autocomplete", params={"q": "ACME "}).json()
+    assert first == again and first
+    stats = client.get("/stats").json()["autocomplete_cache"]
+    assert stats["enabled"] is True
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    write_seed(
+        [
+            {
+                "legal_name": "Acme New",
+                "address_line1": "1 New St",
+                "city": "Springfield",
+                "country": "US",
+                "registration_status": "Active",
+            }
+        ]
+    )
+    app.state.providers.reload()
+    r = client.get("/v1/verify/autocomplete", params={"q": "acme"})
+    assert [c["legal_name"] for c in r.json()] == ["Acme New"]
@@ -0,0 +1,90 @@
+"""
+Benchmark suite tests
+
+Keeps the benchmark tooling runnable: the generator is deterministic and its
+files load as seeds, and the micro, load and startup benchmarks produce
+complete JSON reports on a tiny dataset.
+"""
+
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from backend.app.services.datasource import FileDataProvider
+from backend.bench.__main__ import main as bench_main
+from backend.bench.generate import iter_records, parse_size, write_seed
+from backend.bench.load import run_load
+from backend.bench.micro import run_micro
+from backend.bench.report import summarize
+from backend.bench.startup import run_startup
+
+
+def test_generator_is_deterministic_and_loadable() -> None:
+    assert list(iter_records(50, seed=3)) == list(iter_records(50, seed=3))
+    assert list(iter_records(50, seed=3)) != list(iter_records(50, seed=4))
+    assert parse_size("1M") == 1_000_000 and parse_size("2_500") == 2500
+
+    with TemporaryDirectory() as td:
+        array_path = Path(td) / "seed.json"
+        lines_path = Path(td) / "seed.jsonl"
+        write_seed(array_path, 300)
+        write_seed(lines_path, 300)
+        assert len(json.loads(array_path.read_text(encoding="utf-8"))) == 300
+        a, b = FileDataProvider(array_path), FileDataProvider(lines_path)
+        assert a._data == b._data
+
+
+def test_summarize_percentiles() -> None:
+    stats = summarize([i * 1000 for i in range(1, 101)], elapsed_s=0.5)
+    assert stats["p50_us"] == 51.0
+    assert stats["p99_us"] == 100.0
+    assert stats["ops_per_s"] == 200.0
+    assert summarize([]) == {"count": 0}
+
+
+def test_micro_and_load_reports() -> None:
+    with TemporaryDirectory() as td:
+        seed = Path(td) / "seed.jsonl"
+        write_seed(seed, 500)
+
+        micro = run_micro(seed, store="columnar", lookups=200, searches=20)
+        results = micro["results"]
+        assert results["load"]["records"] > 0
+        assert results["lookup_business"]["hit"]["count"] == 200
+        assert set(results["search_businesses"]) == {
+            "common_word",
+            "common_word_country",
+            "two_chars",
+            "full_name",
+        }
+
+        load = run_load(seed, requests=40, concurrency=4, warmup=4)
+        for endpoint in ("verify", "search"):
+            assert load["results"][endpoint]["count"] == 40
+            assert load["results"][endpoint]["statuses"] == {"200": 40}
+
+        out = Path(td) / "report.json"
+        assert (
+            bench_main(["micro", str(seed), "--lookups", "10", "--out", str(out)]) == 0
+        )
+        report = json.loads(out.read_text(encoding="utf-8"))
+        assert report["benchmark"] == "micro"
+        assert {"timestamp", "git_commit", "python"} <= set(report["environment"])
+
+
+def test_startup_report() -> None:
+    with TemporaryDirectory() as td:
+        seed = Path(td) / "seed.json"
+        write_seed(seed, 300)
+
+        loads = run_startup(seed, store="columnar", workers=(1, 2))["results"]["loads"]
+        assert [run["workers"] for run in loads] == [1, 2]
+        assert loads[0]["records"] == loads[1]["records"] > 0
+        assert loads[0]["speedup"] == 1.0
+
+        out = Path(td) / "report.json"
+        argv = ["startup", str(seed), "--workers", "1", "--out", str(out)]
+        assert bench_main(argv) == 0
+        report = json.loads(out.read_text(encoding="utf-8"))
+        assert report["benchmark"] == "startup"
+        assert report["results"]["loads"][0]["workers"] == 1
@@ -0,0 +1,108 @@
+"""
+Columnar provider tests
+
+Checks that ColumnarDataProvider answers lookups and searches exactly like the
+dict-backed FileDataProvider over the same seed, including duplicate keys that
+overwrite earlier rows, when its narrow columns have to widen or trigram keys
+collide, and that it can be selected through DATA_STORE.
+"""
+
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.main import create_app
+from backend.app.services import trigram
+from backend.app.services.columnar import ColumnarDataProvider
+from backend.app.services.datasource import FileDataProvider
+
+_WORDS = ["acme", "globex", "initech", "umbrella", "hooli", "zürich", "stark"]
+_CITIES = ["Springfield", "London", "Berlin", "Zürich"]
+
+
+def test_columnar_matches_file_provider(
+    make_seed: Callable[..., list[dict[str, str]]], write_seed: Callable[..., Path]
+) -> None:
+    """Lookups and searches agree with the dict-backed provider."""
+
+    seed = make_seed(
+        2000,
+        _WORDS,
+        seed=11,
+        repeat=97,
+        countries=["us", "GB", "DE"],
+        statuses=["active", "Inactive", "Unknown"],
+        cities=_CITIES,
+    )
+    path = write_seed(seed)
+    expected = FileDataProvider(path)
+    columnar = ColumnarDataProvider.from_seed(path)
+
+    assert len(columnar) == len(expected._data)
+    for item in seed[:300]:
+        name, code = item["legal_name"].upper(), item["country"]
+        assert columnar.lookup_business(name, code) == expected.lookup_business(
+            name, code
+        )
+    assert columnar.lookup_business("nobody", "US") is None
+    assert columnar.lookup_business("acme acme 1", "FR") is None
+
+    for q in ["acme", "me gl", "zür", "42", "st", "nothing"]:
+        for country in [None, "us", "DE", "FR"]:
+            assert columnar.search_businesses(
+                q, country, 25
+            ) == expected.search_businesses(q, country, 25)
+
+
+def test_columnar_widens_columns_and_merges_colliding_trigrams(
+    monkeypatch: pytest.MonkeyPatch,
+    make_seed: Callable[..., list[dict[str, str]]],
+    write_seed: Callable[..., Path],
+) -> None:
+    """Codes past 255, long rows and crc32 collisions keep answers unchanged."""
+
+    seed = make_seed(1500, _WORDS, seed=5, cities=[f"City {i}" for i in range(400)])
+    seed[7]["legal_name"] = "Acme " + "Long Name " * 40
+    seed[8]["address_line1"] = "Ünter den Linden " * 30
+    # Every trigram of a country shares a posting list.
+    monkeypatch.setattr(trigram, "gram_key", lambda code, gram: code << 32)
+    path = write_seed(seed)
+    expected = FileDataProvider(path)
+    columnar = ColumnarDataProvider.from_seed(path)
+
+    assert columnar._city_codes.typecode == "H"
+    assert columnar._names._lengths.typecode == "H"
+    for item in seed[:20]:
+        name, code = item["legal_name"], item["country"]
+        assert columnar.lookup_business(name, code) == expected.lookup_business(
+            name, code
+        )
+    for q in ["acme", "long name long", "42", "nothing"]:
+        for country in [None, "GB"]:
+            assert columnar.search_businesses(
+                q, country, 25
+            ) == expected.search_businesses(q, country, 25)
+
+
+def test_columnar_store_selected_by_env(
+    monkeypatch: pytest.MonkeyPatch, write_seed: Callable[..., Path]
+) -> None:
+    """DATA_STORE=columnar serves the seed file through the columnar store."""
+
+    seed = [
+        {
+            "legal_name": "Columnar Co",
+            "address_line1": "1 Array Way",
+            "city": "Bytesville",
+            "country": "US",
+            "registration_status": "Active",
+        }
+    ]
+    monkeypatch.setenv("DATA_SEED_PATH", str(write_seed(seed)))
+    monkeypatch.setenv("DATA_STORE", "columnar")
+    client = TestClient(create_app())
+    resp = client.post("/v1/verify", json={"name": "columnar co", "country": "us"})
+    assert resp.status_code == 200
+    assert resp.json()["address"]["city"] == "Bytesville"
@@ -0,0 +1,260 @@
+"""
+Delta update tests
+
+Applying JSON Lines change sets over a loaded provider answers every query
+like a full reload of the changed dataset, publishes a file all at once (or
+not at all when invalid), files removed mid-sync or failing checks don't stop
+the feed, and new files in DATA_DELTA_DIR reach a running app without a
+reload.
+"""
+
+import json
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.config import Settings
+from backend.app.main import create_app
+from backend.app.services.datasource import FileDataProvider
+from backend.app.services.delta import DeltaDataProvider, DeltaFeed, read_delta
+
+_WORDS = ["acme", "globex", "initech", "umbrella", "hooli"]
+
+
+def _record(i: int, status: str = "Active") -> dict[str, str]:
+    rng = random.Random(i)
+    return {
+        "legal_name": f"{rng.choice(_WORDS)} {rng.choice(_WORDS)} {i}",
+        "address_line1": f"{i} Quay Rd",
+        "city": "Leeds",
+        "country": ["GB", "US"][i % 2],
+        "registration_status": status,
+    }
+
+
+def _write_jsonl(path: Path, items: list[dict[str, Any]]) -> Path:
+    path.write_text("".join(json.dumps(i) + "\n" for i in items), encoding="utf-8")
+    return path
+
+
+def _key(item: dict[str, str]) -> tuple[str, str]:
+    return item["legal_name"].title().lower(), item["country"]
+
+
+def test_deltas_match_full_reload() -> None:
+    base_items = [_record(i) for i in range(400)]
+    changes = [
+        # Status flips and address changes of existing records.
+        *({"op": "upsert", **_record(i, "Inactive")} for i in range(0, 60, 3)),
+        # New entities, one upserted twice.
+        *({"op": "upsert", **_record(i)} for i in range(400, 430)),
+        {"op": "upsert", **_record(405, "Inactive")},
+        # Deletes, including an unknown key and a new entity.
+        *(
+            {"op": "delete", "legal_name": base_items[i]["legal_name"], "country": "GB"}
+            for i in range(100, 140, 2)
+        ),
+        {"op": "delete", "legal_name": "Nobody Ltd", "country": "US"},
+        {"op": "delete", **{k: _record(410)[k] for k in ("legal_name", "country")}},
+    ]
+    with tempfile.TemporaryDirectory() as td:
+        base = FileDataProvider(_write_jsonl(Path(td) / "base.jsonl", base_items))
+        delta = DeltaDataProvider(base)
+        first, second = changes[:40], changes[40:]
+        delta.apply(read_delta(_write_jsonl(Path(td) / "1.jsonl", first)))
+        delta.apply(read_delta(_write_jsonl(Path(td) / "2.jsonl", second)))
+
+        # Reference: unchanged base records, then the overlay in apply order.
+        overlay: dict[tuple[str, str], dict[str, str]] = {}
+        for op in changes:
+            fields = {k: v for k, v in op.items() if k != "op"}
+            if op["op"] == "upsert":
+                overlay[_key(fields)] = fields
+            else:
+                overlay.pop(_key({**fields, "legal_name": fields["legal_name"]}), None)
+        masked = {_key(op) for op in changes}
+        expected_items = [i for i in base_items if _key(i) not in masked]
+        expected_items += list(overlay.values())
+        expected = FileDataProvider(
+            _write_jsonl(Path(td) / "expected.jsonl", expected_items)
+        )
+
+        assert delta.stats.as_dict() == {
+            "files": 0,
+            "upserts": 51,
+            "deletes": 22,
+            "overlay": 49,
+            "masked": len(masked),
+            "failures": 0,
+        }
+        probes = base_items[:150] + [_record(i) for i in range(400, 430)]
+        keys = [(i["legal_name"].upper(), i["country"].lower()) for i in probes]
+        assert delta.lookup_many(keys) == expected.lookup_many(keys)
+        for name, code in keys:
+            assert delta.lookup_business(name, code) == (
+                expected.lookup_business(name, code)
+            )
+            # Equal scores may resolve to either record (blocking order).
+            typo = name[:-1] + "x"
+            got = delta.match_business(typo, code, 0.85)
+            want = expected.match_business(typo, code, 0.85)
+            assert (got and got.score) == (want and want.score)
+            if got is not None:
+                rec = got.record
+                assert expected.lookup_business(rec.legal_name, rec.country) == rec
+        for q in ["acme", "umbrella ho", "41", "1", "missing"]:
+            for country in [None, "GB"]:
+                for limit in [5, 40]:
+                    assert delta.search_ranked(q, country, limit) == (
+                        expected.search_ranked(q, country, limit)
+                    )
+        for prefix in ["", "a", "Hooli I", "z"]:
+            for country in [None, "US"]:
+                assert delta.autocomplete(prefix, country, 30) == (
+                    expected.autocomplete(prefix, country, 30)
+                )
+
+
+def test_invalid_file_is_rejected_whole() -> None:
+    with tempfile.TemporaryDirectory() as td:
+        path = _write_jsonl(
+            Path(td) / "bad.jsonl",
+            [{"op": "upsert", **_record(1)}, {"op": "rename", "legal_name": "x"}],
+        )
+        with pytest.raises(ValueError, match="bad.jsonl: Invalid operation at index 1"):
+            read_delta(path)
+        _write_jsonl(path, [{"op": "delete", "legal_name": "x", "country": "USA"}])
+        with pytest.raises(ValueError, match="Invalid delete at index 0"):
+            read_delta(path)
+
+
+def test_sync_applies_directory_in_order_and_retries_failures() -> None:
+    base_items = [_record(i) for i in range(10)]
+    name = base_items[1]["legal_name"]
+    with tempfile.TemporaryDirectory() as td:
+        base = FileDataProvider(_write_jsonl(Path(td) / "base.jsonl", base_items))
+        deltas = Path(td) / "deltas"
+        deltas.mkdir()
+        delta = DeltaDataProvider(base, deltas)
+        _write_jsonl(deltas / "001.jsonl", [{"op": "upsert", **_record(1, "Inactive")}])
+        _write_jsonl(deltas / "002.jsonl", [{"op": "bogus"}])
+        _write_jsonl(
+            deltas / "003.jsonl",
+            [{"op": "delete", "legal_name": name, "country": "US"}],
+        )
+        (deltas / "notes.txt").write_text("ignored", encoding="utf-8")
+
+        # 003 waits behind the broken 002, which is not retried until edited.
+        assert delta.sync() == 1
+        assert delta.sync() == 0
+        rec = delta.lookup_business(name, "US")
+        assert rec is not None and rec.registration_status == "Inactive"
+        assert delta.stats.files == 1 and delta.stats.failures == 1
+
+        _write_jsonl(deltas / "002.jsonl", [])
+        assert delta.sync() == 2
+        assert delta.lookup_business(name, "US") is None
+        assert delta.sync() == 0
+
+
+def test_files_removed_during_sync_are_skipped(monkeypatch: pytest.MonkeyPatch) -> None:
+    with tempfile.TemporaryDirectory() as td:
+        base = FileDataProvider(_write_jsonl(Path(td) / "base.jsonl", [_record(1)]))
+        deltas = Path(td) / "deltas"
+        deltas.mkdir()
+        _write_jsonl(deltas / "002.jsonl", [{"op": "upsert", **_record(2)}])
+        listed = [deltas / "001.jsonl", deltas / "002.jsonl"]
+        monkeypatch.setattr(Path, "iterdir", lambda self: iter(listed))
+        delta = DeltaDataProvider(base, deltas)
+        assert delta.sync() == 1
+        assert delta.stats.failures == 0
+
+
+def test_feed_keeps_polling_after_a_failed_check() -> None:
+    calls: list[int] = []
+
+    class Flaky:
+        def sync(self) -> int:
+            calls.append(len(calls))
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            return 0
+
+    flaky = Flaky()
+    feed = DeltaFeed(lambda: flaky, interval=0.01)
+    feed.start()
+    deadline = time.monotonic() + 5
+    while len(calls) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    feed.stop()
+    assert len(calls) >= 2
+
+
+def test_readers_never_see_half_applied_file() -> None:
+    base_items = [_record(i) for i in range(200)]
+    with tempfile.TemporaryDirectory() as td:
+        base = FileDataProvider(_write_jsonl(Path(td) / "base.jsonl", base_items))
+        delta = DeltaDataProvider(base)
+        flips = [
+            read_delta(
+                _write_jsonl(
+                    Path(td) / f"{status}.jsonl",
+                    [{"op": "upsert", **_record(i, status)} for i in range(200)],
+                )
+            )
+            for status in ("Inactive", "Active")
+        ]
+        keys = [(i["legal_name"], i["country"]) for i in base_items]
+        stop = threading.Event()
+        mixed: list[set[str]] = []
+
+        def read() -> None:
+            while not stop.is_set():
+                found = delta.lookup_many(keys)
+                statuses = {rec.registration_status for rec in found if rec}
+                if len(statuses) != 1:
+                    mixed.append(statuses)
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        for n in range(20):
+            delta.apply(flips[n % 2])
+        stop.set()
+        reader.join()
+        assert mixed == []
+
+
+def test_api_picks_up_new_delta_files() -> None:
+    base_items = [_record(i) for i in range(20)]
+    item = base_items[3]
+    with tempfile.TemporaryDirectory() as td:
+        seed = _write_jsonl(Path(td) / "seed.jsonl", base_items)
+        deltas = Path(td) / "deltas"
+        deltas.mkdir()
+        settings = Settings(
+            seed_path=seed, delta_dir=deltas, reload_interval=0.02, cache_size=100
+        )
+        body = {"name": item["legal_name"], "country": item["country"]}
+        with TestClient(create_app(settings)) as client:
+            assert client.post("/v1/verify", json=body).json()[
+                "registration_status"
+            ] == ("Active")
+            _write_jsonl(
+                deltas / "2024-05-01.jsonl",
+                [{"op": "upsert", **_record(3, "Inactive")}],
+            )
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                resp = client.post("/v1/verify", json=body)
+                if resp.json()["registration_status"] == "Inactive":
+                    break
+                time.sleep(0.02)
+            assert resp.json()["registration_status"] == "Inactive"
+            stats = client.get("/stats").json()["deltas"]
+            assert stats["enabled"] is True and stats["files"] == 1
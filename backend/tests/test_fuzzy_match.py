@@ -0,0 +1,172 @@
+"""
+Fuzzy matching tests
+
+Covers name canonicalization and Jaro-Winkler scoring, trigram blocking, the
+`match_business` fallback across the dict, columnar and snapshot providers,
+and the `match="fuzzy"` mode of the verify endpoint.
+"""
+
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.config import Settings
+from backend.app.main import create_app
+from backend.app.services import fuzzy
+from backend.app.services.columnar import ColumnarDataProvider
+from backend.app.services.datasource import FileDataProvider, InMemoryDataProvider
+from backend.app.services.fuzzy import block_candidates, fuzzy_key, jaro_winkler
+from backend.app.services.snapshot import SnapshotDataProvider, compile_snapshot
+
+_SEED = [
+    {
+        "legal_name": name,
+        "address_line1": f"{i} Main St",
+        "city": "Springfield",
+        "country": country,
+        "registration_status": "Active",
+    }
+    for i, (name, country) in enumerate(
+        [
+            ("Acme Corp", "US"),
+            ("Acme Holdings", "US"),
+            ("Globex LLC", "GB"),
+            ("Initech Incorporated", "US"),
+            ("Umbrella Limited", "GB"),
+        ]
+    )
+]
+
+
+def test_fuzzy_key_and_similarity() -> None:
+    assert fuzzy_key("ACME Corp.") == fuzzy_key("Acme Corporation") == "acme corp"
+    assert jaro_winkler("acme corp", "acme corp") == 1.0
+    assert jaro_winkler("acme corp", "acme crop") > 0.9
+    assert jaro_winkler("acme corp", "globex llc") < 0.6
+    assert jaro_winkler("", "acme") == 0.0
+
+
+def test_match_business_in_memory() -> None:
+    provider = InMemoryDataProvider()
+
+    exact = provider.match_business("acme corp", "us")
+    assert exact is not None and exact.score == 1.0
+
+    for variant in ("ACME Corp.", "Acme Corporation", "Acme Crop"):
+        found = provider.match_business(variant, "US")
+        assert found is not None, variant
+        assert found.record.legal_name == "Acme Corp"
+        assert 0.9 <= found.score <= 1.0
+
+    # Country scoping and threshold both apply.
+    assert provider.match_business("Acme Corp", "GB") is None
+    assert provider.match_business("Acme Cop", "US", threshold=0.999) is None
+    assert provider.match_business("Totally Different", "US") is None
+
+
+def test_match_business_parity_across_stores(write_seed: Callable[..., Path]) -> None:
+    queries = [
+        ("acme corporation", "US"),
+        ("Initech Inc", "us"),
+        ("Umbrela Ltd", "GB"),
+        ("Globex L.L.C.", "GB"),
+        ("Nobody", "US"),
+    ]
+    seed = write_seed(_SEED)
+    snap = seed.with_suffix(".snap")
+    compile_snapshot(seed, snap)
+
+    expected = FileDataProvider(seed)
+    columnar = ColumnarDataProvider.from_seed(seed)
+    snapshot = SnapshotDataProvider(snap)
+    try:
+        for name, country in queries:
+            want = expected.match_business(name, country)
+            for provider in (columnar, snapshot):
+                assert provider.match_business(name, country) == want
+    finally:
+        snapshot.close()
+
+    assert expected.match_business("Umbrela Ltd", "GB") is not None
+    assert expected.match_business("Nobody", "US") is None
+
+
+def test_blocking_reads_rare_grams_and_skips_common_ones(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(fuzzy, "MAX_POSTINGS_PER_GRAM", 100)
+    postings: dict[str, Sequence[int]] = {
+        "abc": [7, 9],
+        "bcd": [7, 9, 11],
+        "cde": [7, 11, 12],
+        # Only checked against the candidates above.
+        "def": range(60),
+        "efg": range(80),
+        # Too common: ignored rather than truncated.
+        "fgh": range(101),
+    }
+
+    def postings_for(gram: str) -> Optional[Sequence[int]]:
+        return postings.get(gram)
+
+    # Shared trigrams: 7 has all five usable ones, 9 and 11 four, 12 three.
+    assert block_candidates("abcdefgh", postings_for, limit=3) == [7, 9, 11]
+    assert block_candidates("abcdefgh", postings_for, limit=10) == [7, 9, 11, 12]
+    assert block_candidates("fgh", postings_for) == []
+
+
+def test_verify_fuzzy_mode() -> None:
+    client = TestClient(create_app())
+
+    r = client.post("/v1/verify", json={"name": "ACME Corporation", "country": "US"})
+    assert r.status_code == 200
+    assert r.json()["registration_status"] == "Unknown"
+    assert r.json()["match_score"] is None
+
+    r = client.post(
+        "/v1/verify",
+        json={"name": "ACME Corporation", "country": "US", "match": "fuzzy"},
+    )
+    assert r.status_code == 200
+    body = r.json()
+    assert body["legal_name"] == "Acme Corp"
+    assert body["registration_status"] == "Active"
+    assert body["match_score"] == 1.0
+
+    r = client.post(
+        "/v1/verify", json={"name": "Acme Crop", "country": "US", "match": "fuzzy"}
+    )
+    assert r.json()["legal_name"] == "Acme Corp"
+    assert 0.9 <= r.json()["match_score"] < 1.0
+
+    r = client.post(
+        "/v1/verify", json={"name": "Acme Corp", "country": "US", "match": "fuzzy"}
+    )
+    assert r.json()["match_score"] == 1.0
+
+    r = client.post(
+        "/v1/verify", json={"name": "Nothing Alike", "country": "US", "match": "fuzzy"}
+    )
+    assert r.json()["registration_status"] == "Unknown"
+    assert r.json()["match_score"] is None
+
+    r = client.post("/v1/verify", json={"name": "x", "country": "US", "match": "bad"})
+    assert r.status_code == 422
+
+
+def test_fuzzy_verify_looks_up_exact_match_once() -> None:
+    settings = Settings(metrics_enabled=True, reload_interval=0)
+    client = TestClient(create_app(settings))
+    r = client.post(
+        "/v1/verify", json={"name": "Acme Crop", "country": "US", "match": "fuzzy"}
+    )
+    assert r.json()["legal_name"] == "Acme Corp"
+
+    calls = {
+        line.split('method="')[1].split('"')[0]: float(line.split()[-1])
+        for line in client.get("/metrics").text.splitlines()
+        if line.startswith("provider_call_duration_seconds_count")
+    }
+    assert calls == {"lookup_business": 1, "near_match": 1}
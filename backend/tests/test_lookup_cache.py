@@ -0,0 +1,115 @@
+"""
+Lookup cache tests
+
+Covers LRU eviction, positive/negative TTLs, hit-rate counters, and
+invalidation when the provider registry reloads a changed seed.
+"""
+
+from pathlib import Path
+from typing import Callable, Optional
+
+from fastapi.testclient import TestClient
+
+from backend.app.config import Settings
+from backend.app.main import create_app
+from backend.app.services.cache import CachedDataProvider, LookupCache
+from backend.app.services.datasource import BusinessRecord, InMemoryDataProvider
+
+
+class CountingProvider(InMemoryDataProvider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def lookup_business(self, name: str, country: str) -> Optional[BusinessRecord]:
+        self.calls += 1
+        return super().lookup_business(name, country)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_hits_are_keyed_on_normalized_name_and_country() -> None:
+    inner = CountingProvider()
+    cache: LookupCache[tuple[str, str], BusinessRecord] = LookupCache(
+        10, ttl=60, negative_ttl=5
+    )
+    provider = CachedDataProvider(inner, cache)
+
+    first = provider.lookup_business("Acme Corp", "US")
+    assert provider.lookup_business("  acme corp ", "us") == first
+    assert inner.calls == 1
+    assert cache.stats.hits == 1 and cache.stats.misses == 1
+
+
+def test_negative_results_use_shorter_ttl() -> None:
+    clock = FakeClock()
+    inner = CountingProvider()
+    cache: LookupCache[tuple[str, str], BusinessRecord] = LookupCache(
+        10, ttl=60, negative_ttl=5, clock=clock
+    )
+    provider = CachedDataProvider(inner, cache)
+
+    provider.lookup_business("Acme Corp", "US")
+    provider.lookup_business("Nobody Ltd", "US")
+    clock.now = 10
+    provider.lookup_business("Acme Corp", "US")  # still fresh
+    provider.lookup_business("Nobody Ltd", "US")  # expired, refetched
+
+    assert inner.calls == 3
+    assert cache.stats.expirations == 1
+
+
+def test_lru_eviction_and_bulk_lookups() -> None:
+    inner = CountingProvider()
+    cache: LookupCache[tuple[str, str], BusinessRecord] = LookupCache(
+        2, ttl=60, negative_ttl=60
+    )
+    provider = CachedDataProvider(inner, cache)
+
+    provider.lookup_business("Acme Corp", "US")
+    provider.lookup_business("Globex LLC", "GB")
+    provider.lookup_business("Acme Corp", "US")  # Acme becomes most recent
+    provider.lookup_business("Third Co", "CA")  # evicts Globex
+    assert cache.stats.evictions == 1 and len(cache) == 2
+
+    results = provider.lookup_many([("Acme Corp", "US"), ("Globex LLC", "GB")])
+    assert [r.legal_name if r else None for r in results] == ["Acme Corp", "Globex LLC"]
+    assert inner.calls == 3  # only Globex was refetched (through lookup_many)
+
+
+def _business(status: str) -> dict[str, str]:
+    return {
+        "legal_name": "Cache Co",
+        "address_line1": "1 Memo Rd",
+        "city": "Hitsville",
+        "country": "US",
+        "registration_status": status,
+    }
+
+
+def test_seed_change_invalidates_cache_and_stats_accumulate(
+    write_seed: Callable[..., Path],
+) -> None:
+    path = write_seed([_business("Active")])
+    app = create_app(Settings(seed_path=path, reload_interval=0, cache_size=100))
+    client = TestClient(app)
+    payload = {"name": "Cache Co", "country": "US"}
+
+    for _ in range(3):
+        resp = client.post("/v1/verify", json=payload)
+        assert resp.json()["registration_status"] == "Active"
+
+    write_seed([_business("Inactive")])
+    assert app.state.providers.check()
+    resp = client.post("/v1/verify", json=payload)
+    assert resp.json()["registration_status"] == "Inactive"
+
+    stats = client.get("/stats").json()["cache"]
+    assert stats["enabled"] is True
+    assert stats["hits"] == 2 and stats["misses"] == 2
@@ -0,0 +1,135 @@
+"""
+Metrics tests
+
+With METRICS_ENABLED the app records request, per-stage and provider call
+latencies plus provider load figures and serves them in Prometheus text
+format on /metrics; with it off nothing is installed.
+"""
+
+import os
+import re
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from backend.app.config import Settings
+from backend.app.main import create_app
+from backend.app.services.datasource import InMemoryDataProvider
+from backend.app.services.metrics import (
+    Histogram,
+    InstrumentedDataProvider,
+    Metrics,
+    MetricsMiddleware,
+)
+
+
+def _sample(text: str, name: str, **labels: str) -> float:
+    """Value of the sample `name{labels...}` (labels matched as a subset)."""
+
+    for line in text.splitlines():
+        if line.startswith("#"):
+            continue
+        m = re.fullmatch(r"([a-z_]+)(\{.*\})? (\S+)", line)
+        assert m, line
+        if m.group(1) != name:
+            continue
+        found = dict(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', m.group(2) or ""))
+        if all(found.get(k) == v for k, v in labels.items()):
+            return float(m.group(3))
+    raise AssertionError(f"no sample {name} {labels}")
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    h = Histogram("demo_seconds", "Demo.", ("op",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        h.observe(value, 'a"b')
+    text = "\n".join(h.render())
+    assert "# TYPE demo_seconds histogram" in text
+    assert _sample(text, "demo_seconds_bucket", op='a\\"b', le="0.1") == 2
+    assert _sample(text, "demo_seconds_bucket", le="1.0") == 3
+    assert _sample(text, "demo_seconds_bucket", le="+Inf") == 4
+    assert _sample(text, "demo_seconds_count") == 4
+    assert _sample(text, "demo_seconds_sum") == 3.65
+
+
+def test_metrics_endpoint_reports_stages_and_provider_calls() -> None:
+    settings = Settings(
+        seed_path=Path("missing-seed.json"), metrics_enabled=True, reload_interval=0
+    )
+    app = create_app(settings)
+    client = TestClient(app)
+
+    assert client.post("/v1/verify", json={"name": "Acme Corp", "country": "US"})
+    assert client.get("/v1/verify/search", params={"q": "acme"}).status_code == 200
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = r.text
+
+    route = "/v1/verify"
+    for stage in ("validation", "lookup", "screening", "response", "serialization"):
+        count = _sample(
+            text, "http_request_stage_seconds_count", route=route, stage=stage
+        )
+        assert count == 1, stage
+    assert (
+        _sample(
+            text,
+            "http_request_stage_seconds_count",
+            route="/v1/verify/search",
+            stage="search",
+        )
+        == 1
+    )
+    assert (
+        _sample(
+            text,
+            "http_request_duration_seconds_count",
+            method="POST",
+            route=route,
+            status="200",
+        )
+        == 1
+    )
+    assert (
+        _sample(
+            text,
+            "provider_call_duration_seconds_count",
+            provider="InMemoryDataProvider",
+            method="lookup_business",
+        )
+        == 1
+    )
+    assert _sample(text, "provider_records") == 2
+    assert _sample(text, "provider_loads_total") == 1
+    assert _sample(text, "provider_load_duration_seconds") >= 0
+
+
+def test_disabled_metrics_install_nothing() -> None:
+    saved = os.environ.pop("METRICS_ENABLED", None)
+    try:
+        app = create_app()
+    finally:
+        if saved is not None:
+            os.environ["METRICS_ENABLED"] = saved
+
+    assert not any(m.cls is MetricsMiddleware for m in app.user_middleware)
+    assert not isinstance(app.state.providers.current, InstrumentedDataProvider)
+    client = TestClient(app)
+    assert client.get("/metrics").status_code == 404
+    r = client.post("/v1/verify", json={"name": "Acme Corp", "country": "US"})
+    assert r.json()["legal_name"] == "Acme Corp"
+
+
+def test_instrumented_provider_delegates() -> None:
+    metrics = Metrics()
+    inner = InMemoryDataProvider()
+    provider = InstrumentedDataProvider(inner, metrics)
+    assert provider.lookup_business("acme corp", "us") is not None
+    assert provider.lookup_many([("Globex LLC", "GB"), ("Nope", "GB")])[1] is None
+    assert provider.autocomplete("glo")[0].legal_name == "Globex LLC"
+    assert provider.inner is inner and len(inner) == 2
+    text = metrics.render()
+    for method in ("lookup_business", "lookup_many", "autocomplete"):
+        assert _sample(text, "provider_call_duration_seconds_count", method=method) == 1
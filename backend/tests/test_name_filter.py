@@ -0,0 +1,187 @@
+"""
+Name filter tests
+
+Per-country Bloom filters never reject a present key and stay near their
+configured false-positive rate; filtered providers answer every query like
+the unfiltered ones; snapshots carry their filter; and `/stats` reports the
+configured rate and observed filter hits.
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.config import Settings
+from backend.app.main import create_app
+from backend.app.services.bloom import (
+    FilteredDataProvider,
+    FilterStats,
+    NameFilter,
+    filter_provider,
+)
+from backend.app.services.datasource import FileDataProvider
+from backend.app.services.providers import open_file
+from backend.app.services.snapshot import SnapshotDataProvider, compile_snapshot
+from backend.app.services.sqlite import import_sqlite
+
+
+def _item(i: int) -> dict[str, str]:
+    return {
+        "legal_name": f"Business {i} Holdings",
+        "address_line1": f"{i} Harbour Rd",
+        "city": "Leeds",
+        "country": ["GB", "US", "DE"][i % 3],
+        "registration_status": "Active",
+    }
+
+
+def _seed(write_seed: Callable[..., Path], n: int) -> Path:
+    return write_seed([_item(i) for i in range(n)], "seed.jsonl")
+
+
+@pytest.mark.parametrize("fp_rate", [0.01, 0.001])
+def test_filter_has_no_false_negatives_and_bounded_false_positives(
+    fp_rate: float,
+) -> None:
+    present = [(f"business {i} holdings", "US") for i in range(5000)]
+    name_filter = NameFilter.build(lambda: present, fp_rate)
+    assert all(key in name_filter for key in present)
+
+    absent = [(f"business {i} holdings", "US") for i in range(5000, 25000)]
+    passed = sum(key in name_filter for key in absent)
+    assert passed / len(absent) < fp_rate * 2
+    # Countries without records have no filter at all.
+    assert ("business 1 holdings", "GB") not in name_filter
+    # About 1.2 bytes per key at 1%, 1.8 at 0.1%.
+    assert name_filter.nbytes < len(present) * 2
+
+
+def test_filtered_provider_matches_unfiltered(write_seed: Callable[..., Path]) -> None:
+    base = FileDataProvider(_seed(write_seed, 300))
+    filtered = filter_provider(base, 0.01)
+    assert isinstance(filtered, FilteredDataProvider)
+    assert filtered.stats.built == 1
+
+    keys = [
+        (f"business {i} HOLDINGS ", country)
+        for i in range(600)
+        for country in ("us", "gb", "fr")
+    ]
+    keys += [(_item(i)["legal_name"], _item(i)["country"]) for i in range(300)]
+    assert filtered.lookup_many(keys) == base.lookup_many(keys)
+    for name, country in keys[::7]:
+        assert filtered.lookup_business(name, country) == base.lookup_business(
+            name, country
+        )
+        assert filtered.match_business(name, country) == base.match_business(
+            name, country
+        )
+    # Near matches are not in the filter but still found.
+    typo = filtered.match_business("Busines 4 Holdings", "US")
+    assert typo is not None and typo.record.legal_name == "Business 4 Holdings"
+    assert filtered.search_ranked("holdings", "GB", 5) == base.search_ranked(
+        "holdings", "GB", 5
+    )
+    assert not filtered.might_contain("Nobody Ltd", "GB")
+    assert filtered.might_contain("business 3 holdings", "GB")
+
+    stats = filtered.stats
+    assert stats.checks > stats.negatives > 0
+    assert stats.observed_false_positive_rate < 0.05
+
+
+class _SlowStats(FilterStats):
+    def __setattr__(self, name: str, value: object) -> None:
+        # Widen the window between reading and writing a counter.
+        time.sleep(0.0001)
+        super().__setattr__(name, value)
+
+
+def test_concurrent_lookups_are_all_counted(
+    write_seed: Callable[..., Path],
+) -> None:
+    base = FileDataProvider(_seed(write_seed, 30))
+    names = [_item(i)["legal_name"] for i in range(20)]
+
+    def lookups(filtered: FilteredDataProvider) -> None:
+        for name in names:
+            filtered.lookup_business(name, "GB")
+            filtered.lookup_many([(name, "US"), ("Nobody Ltd", "DE")])
+
+    once = FilterStats()
+    lookups(filter_provider(base, 0.01, once))
+    filtered = filter_provider(base, 0.01, _SlowStats())
+    threads = [threading.Thread(target=lookups, args=(filtered,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stats = filtered.stats
+    assert stats.checks == 8 * once.checks
+    assert stats.negatives == 8 * once.negatives
+    assert stats.false_positives == 8 * once.false_positives
+
+
+def test_snapshot_stores_filter(write_seed: Callable[..., Path]) -> None:
+    seed = _seed(write_seed, 200)
+    snap = seed.with_suffix(".snap")
+    compile_snapshot(seed, snap, fp_rate=0.01)
+    provider = SnapshotDataProvider(snap)
+    stored = provider.stored_name_filter
+    assert stored is not None and stored.fp_rate == 0.01
+    built = NameFilter.build(provider.name_keys, 0.01)
+    probes = [
+        (f"business {i} holdings", country)
+        for i in range(400)
+        for country in ("GB", "US", "DE")
+    ]
+    assert [k in stored for k in probes] == [k in built for k in probes]
+
+    # A stricter configured rate rebuilds instead of using the file's.
+    stats = FilterStats()
+    assert filter_provider(provider, 0.05, stats).name_filter is stored
+    assert filter_provider(provider, 0.001, stats).name_filter is not stored
+    assert (stats.loaded, stats.built) == (1, 1)
+    provider.close()
+
+    compile_snapshot(seed, snap, fp_rate=0)
+    provider = SnapshotDataProvider(snap)
+    assert provider.stored_name_filter is None
+    provider.close()
+
+
+def test_sqlite_provider_builds_filter_from_index(
+    write_seed: Callable[..., Path],
+) -> None:
+    seed = _seed(write_seed, 90)
+    db = seed.with_suffix(".sqlite")
+    import_sqlite(seed, db)
+    stats = FilterStats()
+    provider = open_file(db, Settings(name_filter_fp_rate=0.01), stats)
+    assert isinstance(provider, FilteredDataProvider)
+    assert stats.built == 1
+    assert provider.lookup_business("business 5 holdings", "DE") is not None
+    assert provider.lookup_business("Business 5 Holdings", "US") is None
+    assert stats.checks == 2 and stats.negatives + stats.false_positives == 1
+    provider.close()
+
+
+def test_stats_report_filter(write_seed: Callable[..., Path]) -> None:
+    settings = Settings(
+        seed_path=_seed(write_seed, 30), reload_interval=0, name_filter_fp_rate=0.02
+    )
+    with TestClient(create_app(settings)) as client:
+        for name in ["Business 1 Holdings", "Nope Ltd", "Other Plc"]:
+            client.post("/v1/verify", json={"name": name, "country": "US"})
+        stats = client.get("/stats").json()["name_filter"]
+    assert stats["enabled"] is True
+    assert stats["false_positive_rate"] == 0.02
+    assert stats["built"] == 1 and stats["checks"] == 3
+    assert stats["negatives"] + stats["false_positives"] == 2
+
+    off = TestClient(create_app(Settings(seed_path=settings.seed_path)))
+    assert off.get("/stats").json()["name_filter"]["enabled"] is False
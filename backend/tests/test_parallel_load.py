@@ -0,0 +1,172 @@
+"""
+Parallel seed validation tests
+
+Loading with a worker pool yields the same records, in the same order, as a
+serial load for every seed layout, and reports the same first error (record
+index, or JSON line) even when later chunks fail too. Providers merging the
+workers' partial indexes answer like serially loaded ones, and JSON arrays
+cut at a wrong guess still load.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+from backend.app.services import datasource
+from backend.app.services.columnar import ColumnarDataProvider
+from backend.app.services.datasource import FileDataProvider, iter_seed_records
+from backend.app.services.seedfile import split_seed
+
+
+def _item(i: int) -> dict[str, str]:
+    return {
+        "legal_name": f"  company number {i} ",
+        "address_line1": f"{i} High St ",
+        "city": "Leeds",
+        "country": ["gb", "US", "de"][i % 3],
+        "registration_status": "active",
+    }
+
+
+def _write(write_seed: Callable[..., Path], items: list[Any], suffix: str) -> Path:
+    path = write_seed(items, f"seed{suffix}")
+    if suffix == ".jsonl":
+        # Blank lines between records must not shift record indexes.
+        path.write_text(path.read_text("utf-8").replace("\n", "\n\n"), "utf-8")
+    return path
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Several chunks per test file, so ordering across workers matters."""
+
+    monkeypatch.setattr(datasource, "SEED_CHUNK_BYTES", 700)
+    monkeypatch.setattr(datasource, "SEED_CHUNK_RECORDS", 7)
+
+
+@pytest.mark.parametrize(
+    ("suffix", "stream"), [(".jsonl", False), (".json", False), (".json", True)]
+)
+def test_parallel_load_matches_serial(
+    write_seed: Callable[..., Path], suffix: str, stream: bool
+) -> None:
+    items = [_item(i) for i in range(100)]
+    path = _write(write_seed, items, suffix)
+    serial = list(iter_seed_records(path, stream=stream))
+    counts: list[int] = []
+    parallel = list(
+        iter_seed_records(path, stream=stream, progress=counts.append, workers=3)
+    )
+    assert parallel == serial
+    assert serial[0].legal_name == "Company Number 0"
+    assert counts == [100]
+
+    provider = FileDataProvider(path, stream=stream, workers=2)
+    assert provider.lookup_business("company number 42", "gb") == serial[42]
+    assert len(provider) == 100
+
+
+def _first_error(path: Path, stream: bool, workers: int) -> str:
+    with pytest.raises(ValueError) as e:
+        list(iter_seed_records(path, stream=stream, workers=workers))
+    return str(e.value)
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".json"])
+def test_first_invalid_record_is_reported(
+    write_seed: Callable[..., Path], suffix: str
+) -> None:
+    items: list[Any] = [_item(i) for i in range(60)]
+    items[23]["country"] = "USA"
+    items[45]["legal_name"] = ""
+    path = _write(write_seed, items, suffix)
+    for stream in (False, True):
+        message = _first_error(path, stream, workers=3)
+        assert message == _first_error(path, stream, workers=1)
+        assert message.startswith("Invalid record at index 23:")
+
+
+def test_malformed_json_line_vs_earlier_invalid_record(tmp_path: Path) -> None:
+    path = tmp_path / "seed.jsonl"
+    lines = [json.dumps(_item(i)) for i in range(40)]
+    lines[30] = "{not json"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    message = _first_error(path, stream=True, workers=2)
+    assert message == f"Invalid JSON in seed file: {path} (line 31)"
+    assert message == _first_error(path, stream=True, workers=1)
+
+    # An invalid record earlier in the file is reported first.
+    bad = _item(12)
+    bad["city"] = ""
+    lines[12] = json.dumps(bad)
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    assert _first_error(path, stream=True, workers=2).startswith(
+        "Invalid record at index 12:"
+    )
+
+
+def test_truncated_array_after_invalid_record(tmp_path: Path) -> None:
+    """Streamed arrays: decode errors in the parent still wait for earlier
+    chunks' validation errors."""
+
+    items = [_item(i) for i in range(40)]
+    items[3]["registration_status"] = ""
+    path = tmp_path / "seed.json"
+    path.write_text(json.dumps(items)[:-200], encoding="utf-8")
+    message = _first_error(path, stream=True, workers=2)
+    assert message == _first_error(path, stream=True, workers=1)
+    assert message.startswith("Invalid record at index 3:")
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".json"])
+def test_merged_indexes_match_serial_load(
+    write_seed: Callable[..., Path], suffix: str
+) -> None:
+    """Keys repeated within and across chunks keep their first position."""
+
+    items = [_item(i % 45) for i in range(60)]
+    items[50]["city"] = "York"
+    path = _write(write_seed, items, suffix)
+    assert len(split_seed(path, datasource.SEED_CHUNK_BYTES)) > 5
+
+    for load in (
+        lambda workers: FileDataProvider(path, workers=workers),
+        lambda workers: ColumnarDataProvider.from_seed(path, workers=workers),
+    ):
+        serial, parallel = load(1), load(3)
+        assert len(parallel) == len(serial) == 45
+        assert parallel.lookup_business("company number 5", "de") == (
+            serial.lookup_business("company number 5", "DE")
+        )
+        assert parallel.lookup_business("company number 5", "de").city == "York"
+        for q in ["company", "number 1", "ber 4", "nothing"]:
+            for country in [None, "GB", "DE"]:
+                assert parallel.search_businesses(
+                    q, country, 50
+                ) == serial.search_businesses(q, country, 50)
+
+
+def test_array_cut_at_a_nested_record(write_seed: Callable[..., Path]) -> None:
+    """A nested object keyed like a record misleads the cut; the chunk before
+    it fails and the rest of the file is decoded in this process."""
+
+    items: list[Any] = [_item(i) for i in range(60)]
+    for i in range(0, 60, 3):
+        items[i]["related"] = [{"pad": "x" * 700}, {"legal_name": "nested"}]
+    path = write_seed(items, "seed.json")
+    data = path.read_bytes()
+    cuts = split_seed(path, datasource.SEED_CHUNK_BYTES)
+    assert any(data[cut:].startswith(b'{"legal_name": "nested"') for cut in cuts)
+    assert list(iter_seed_records(path, workers=2)) == list(iter_seed_records(path))
+
+
+def test_line_numbers_with_crlf_and_blank_lines(tmp_path: Path) -> None:
+    path = tmp_path / "seed.jsonl"
+    lines = [json.dumps(_item(i)) for i in range(40)]
+    lines[33] = "{not json"
+    path.write_bytes("\r\n\r\n".join(lines).encode("utf-8"))
+    message = _first_error(path, stream=True, workers=2)
+    assert message == f"Invalid JSON in seed file: {path} (line 67)"
+    assert message == _first_error(path, stream=True, workers=1)
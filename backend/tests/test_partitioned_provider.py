@@ -0,0 +1,189 @@
+"""
+Partitioned provider tests
+
+A directory of per-country files is opened lazily, one partition per country
+on first use, keeps recently used partitions within the budget, and answers
+country-less searches and completions like a single provider over the same
+records without evicting (and so reloading) partitions on every request.
+The API serves such a directory through DATA_SEED_PATH.
+"""
+
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.main import create_app
+from backend.app.services.datasource import FileDataProvider
+from backend.app.services.partitioned import PartitionedDataProvider
+from backend.app.services.snapshot import compile_snapshot
+
+_COUNTRIES = ["DE", "GB", "US"]
+_WORDS = ["acme", "globex", "initech", "umbrella", "hooli"]
+
+
+def _seed(
+    make_seed: Callable[..., list[dict[str, str]]], count: int
+) -> list[dict[str, str]]:
+    return make_seed(
+        count,
+        _WORDS,
+        seed=11,
+        countries=_COUNTRIES,
+        statuses=["Active"],
+        cities=["Oslo", "Köln", "Leeds"],
+        street="Quay Rd",
+    )
+
+
+def _write_partitions(
+    write_seed: Callable[..., Path], seed: list[dict[str, str]]
+) -> Path:
+    """One JSON Lines file per country; returns their directory."""
+
+    for code in _COUNTRIES:
+        path = write_seed(
+            [item for item in seed if item["country"] == code], f"{code}.jsonl"
+        )
+    return path.parent
+
+
+def _provider(root: Path, budget_bytes: int = 0) -> PartitionedDataProvider:
+    return PartitionedDataProvider(
+        root, lambda path: FileDataProvider(path), budget_bytes=budget_bytes
+    )
+
+
+def test_partitions_load_on_first_use(
+    make_seed: Callable[..., list[dict[str, str]]], write_seed: Callable[..., Path]
+) -> None:
+    seed = _seed(make_seed, 60)
+    root = _write_partitions(write_seed, seed)
+    (root / "notes.txt").write_text("ignored", encoding="utf-8")
+    provider = _provider(root)
+    assert provider.countries == _COUNTRIES
+    assert provider.loaded() == []
+
+    item = next(i for i in seed if i["country"] == "US")
+    rec = provider.lookup_business(item["legal_name"].upper(), " us")
+    assert rec is not None and rec.address_line1 == item["address_line1"]
+    assert provider.loaded() == ["US"]
+
+    # Unknown countries are answered without opening anything.
+    assert provider.lookup_business(item["legal_name"], "FR") is None
+    assert provider.search_ranked("acme", "FR") == []
+    assert provider.loaded() == ["US"]
+    assert provider.stats.as_dict() == {
+        "loads": 1,
+        "evictions": 0,
+        "resident": 1,
+        "resident_bytes": (root / "US.jsonl").stat().st_size,
+    }
+
+
+def test_least_recently_used_partitions_are_evicted(
+    make_seed: Callable[..., list[dict[str, str]]], write_seed: Callable[..., Path]
+) -> None:
+    root = _write_partitions(write_seed, _seed(make_seed, 60))
+    # Room for two partitions, not three.
+    largest = max(p.stat().st_size for p in root.iterdir())
+    provider = _provider(root, budget_bytes=2 * largest)
+    for code in ["DE", "GB", "DE", "US"]:
+        provider.lookup_business("nobody", code)
+    assert provider.loaded() == ["DE", "US"]
+    assert provider.stats.loads == 3 and provider.stats.evictions == 1
+
+    provider.lookup_business("nobody", "GB")
+    assert provider.loaded() == ["US", "GB"]
+    assert provider.stats.loads == 4 and provider.stats.evictions == 2
+
+    # A partition larger than the budget is still served.
+    tiny = _provider(root, budget_bytes=1)
+    tiny.lookup_business("nobody", "DE")
+    tiny.lookup_business("nobody", "GB")
+    assert tiny.loaded() == ["GB"]
+
+
+def test_country_less_queries_respect_the_budget(
+    make_seed: Callable[..., list[dict[str, str]]], write_seed: Callable[..., Path]
+) -> None:
+    root = _write_partitions(write_seed, _seed(make_seed, 60))
+    # Room for two of the three partitions.
+    largest = max(p.stat().st_size for p in root.iterdir())
+    budget = 2 * largest
+    provider = _provider(root, budget_bytes=budget)
+    provider.lookup_business("nobody", "GB")
+    for _ in range(3):
+        assert provider.search_ranked("acme", None)
+        assert provider.autocomplete("a", None)
+        assert 0 < provider.stats.resident_bytes <= budget
+        assert provider.loaded() == ["GB", "US"]
+    # The first fan-out opens DE and US, and each later one reopens DE
+    # (least recently used, so evicted again): no partition is opened
+    # twice during a fan-out.
+    assert provider.stats.loads == 3 + 5 and provider.stats.evictions == 6
+
+
+def test_unfiltered_queries_merge_partitions(
+    make_seed: Callable[..., list[dict[str, str]]], write_seed: Callable[..., Path]
+) -> None:
+    seed = _seed(make_seed, 300)
+    root = _write_partitions(write_seed, seed)
+    provider = _provider(root)
+    parts = {code: FileDataProvider(root / f"{code}.jsonl") for code in _COUNTRIES}
+    for q in ["acme", "hooli um", "7", "missing"]:
+        hits = provider.search_ranked(q, None, 25)
+        everything = [
+            hit for code in _COUNTRIES for hit in parts[code].search_ranked(q, None, 25)
+        ]
+        expected = sorted(everything, key=lambda hit: -hit.score)[:25]
+        assert hits == expected
+        assert provider.search_businesses(q, None, 25) == [
+            hit.record for hit in expected
+        ]
+        assert provider.search_ranked(q, "gb", 25) == (
+            parts["GB"].search_ranked(q, None, 25)
+        )
+
+    whole = write_seed(seed, "all.json")
+    reference = FileDataProvider(whole)
+    for prefix in ["", "a", "Globex I", "x"]:
+        for country in [None, "US"]:
+            assert provider.autocomplete(prefix, country, 30) == (
+                reference.autocomplete(prefix, country, 30)
+            )
+    keys = [(i["legal_name"], i["country"]) for i in seed[:40]] + [("x", "FR")]
+    assert provider.lookup_many(keys) == reference.lookup_many(keys)
+
+
+def test_duplicate_partitions_are_rejected(tmp_path: Path) -> None:
+    (tmp_path / "US.jsonl").write_text("", encoding="utf-8")
+    (tmp_path / "us.snap").write_text("", encoding="utf-8")
+    with pytest.raises(ValueError, match="Duplicate partitions for US"):
+        _provider(tmp_path)
+
+
+def test_api_serves_partition_directory(
+    monkeypatch: pytest.MonkeyPatch,
+    make_seed: Callable[..., list[dict[str, str]]],
+    write_seed: Callable[..., Path],
+) -> None:
+    seed = _seed(make_seed, 30)
+    root = _write_partitions(write_seed, seed)
+    # Partitions may mix formats.
+    compile_snapshot(root / "GB.jsonl", root / "GB.snap")
+    (root / "GB.jsonl").unlink()
+
+    monkeypatch.setenv("DATA_SEED_PATH", str(root))
+    client = TestClient(create_app())
+    item = next(i for i in seed if i["country"] == "GB")
+    resp = client.post(
+        "/v1/verify",
+        json={"name": item["legal_name"], "country": "GB"},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["address"]["line1"] == item["address_line1"]
+    partitions = client.get("/stats").json()["partitions"]
+    assert partitions["enabled"] is True
+    assert partitions["loads"] == 1 and partitions["resident"] == 1
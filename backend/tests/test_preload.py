@@ -0,0 +1,81 @@
+"""
+Pre-fork preload tests
+
+Covers what a pre-fork server relies on: `/ready` only reports ready while
+the app is serving, `WARM_INDEXES` builds lazy indexes at load time (so they
+are built in the master, before fork), and the memory report finds workers
+and splits their memory into shared and private pages.
+"""
+
+import dataclasses
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.config import Settings
+from backend.app.main import create_app
+from backend.app.services.providers import create_provider_registry
+from backend.bench.memory import memory_report, smaps_rollup
+
+
+def test_ready_only_while_serving() -> None:
+    app = create_app(Settings(reload_interval=0))
+    client = TestClient(app)
+    resp = client.get("/ready")
+    assert resp.status_code == 503
+    assert resp.json() == {"status": "unavailable"}
+
+    with client:
+        resp = client.get("/ready")
+        assert resp.status_code == 200
+        assert resp.json() == {"status": "ready", "generation": 0}
+    assert client.get("/ready").status_code == 503
+
+
+def test_warm_indexes_builds_prefix_index_at_load(
+    write_seed: Callable[..., Path],
+) -> None:
+    seed = write_seed(
+        [
+            {
+                "legal_name": "Acme Corp",
+                "address_line1": "1 Main St",
+                "city": "Springfield",
+                "country": "US",
+                "registration_status": "Active",
+            }
+        ]
+    )
+    settings = Settings(seed_path=seed, reload_interval=0)
+    lazy = create_provider_registry(settings).current
+    assert lazy._prefix is None  # type: ignore[attr-defined]
+
+    warm_settings = dataclasses.replace(settings, warm_indexes=True)
+    warm = create_provider_registry(warm_settings).current
+    assert warm._prefix is not None  # type: ignore[attr-defined]
+    assert [r.legal_name for r in warm.autocomplete("ac")] == ["Acme Corp"]
+
+
+@pytest.mark.skipif(smaps_rollup(os.getpid()) is None, reason="needs smaps_rollup")
+def test_memory_report_lists_workers() -> None:
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        report = memory_report(os.getpid())
+    finally:
+        child.kill()
+        child.wait()
+
+    roles = {p["pid"]: p["role"] for p in report["processes"]}
+    assert roles[os.getpid()] == "master"
+    assert roles[child.pid] == "worker"
+    master = report["processes"][0]
+    assert master["rss_mb"] >= master["pss_mb"] > 0
+    assert master["rss_mb"] == pytest.approx(
+        master["shared_mb"] + master["private_mb"], abs=0.2
+    )
+    assert report["total"]["pss_mb"] <= report["total"]["rss_mb"]
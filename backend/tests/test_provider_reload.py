@@ -0,0 +1,77 @@
+"""
+Provider registry reload tests
+
+The provider is resolved once at app creation; seed file changes are picked up
+by the background watcher and swapped in without touching in-flight users of
+the previous provider.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Callable
+
+from fastapi.testclient import TestClient
+
+from backend.app.config import Settings
+from backend.app.main import create_app
+from backend.app.services.reloader import Reloadable
+
+
+def _business(name: str) -> dict[str, str]:
+    return {
+        "legal_name": name,
+        "address_line1": "1 Swap St",
+        "city": "Reloadville",
+        "country": "US",
+        "registration_status": "Active",
+    }
+
+
+def test_check_swaps_provider_and_keeps_old_snapshot(
+    write_seed: Callable[..., Path],
+) -> None:
+    """A changed file yields a new provider; held references stay valid."""
+
+    path = write_seed([_business("Before Co")])
+    app = create_app(Settings(seed_path=path, reload_interval=0))
+    registry = app.state.providers
+    old = registry.current
+
+    assert registry.check() is False
+    write_seed([_business("After Company")])
+    assert registry.check() is True
+
+    assert registry.generation == 1
+    assert registry.current.lookup_business("After Company", "US") is not None
+    assert old.lookup_business("Before Co", "US") is not None
+
+
+def test_failed_reload_keeps_current_value(write_seed: Callable[..., Path]) -> None:
+    """A broken seed is logged and ignored until the file changes again."""
+
+    path = write_seed([_business("Stable Co")])
+    registry = Reloadable(
+        lambda: json.loads(path.read_text("utf-8")), watch=path, interval=0
+    )
+    path.write_text("[not json", encoding="utf-8")
+    assert registry.check() is False
+    assert registry.current[0]["legal_name"] == "Stable Co"
+    assert registry.check() is False
+
+
+def test_background_watcher_serves_new_seed(write_seed: Callable[..., Path]) -> None:
+    """While the app is running, edits to the seed reach the API."""
+
+    path = write_seed([_business("Old Name Ltd")])
+    app = create_app(Settings(seed_path=path, reload_interval=0.02))
+
+    with TestClient(app) as client:
+        write_seed([_business("New Name Ltd")])
+        deadline = time.monotonic() + 5
+        while app.state.providers.generation == 0:
+            assert time.monotonic() < deadline, "watcher did not reload"
+            time.sleep(0.01)
+
+        resp = client.post("/v1/verify", json={"name": "new name ltd", "country": "US"})
+        assert resp.json()["registration_status"] == "Active"
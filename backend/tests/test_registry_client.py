@@ -0,0 +1,286 @@
+"""
+Registry HTTP client tests
+
+Runs `HTTPRegistry` against a local fake registry (a threaded HTTP server
+with injectable latency and failures) to check connection reuse, retries
+within the retry budget, per-call deadlines, the circuit breaker (which
+counts 429s, 5xx and unusable bodies as failures, but not 404s, whatever
+their body, or other client errors) and the `/verify` fallback to Unknown
+while a registry is down.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.config import Settings
+from backend.app.main import create_app
+from backend.app.services.registries import RegistryUnavailable, deadline
+from backend.app.services.registry_client import (
+    CircuitBreaker,
+    HTTPRegistry,
+    RegistryClient,
+    RetryBudget,
+)
+
+_STUB = {
+    "legal_name": "Stub Sarl",
+    "address_line1": "1 Rue Stub",
+    "city": "Paris",
+    "country": "FR",
+    "registration_status": "Active",
+}
+
+
+class FakeRegistry:
+    """Threaded HTTP/1.1 registry serving `_STUB`.
+
+    `delay` is added to every response; the next `fail_next` requests (or
+    all, with `down`) get a 503. When set, `raw` is sent verbatim instead.
+    """
+
+    def __init__(self) -> None:
+        self.delay = 0.0
+        self.fail_next = 0
+        self.down = False
+        self.raw: Optional[bytes] = None
+        self.requests = 0
+        self.connections = 0
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                fake.connections += 1
+
+            def do_GET(self) -> None:  # noqa: N802
+                fake.requests += 1
+                time.sleep(fake.delay)
+                query = parse_qs(urlsplit(self.path).query)
+                key = (query.get("name"), query.get("country"))
+                if fake.raw is not None:
+                    self.wfile.write(fake.raw)
+                elif fake.down or fake.fail_next > 0:
+                    fake.fail_next = max(0, fake.fail_next - 1)
+                    self._reply(503, {"detail": "unavailable"})
+                elif key == (["Stub Sarl"], ["FR"]):
+                    self._reply(200, _STUB)
+                else:
+                    self._reply(404, {"detail": "not found"})
+
+            def _reply(self, status: int, body: Any) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self) -> "FakeRegistry":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fake() -> Iterator[FakeRegistry]:
+    with FakeRegistry() as registry:
+        yield registry
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _registry(url: str, **kwargs: Any) -> HTTPRegistry:
+    return HTTPRegistry(RegistryClient(url, **kwargs), name="fake")
+
+
+def test_keep_alive_connections_are_reused(fake: FakeRegistry) -> None:
+    registry = _registry(fake.url)
+
+    async def run() -> list[Optional[str]]:
+        names = ["Stub Sarl", "Nobody Ltd"] * 3
+        found = [await registry.lookup_business(n, "fr") for n in names]
+        # Concurrent calls open more connections, up to the pool size.
+        await asyncio.gather(
+            *(registry.lookup_business("Stub Sarl", "FR") for _ in range(4))
+        )
+        return [rec.legal_name if rec else None for rec in found]
+
+    assert asyncio.run(run()) == ["Stub Sarl", None] * 3
+    stats = registry.client.stats
+    assert stats.connections_opened == fake.connections <= 4
+    assert stats.connections_opened + stats.connections_reused == 10
+    assert fake.requests == 10
+
+
+def test_failed_attempts_are_retried_within_budget(fake: FakeRegistry) -> None:
+    fake.fail_next = 2
+    registry = _registry(fake.url, max_attempts=3)
+    rec = asyncio.run(registry.lookup_business("Stub Sarl", "FR"))
+    assert rec is not None and rec.city == "Paris"
+    assert registry.client.stats.retries == 2 and fake.requests == 3
+
+    # Without tokens, a failed attempt is final.
+    clock = FakeClock()
+    budget = RetryBudget(ratio=0.5, min_per_second=0, max_tokens=1, clock=clock)
+    registry = _registry(fake.url, max_attempts=3, retry_budget=budget)
+    fake.down = True
+    for _ in range(3):
+        with pytest.raises(RegistryUnavailable, match="HTTP 503"):
+            asyncio.run(registry.lookup_business("Stub Sarl", "FR"))
+    stats = registry.client.stats
+    # Tokens: the one saved, then two half-token deposits; every call ends
+    # with a denied retry.
+    assert (stats.attempts, stats.retries, stats.retries_denied) == (5, 2, 3)
+
+
+def test_deadline_bounds_attempts(fake: FakeRegistry) -> None:
+    fake.delay = 1.0
+    registry = _registry(fake.url, timeout=5.0)
+
+    async def run() -> None:
+        with deadline(0.2):
+            await registry.lookup_business("Stub Sarl", "FR")
+
+    started = time.perf_counter()
+    with pytest.raises(RegistryUnavailable, match="TimeoutError"):
+        asyncio.run(run())
+    assert time.perf_counter() - started < 0.8
+    # The deadline had passed: no retries.
+    assert registry.client.stats.attempts == 1
+
+
+def test_circuit_opens_fails_fast_and_recovers(fake: FakeRegistry) -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    registry = _registry(fake.url, max_attempts=1, breaker=breaker)
+
+    def lookup() -> Optional[str]:
+        rec = asyncio.run(registry.lookup_business("Stub Sarl", "FR"))
+        return rec.legal_name if rec else None
+
+    fake.down = True
+    for _ in range(2):
+        with pytest.raises(RegistryUnavailable, match="HTTP 503"):
+            lookup()
+    assert breaker.state == "open"
+    with pytest.raises(RegistryUnavailable, match="circuit open"):
+        lookup()
+    assert fake.requests == 2 and registry.client.stats.rejected == 1
+
+    # One trial per reset period; a failed trial keeps the circuit open.
+    clock.now = 10
+    assert breaker.state == "half_open"
+    with pytest.raises(RegistryUnavailable, match="HTTP 503"):
+        lookup()
+    with pytest.raises(RegistryUnavailable, match="circuit open"):
+        lookup()
+
+    fake.down = False
+    clock.now = 20
+    assert lookup() == "Stub Sarl"
+    assert breaker.state == "closed"
+
+
+@pytest.mark.parametrize(
+    ("raw", "error"),
+    [
+        (
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n"
+            b"Content-Length: 13\r\n\r\n<html></html>",
+            "invalid HTTP 200 response",
+        ),
+        (
+            b'HTTP/1.1 200 OK\r\nContent-Length: 12\r\n\r\n{"city": 1}\n',
+            "invalid HTTP 200 response: Invalid record",
+        ),
+        (b"HTTP/1.1 429 Too Many Requests\r\nContent-Length: 0\r\n\r\n", "HTTP 429"),
+        (b"HTTP/1.1 200 OK\r\nContent-Length: many\r\n\r\n", "Malformed response"),
+    ],
+)
+def test_unusable_responses_are_failures(
+    fake: FakeRegistry, raw: bytes, error: str
+) -> None:
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=FakeClock())
+    registry = _registry(fake.url, max_attempts=2, breaker=breaker)
+    fake.raw = raw
+    for _ in range(2):
+        with pytest.raises(RegistryUnavailable, match=error):
+            asyncio.run(registry.lookup_business("Stub Sarl", "FR"))
+    assert breaker.state == "open"
+    assert registry.client.stats.retries > 0
+
+
+def test_not_found_pages_and_client_errors_are_not_failures(
+    fake: FakeRegistry,
+) -> None:
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=FakeClock())
+    registry = _registry(fake.url, max_attempts=3, breaker=breaker)
+
+    # A 404 is "not found" whatever its body.
+    page = b"<html><body>Not Found</body></html>"
+    fake.raw = (
+        b"HTTP/1.1 404 Not Found\r\nContent-Type: text/html\r\n"
+        b"Content-Length: %d\r\n\r\n%s" % (len(page), page)
+    )
+    for _ in range(5):
+        assert asyncio.run(registry.lookup_business("Nobody Ltd", "FR")) is None
+
+    fake.raw = b"HTTP/1.1 401 Unauthorized\r\nContent-Length: 0\r\n\r\n"
+    for _ in range(3):
+        with pytest.raises(RegistryUnavailable, match="HTTP 401"):
+            asyncio.run(registry.lookup_business("Stub Sarl", "FR"))
+
+    stats = registry.client.stats
+    assert breaker.state == "closed" and stats.rejected == 0
+    assert stats.retries == 0 and fake.requests == stats.attempts == 8
+    assert stats.failures == 3
+
+
+def test_verify_falls_back_to_unknown_while_registry_is_down(
+    fake: FakeRegistry,
+) -> None:
+    settings = Settings(
+        reload_interval=0,
+        registry_urls=(fake.url,),
+        registry_breaker_failures=2,
+    )
+    body = {"name": "Stub Sarl", "country": "FR"}
+    with TestClient(create_app(settings)) as client:
+        resp = client.post("/v1/verify", json=body)
+        assert resp.json()["address"]["city"] == "Paris"
+
+        fake.down = True
+        for _ in range(3):
+            resp = client.post("/v1/verify", json=body)
+            assert resp.status_code == 200
+            assert resp.json()["registration_status"] == "Unknown"
+        stats = client.get("/stats").json()["registries"]
+        assert stats["enabled"] is True
+        assert stats["circuits"] == {"127.0.0.1": "open"}
+        assert stats["rejected"] == 1 and stats["failures"] == 2
@@ -0,0 +1,158 @@
+"""
+Registry fan-out tests
+
+Uses local stub registries with injected latency to check that FanOutProvider
+queries sources concurrently, returns the first authoritative answer, honours
+per-source timeouts and hedges slow requests.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+from fastapi.testclient import TestClient
+
+from backend.app.config import Settings
+from backend.app.main import create_app
+from backend.app.services.datasource import BusinessRecord
+from backend.app.services.registries import (
+    AsyncDataProvider,
+    FanOutProvider,
+    RegistrySource,
+)
+
+
+def _record(name: str, country: str = "FR") -> BusinessRecord:
+    return BusinessRecord(
+        legal_name=name,
+        address_line1="1 Rue Stub",
+        city="Paris",
+        country=country,
+        registration_status="Active",
+    )
+
+
+class StubRegistry(AsyncDataProvider):
+    """In-process registry answering after a fixed (or per-call) delay."""
+
+    def __init__(
+        self,
+        name: str,
+        delays: list[float],
+        record: Optional[BusinessRecord] = None,
+        fail: bool = False,
+    ) -> None:
+        self.name = name
+        self._delays = delays
+        self._record = record
+        self._fail = fail
+        self.calls = 0
+
+    async def lookup_business(
+        self, name: str, country: str
+    ) -> Optional[BusinessRecord]:
+        delay = self._delays[min(self.calls, len(self._delays) - 1)]
+        self.calls += 1
+        await asyncio.sleep(delay)
+        if self._fail:
+            raise ConnectionError(f"{self.name} unavailable")
+        return self._record
+
+
+def _timed(provider: FanOutProvider) -> tuple[Optional[BusinessRecord], float]:
+    started = time.perf_counter()
+    rec = asyncio.run(provider.lookup_business("Stub Sarl", "fr"))
+    return rec, time.perf_counter() - started
+
+
+def test_latency_is_max_not_sum() -> None:
+    """Three 0.2-0.3s registries answer in ~0.3s total, not ~0.75s."""
+
+    found = _record("Stub Sarl")
+    provider = FanOutProvider(
+        [
+            RegistrySource(StubRegistry("a", [0.2])),
+            RegistrySource(StubRegistry("b", [0.25])),
+            RegistrySource(StubRegistry("c", [0.3], record=found)),
+        ]
+    )
+    rec, elapsed = _timed(provider)
+    assert rec == found
+    assert elapsed < 0.6
+
+
+def test_first_authoritative_answer_wins_and_failures_are_ignored() -> None:
+    """Not-found and failing sources do not mask a slower positive answer."""
+
+    found = _record("Stub Sarl")
+    slow = StubRegistry("slow", [2.0], record=_record("Other"))
+    provider = FanOutProvider(
+        [
+            RegistrySource(StubRegistry("empty", [0.01])),
+            RegistrySource(StubRegistry("broken", [0.01], fail=True)),
+            RegistrySource(StubRegistry("hit", [0.1], record=found)),
+            RegistrySource(slow, timeout=3.0),
+        ]
+    )
+    rec, elapsed = _timed(provider)
+    assert rec == found
+    assert elapsed < 1.0
+
+
+def test_per_source_timeout_and_budget() -> None:
+    """A hung registry is abandoned at its timeout; nothing found -> None."""
+
+    provider = FanOutProvider(
+        [
+            RegistrySource(
+                StubRegistry("hung", [10.0], record=_record("X")), timeout=0.1
+            )
+        ],
+        budget=2.0,
+    )
+    rec, elapsed = _timed(provider)
+    assert rec is None
+    assert elapsed < 0.5
+
+    budgeted = FanOutProvider(
+        [RegistrySource(StubRegistry("hung", [10.0]), timeout=5.0)], budget=0.1
+    )
+    rec, elapsed = _timed(budgeted)
+    assert rec is None and elapsed < 0.5
+
+
+def test_hedged_request_beats_slow_first_attempt() -> None:
+    """A hedge sent after 0.05s answers before the 2s first attempt."""
+
+    found = _record("Stub Sarl")
+    registry = StubRegistry("tail", [2.0, 0.05], record=found)
+    provider = FanOutProvider([RegistrySource(registry, timeout=1.0, hedge_after=0.05)])
+    rec, elapsed = _timed(provider)
+    assert rec == found
+    assert registry.calls == 2
+    assert elapsed < 0.5
+
+
+def test_country_coverage_skips_sources() -> None:
+    """Registries only receive lookups for countries they cover."""
+
+    de_only = StubRegistry("de", [0.0], record=_record("Stub Sarl", "DE"))
+    provider = FanOutProvider([RegistrySource(de_only, countries=frozenset({"DE"}))])
+    rec, _ = _timed(provider)
+    assert rec is None and de_only.calls == 0
+
+
+def test_verify_endpoint_consults_registries() -> None:
+    """Businesses missing locally are resolved from an external registry."""
+
+    registry = StubRegistry("fr", [0.05], record=_record("Stub Sarl"))
+    app = create_app(Settings(reload_interval=0), registries=[RegistrySource(registry)])
+    client = TestClient(app)
+
+    resp = client.post("/v1/verify", json={"name": "Stub Sarl", "country": "FR"})
+    assert resp.status_code == 200
+    assert resp.json()["address"]["city"] == "Paris"
+
+    # Local hits still come from the seed dataset.
+    resp = client.post("/v1/verify", json={"name": "Acme Corp", "country": "US"})
+    assert resp.json()["address"]["city"] == "Springfield"
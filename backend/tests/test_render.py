@@ -0,0 +1,110 @@
+"""
+Direct JSON rendering tests
+
+The verify and search endpoints encode responses without building pydantic
+models; their bytes must match what FastAPI would send for the equivalent
+`VerifyResponse` / `list[Candidate]`, including escaping, non-ASCII text,
+nulls and status normalization.
+"""
+
+from typing import Any, Literal, Optional, cast
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from backend.app.main import create_app
+from backend.app.routers.render import render_candidates, render_verify
+from backend.app.routers.verify import (
+    Address,
+    Candidate,
+    VerifyRequest,
+    build_verify_response,
+)
+from backend.app.services.datasource import BusinessRecord, SearchHit
+from backend.app.services.screening import (
+    ScreeningHit,
+    ScreeningResult,
+    WatchlistEntry,
+)
+
+_RECORDS = [
+    BusinessRecord("Acme Corp", "123 Main St", "Springfield", "US", "Active"),
+    BusinessRecord("Müller & Söhne GmbH", "Königstraße 1", "Köln", "DE", "Inactive"),
+    BusinessRecord('Quote "Q" \\ Co\n', "1\t2 St", "東京", "JP", "Pending"),
+]
+
+_SCREENINGS = [
+    ScreeningResult((), ()),
+    ScreeningResult(("possible_match",), ()),
+    ScreeningResult(
+        ("pep_hit", "sanctions_hit"),
+        (
+            ScreeningHit(WatchlistEntry("S-1", "sanctions", "Évil Corp"), "Evil Corp"),
+            ScreeningHit(WatchlistEntry("P-1", "pep", "Jane Q"), "Jane Q"),
+        ),
+    ),
+]
+
+
+def _fastapi_bytes(model: Any) -> bytes:
+    return bytes(JSONResponse(jsonable_encoder(model)).body)
+
+
+def test_render_verify_matches_model_encoding() -> None:
+    req = VerifyRequest(name="  acme corp ", country="us", match="exact")
+    records: list[Optional[BusinessRecord]] = [None, *_RECORDS]
+    for rec in records:
+        for screening in _SCREENINGS:
+            for score in (None, 1.0, 0.9123, 5e-05):
+                expected = _fastapi_bytes(
+                    build_verify_response(req, rec, screening, match_score=score)
+                )
+                got = render_verify(req.name, req.country, rec, screening, score)
+                assert got == expected
+
+
+def test_render_candidates_matches_model_encoding() -> None:
+    hits = [
+        SearchHit(rec, score)
+        for rec, score in zip(_RECORDS, (1.0, 0.65, 0.2), strict=True)
+    ]
+    expected = _fastapi_bytes(
+        [
+            Candidate(
+                legal_name=h.record.legal_name,
+                address=Address(
+                    line1=h.record.address_line1,
+                    city=h.record.city,
+                    country=h.record.country,
+                ),
+                registration_status=cast(
+                    Literal["Active", "Inactive", "Unknown"],
+                    (
+                        h.record.registration_status
+                        if h.record.registration_status in {"Active", "Inactive"}
+                        else "Unknown"
+                    ),
+                ),
+                score=h.score,
+            )
+            for h in hits
+        ]
+    )
+    assert render_candidates(hits) == expected
+    assert render_candidates([]) == b"[]"
+
+
+def test_endpoints_send_json() -> None:
+    client = TestClient(create_app())
+
+    resp = client.post("/v1/verify", json={"name": "Test Holdings", "country": "gb"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.json()["risk_flags"] == ["possible_match"]
+    assert resp.json()["screening_hits"] is None
+
+    resp = client.get("/v1/verify/search", params={"q": "acme"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.json()[0]["legal_name"] == "Acme Corp"
@@ -0,0 +1,135 @@
+"""
+Watchlist screening tests
+
+Covers the token-level Aho-Corasick matcher (whole-token, overlapping and
+suffix matches), watchlist file loading, the placeholder fallback, and
+screening results surfaced by the verify endpoints after a watchlist reload.
+"""
+
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.config import Settings
+from backend.app.main import create_app
+from backend.app.services.screening import (
+    PlaceholderScreener,
+    ScreeningResult,
+    WatchlistEntry,
+    WatchlistScreener,
+    load_watchlist,
+)
+
+_ENTRIES: list[dict[str, Any]] = [
+    {
+        "id": "S-1",
+        "list": "sanctions",
+        "name": "Evil Corp",
+        "aliases": ["Evil Corporation", "EC Holdings"],
+    },
+    {"id": "S-2", "list": "Sanctions", "name": "Holdings Group"},
+    {"id": "P-1", "list": "pep", "name": "Jane Q Minister"},
+]
+
+
+def _screener() -> WatchlistScreener:
+    return WatchlistScreener(
+        (WatchlistEntry(e["id"], e["list"].lower(), e["name"]), e.get("aliases", []))
+        for e in _ENTRIES
+    )
+
+
+def _ids(result: ScreeningResult) -> list[str]:
+    return sorted(hit.entry.id for hit in result.hits)
+
+
+def test_matches_whole_tokens_only() -> None:
+    screener = _screener()
+    assert len(screener) == 4  # "Evil Corporation" folds into "evil corp"
+
+    result = screener.screen("EVIL CORPORATION (Cyprus)")
+    assert result.risk_flags == ("sanctions_hit",)
+    assert _ids(result) == ["S-1"]
+    assert result.hits[0].alias == "Evil Corp"
+
+    assert screener.screen("Evilcorp Ltd").risk_flags == ()
+    assert screener.screen("Deck Holdings").risk_flags == ()
+    assert screener.screen("").hits == ()
+
+
+def test_overlapping_and_suffix_matches() -> None:
+    screener = _screener()
+
+    # "ec holdings" and "holdings group" overlap on "holdings".
+    result = screener.screen("The EC Holdings Group")
+    assert _ids(result) == ["S-1", "S-2"]
+    assert result.risk_flags == ("sanctions_hit",)
+
+    # Failure links recover after a partial match ("jane q" then restart).
+    result = screener.screen("Jane Jane Q Minister Evil Corp")
+    assert _ids(result) == ["P-1", "S-1"]
+    assert result.risk_flags == ("pep_hit", "sanctions_hit")
+
+
+def test_placeholder_rule() -> None:
+    assert PlaceholderScreener().screen("Testing Ltd").risk_flags == ("possible_match",)
+    assert PlaceholderScreener().screen("Acme Corp").risk_flags == ()
+
+
+def test_load_watchlist_jsonl_and_validation() -> None:
+    with TemporaryDirectory() as td:
+        path = Path(td) / "watchlist.jsonl"
+        path.write_text("\n".join(json.dumps(e) for e in _ENTRIES), encoding="utf-8")
+        screener = load_watchlist(path)
+        assert screener.entry_count == 3
+        assert _ids(screener.screen("evil corp")) == ["S-1"]
+
+        bad = Path(td) / "bad.json"
+        bad.write_text(json.dumps([{"id": "X", "name": "No List"}]), encoding="utf-8")
+        with pytest.raises(ValueError, match="index 0"):
+            load_watchlist(bad)
+
+
+def test_verify_reports_hits_and_reloads_watchlist() -> None:
+    with TemporaryDirectory() as td:
+        path = Path(td) / "watchlist.json"
+        path.write_text(json.dumps(_ENTRIES[:1]), encoding="utf-8")
+        app = create_app(
+            Settings(seed_path=Path(td) / "missing.json", watchlist_path=path)
+        )
+        client = TestClient(app)
+
+        r = client.post("/v1/verify", json={"name": "Test Holdings", "country": "GB"})
+        assert r.json()["status"] == "clear"
+        assert r.json()["risk_flags"] is None
+
+        r = client.post("/v1/verify", json={"name": "EC Holdings", "country": "GB"})
+        body = r.json()
+        assert body["status"] == "review_required"
+        assert body["risk_flags"] == ["sanctions_hit"]
+        assert body["screening_hits"] == [
+            {
+                "list": "sanctions",
+                "id": "S-1",
+                "name": "Evil Corp",
+                "matched": "EC Holdings",
+            }
+        ]
+
+        path.write_text(json.dumps(_ENTRIES), encoding="utf-8")
+        app.state.screening.check()
+        r = client.post(
+            "/v1/verify/batch", json=[{"name": "Jane Q Minister", "country": "GB"}]
+        )
+        assert r.json()[0]["result"]["risk_flags"] == ["pep_hit"]
+
+
+def test_default_keeps_placeholder_screening() -> None:
+    client = TestClient(create_app(Settings(watchlist_path=None)))
+    r = client.post("/v1/verify", json={"name": "Test Holdings", "country": "GB"})
+    assert r.json()["risk_flags"] == ["possible_match"]
+    assert r.json()["screening_hits"] is None
@@ -18,6 +18,8 @@ def test_search_returns_candidates_by_partial_name() -> None:
     assert resp.status_code == 200
     data = resp.json()
     assert any(item["legal_name"] == "Acme Corp" for item in data)
+    assert data[0]["legal_name"] == "Acme Corp"
+    assert 0 < data[0]["score"] <= 1
 
 
 def test_search_can_filter_by_country() -> None:
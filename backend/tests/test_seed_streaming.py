@@ -0,0 +1,116 @@
+"""
+Streaming seed loader tests
+
+Exercises the incremental JSON array and JSON Lines readers used by
+FileDataProvider for large seed files, including the error messages that
+point at malformed records.
+"""
+
+import io
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from backend.app.services import seedfile
+from backend.app.services.datasource import FileDataProvider
+
+
+def _record(i: int) -> dict[str, object]:
+    return {
+        "legal_name": f"company {i} ltd",
+        "address_line1": f"{i} High St",
+        "city": "Leeds",
+        "country": "gb",
+        "registration_status": "active",
+    }
+
+
+def test_streamed_array_matches_whole_file_load(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Streaming must produce the same dataset even across buffer refills."""
+
+    # Tiny chunks force elements and numbers to straddle buffer boundaries.
+    monkeypatch.setattr(seedfile, "_CHUNK_CHARS", 7)
+    seed = [_record(i) for i in range(50)]
+    seed.append({**_record(3), "address_line1": "12345678901234567890"})
+
+    with tempfile.TemporaryDirectory() as td:
+        path = Path(os.path.join(td, "seed.json"))
+        path.write_text(json.dumps(seed, indent=2), encoding="utf-8")
+        seen: list[int] = []
+        streamed = FileDataProvider(path, stream=True, progress=seen.append)
+        whole = FileDataProvider(path)
+
+    assert streamed._data == whole._data
+    assert streamed._keys == whole._keys
+    assert seen[-1] == 51
+    rec = streamed.lookup_business("Company 3 Ltd", "GB")
+    assert rec is not None and rec.address_line1 == "12345678901234567890"
+
+
+def test_jsonl_seed_is_streamed() -> None:
+    """JSON Lines files load line by line and skip blank lines."""
+
+    with tempfile.TemporaryDirectory() as td:
+        path = Path(os.path.join(td, "seed.jsonl"))
+        lines = [json.dumps(_record(i)) for i in range(3)]
+        path.write_text("\n".join(lines[:2]) + "\n\n" + lines[2] + "\n", "utf-8")
+        provider = FileDataProvider(path)
+
+    assert provider.lookup_business("company 2 ltd", "gb") is not None
+    assert len(provider.search_businesses("company", limit=10)) == 3
+
+
+@pytest.mark.parametrize(
+    ("text", "message"),
+    [
+        ('[{"legal_name": "A"}]', "Invalid record at index 0"),
+        ('{"legal_name": "A"}', "Seed JSON must be a list of records"),
+        ('[{"legal_name": "A"', "Invalid JSON in seed file"),
+        (f"[{json.dumps(_record(0))} {{}}]", "Invalid JSON in seed file"),
+        ("[] []", "Invalid JSON in seed file"),
+    ],
+)
+def test_streamed_array_errors_match_whole_file_load(text: str, message: str) -> None:
+    """Streaming keeps the whole-file loader's error messages."""
+
+    with tempfile.TemporaryDirectory() as td:
+        path = Path(os.path.join(td, "seed.json"))
+        path.write_text(text, encoding="utf-8")
+        for stream in (False, True):
+            with pytest.raises(ValueError, match=message):
+                FileDataProvider(path, stream=stream)
+
+
+def test_jsonl_reports_record_index() -> None:
+    """A bad JSON Lines record reports its zero-based record index."""
+
+    with tempfile.TemporaryDirectory() as td:
+        path = Path(os.path.join(td, "seed.jsonl"))
+        bad = {**_record(1), "country": "GBR"}
+        path.write_text(f"{json.dumps(_record(0))}\n{json.dumps(bad)}\n", "utf-8")
+        with pytest.raises(ValueError, match="Invalid record at index 1"):
+            FileDataProvider(path)
+
+
+def test_malformed_early_element_fails_without_reading_on(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A syntax error inside the buffer is reported at once, by item index,
+    instead of refilling until the end of a large file."""
+
+    monkeypatch.setattr(seedfile, "_CHUNK_CHARS", 4096)
+    good = json.dumps(_record(0))
+    items = [good, good, '{"legal_name": "A" "city": "B"}'] + [good] * 20000
+    fp = io.StringIO("[" + ",".join(items) + "]")
+    decoded = []
+    with pytest.raises(ValueError, match=r"seed\.json \(item 2\)"):
+        for item in seedfile._iter_array(fp, Path("seed.json")):
+            decoded.append(item)
+
+    assert len(decoded) == 2
+    assert fp.tell() == 4096
@@ -0,0 +1,192 @@
+"""
+Single-flight coalescing tests
+
+Concurrent identical (normalized) lookups, single or batched, share one
+inner call and its result, error or timeout; different keys and later calls
+are independent; and `/v1/verify` coalesces registry round trips and maps a
+timed-out shared lookup to 504, while local-only lookups are not coalesced.
+"""
+
+import asyncio
+from typing import Optional
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.config import Settings
+from backend.app.main import create_app
+from backend.app.services.datasource import BusinessRecord
+from backend.app.services.registries import AsyncDataProvider, RegistrySource
+from backend.app.services.singleflight import SingleFlightProvider
+
+_REC = BusinessRecord("Gaulois SA", "1 Rue Stub", "Paris", "FR", "Active")
+
+
+class SlowRegistry(AsyncDataProvider):
+    """Answers after `delay`; optionally fails. Counts calls and cancellations."""
+
+    def __init__(self, delay: float, fail: bool = False) -> None:
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    async def lookup_business(
+        self, name: str, country: str
+    ) -> Optional[BusinessRecord]:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise ConnectionError("registry unavailable")
+        return _REC if name.strip().lower() == "gaulois sa" else None
+
+
+def test_identical_requests_share_one_lookup() -> None:
+    async def scenario() -> None:
+        inner = SlowRegistry(0.05)
+        flights = SingleFlightProvider(inner)
+        names = ["Gaulois SA", "gaulois sa ", "GAULOIS SA"] * 3
+        results = await asyncio.gather(
+            *(
+                flights.lookup_business(n, c)
+                for n, c in zip(names, ["fr", "FR", " fr"] * 3, strict=True)
+            ),
+            flights.lookup_business("Other SA", "FR"),
+        )
+        assert results[:-1] == [_REC] * 9
+        assert results[-1] is None
+        assert inner.calls == 2
+        assert flights.stats.as_dict() == {"lookups": 2, "coalesced": 8, "failures": 0}
+        assert len(flights) == 0
+
+        # Completed lookups are not cached.
+        assert await flights.lookup_business("Gaulois SA", "FR") == _REC
+        assert inner.calls == 3
+
+    asyncio.run(scenario())
+
+
+def test_batches_join_flights_and_start_one_inner_batch() -> None:
+    async def scenario() -> None:
+        inner = SlowRegistry(0.05)
+        flights = SingleFlightProvider(inner)
+        single = asyncio.create_task(flights.lookup_business("Gaulois SA", "FR"))
+        await asyncio.sleep(0)
+        keys = [("gaulois sa", "fr"), ("Other SA", "FR"), ("OTHER SA", "fr")]
+        batch = asyncio.create_task(flights.lookup_many(keys))
+        # A single lookup arriving later joins the batch's flight.
+        other = await flights.lookup_business("other sa", "FR")
+        assert await batch == [_REC, None, None]
+        assert await single == _REC and other is None
+        assert inner.calls == 2
+        assert flights.stats.as_dict() == {"lookups": 2, "coalesced": 3, "failures": 0}
+        assert len(flights) == 0
+
+    asyncio.run(scenario())
+
+
+def test_errors_reach_every_waiter_and_are_not_kept() -> None:
+    async def scenario() -> None:
+        inner = SlowRegistry(0.02, fail=True)
+        flights = SingleFlightProvider(inner)
+        results = await asyncio.gather(
+            *(flights.lookup_business("Gaulois SA", "FR") for _ in range(4)),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, ConnectionError) for r in results)
+        assert inner.calls == 1 and flights.stats.failures == 1
+
+        inner.fail = False
+        assert await flights.lookup_business("Gaulois SA", "FR") == _REC
+        assert inner.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_timeout_cancels_lookup_for_all_waiters() -> None:
+    async def scenario() -> None:
+        inner = SlowRegistry(1.0)
+        flights = SingleFlightProvider(inner, timeout=0.02)
+        results = await asyncio.gather(
+            *(flights.lookup_business("Gaulois SA", "FR") for _ in range(3)),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, TimeoutError) for r in results)
+        assert inner.calls == 1 and inner.cancelled == 1
+        assert len(flights) == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_cancel_shared_lookup() -> None:
+    async def scenario() -> None:
+        inner = SlowRegistry(0.05)
+        flights = SingleFlightProvider(inner)
+        quitter = asyncio.create_task(flights.lookup_business("Gaulois SA", "FR"))
+        stayer = asyncio.create_task(flights.lookup_business("Gaulois SA", "FR"))
+        await asyncio.sleep(0.01)
+        quitter.cancel()
+        assert await stayer == _REC
+        assert inner.cancelled == 0
+        with pytest.raises(asyncio.CancelledError):
+            await quitter
+
+    asyncio.run(scenario())
+
+
+def _client(registry: AsyncDataProvider, settings: Settings) -> httpx.AsyncClient:
+    app = create_app(settings, registries=[RegistrySource(registry, timeout=5)])
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+def test_verify_coalesces_registry_round_trips() -> None:
+    async def scenario() -> None:
+        registry = SlowRegistry(0.05)
+        settings = Settings(reload_interval=0, registry_budget=5)
+        async with _client(registry, settings) as client:
+            body = {"name": "gaulois sa", "country": "FR"}
+            responses = await asyncio.gather(
+                *(client.post("/v1/verify", json=body) for _ in range(5))
+            )
+            assert [r.status_code for r in responses] == [200] * 5
+            assert {r.json()["legal_name"] for r in responses} == {"Gaulois SA"}
+            assert registry.calls == 1
+            stats = (await client.get("/stats")).json()["coalescing"]
+            assert stats == {
+                "enabled": True,
+                "lookups": 1,
+                "coalesced": 4,
+                "failures": 0,
+            }
+
+    asyncio.run(scenario())
+
+
+def test_verify_returns_504_when_shared_lookup_times_out() -> None:
+    async def scenario() -> None:
+        registry = SlowRegistry(1.0)
+        settings = Settings(reload_interval=0, registry_budget=5, coalesce_timeout=0.05)
+        async with _client(registry, settings) as client:
+            resp = await client.post(
+                "/v1/verify", json={"name": "gaulois sa", "country": "FR"}
+            )
+            assert resp.status_code == 504
+            assert resp.json() == {"detail": "Business lookup timed out"}
+
+    asyncio.run(scenario())
+
+
+def test_local_only_lookups_are_not_coalesced() -> None:
+    settings = Settings(reload_interval=0, coalesce_timeout=0.0)
+    with TestClient(create_app(settings)) as client:
+        resp = client.post("/v1/verify", json={"name": "Acme Corp", "country": "US"})
+        assert resp.status_code == 200
+        assert resp.json()["registration_status"] == "Active"
+        stats = client.get("/stats").json()["coalescing"]
+    assert stats["enabled"] is False and stats["lookups"] == 0
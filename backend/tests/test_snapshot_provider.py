@@ -0,0 +1,125 @@
+"""
+Snapshot provider tests
+
+Compiles a seed into a memory-mapped snapshot and checks the snapshot provider
+answers exactly like the file provider, from the name order stored in the
+file, through the CLI and DATA_SEED_PATH.
+"""
+
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.cli import main as cli_main
+from backend.app.main import create_app
+from backend.app.services.autocomplete import PrefixIndex
+from backend.app.services.datasource import FileDataProvider
+from backend.app.services.snapshot import SnapshotDataProvider, compile_snapshot
+
+_WORDS = ["acme", "globex", "initech", "umbrella", "hooli", "zürich", "stark"]
+
+
+def test_snapshot_matches_file_provider(
+    make_seed: Callable[..., list[dict[str, str]]], write_seed: Callable[..., Path]
+) -> None:
+    """Lookups and searches over the mmap'd snapshot match the JSON load."""
+
+    seed = make_seed(
+        1500,
+        _WORDS,
+        seed=5,
+        repeat=89,
+        countries=["NO", "DE", "GB"],
+        cities=["Oslo", "Köln", "Leeds"],
+        street="Quay Rd",
+    )
+    path = write_seed(seed)
+    out = path.with_suffix(".snap")
+    count = compile_snapshot(path, out)
+    expected = FileDataProvider(path)
+    snap = SnapshotDataProvider(out)
+    try:
+        assert count == len(snap) == len(expected._data)
+        for item in seed[:200]:
+            name, code = item["legal_name"], item["country"].lower()
+            assert snap.lookup_business(name, code) == (
+                expected.lookup_business(name, code)
+            )
+        assert snap.lookup_business("acme acme 1", "US") is None
+        for q in ["acme", "zür", "ch h", "7", "stark stark", "missing"]:
+            for country in [None, "de", "GB", "US"]:
+                assert snap.search_businesses(q, country, 30) == (
+                    expected.search_businesses(q, country, 30)
+                )
+    finally:
+        snap.close()
+
+
+def test_snapshot_stores_name_order(
+    monkeypatch: pytest.MonkeyPatch,
+    make_seed: Callable[..., list[dict[str, str]]],
+    write_seed: Callable[..., Path],
+) -> None:
+    """Searches and completions use the stored name order; nothing is sorted
+    when the snapshot is opened or first searched."""
+
+    path = write_seed(make_seed(600, _WORDS, seed=3, repeat=41))
+    out = path.with_suffix(".snap")
+    compile_snapshot(path, out)
+    expected = FileDataProvider(path)
+    expected.warm()
+
+    def no_sort(*args: object) -> PrefixIndex:
+        raise AssertionError("prefix index rebuilt")
+
+    monkeypatch.setattr(PrefixIndex, "build", no_sort)
+    snap = SnapshotDataProvider(out)
+    try:
+        for p in ["a", "zü", "stark s", "hooli acme 1", "missing"]:
+            for country in [None, "DE", "US"]:
+                assert snap.autocomplete(p, country, 25) == (
+                    expected.autocomplete(p, country, 25)
+                )
+                assert snap.search_ranked(p, country, 25) == (
+                    expected.search_ranked(p, country, 25)
+                )
+    finally:
+        snap.close()
+
+
+def test_rejects_non_snapshot_file(tmp_path: Path) -> None:
+    """Opening a JSON file as a snapshot fails with a clear error."""
+
+    path = tmp_path / "seed.snap"
+    path.write_text("[]" * 20, encoding="utf-8")
+    with pytest.raises(ValueError, match="Invalid snapshot file"):
+        SnapshotDataProvider(path)
+
+
+def test_api_serves_compiled_snapshot(
+    monkeypatch: pytest.MonkeyPatch, write_seed: Callable[..., Path]
+) -> None:
+    """The CLI output can be served directly through DATA_SEED_PATH."""
+
+    seed = [
+        {
+            "legal_name": "Snapshot Co",
+            "address_line1": "8 Page Ln",
+            "city": "Cachetown",
+            "country": "US",
+            "registration_status": "Active",
+        }
+    ]
+    src = write_seed(seed)
+    out = src.with_suffix(".snap")
+    assert cli_main(["compile-snapshot", str(src), str(out)]) == 0
+
+    monkeypatch.setenv("DATA_SEED_PATH", str(out))
+    client = TestClient(create_app())
+    resp = client.post("/v1/verify", json={"name": "snapshot co", "country": "US"})
+    assert resp.status_code == 200
+    assert resp.json()["address"]["city"] == "Cachetown"
+    resp = client.get("/v1/verify/search", params={"q": "snap"})
+    assert [c["legal_name"] for c in resp.json()] == ["Snapshot Co"]
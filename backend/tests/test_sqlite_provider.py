@@ -0,0 +1,140 @@
+"""
+SQLite provider tests
+
+Imports a seed into SQLite and checks the on-disk provider answers exactly
+like the in-memory providers (lookups, ranked search, fuzzy matches and
+autocomplete), keeps one connection per thread, and is served through the
+CLI and DATA_SEED_PATH.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.cli import main as cli_main
+from backend.app.main import create_app
+from backend.app.services.datasource import FileDataProvider
+from backend.app.services.sqlite import SqliteDataProvider, import_sqlite
+
+_WORDS = ["acme", "globex", "initech", "umbrella", "hooli", "zürich", 'o"hare']
+
+
+def _seed(
+    make_seed: Callable[..., list[dict[str, str]]], count: int
+) -> list[dict[str, str]]:
+    return make_seed(
+        count,
+        _WORDS,
+        repeat=89,
+        countries=["NO", "DE", "GB"],
+        statuses=["Active", "Inactive", "Pending"],
+        cities=["Oslo", "Köln", "Leeds"],
+        street="Quay Rd",
+    )
+
+
+def test_sqlite_matches_file_provider(
+    make_seed: Callable[..., list[dict[str, str]]], write_seed: Callable[..., Path]
+) -> None:
+    """Every query over the imported database matches the JSON load."""
+
+    seed = _seed(make_seed, 1500)
+    path = write_seed(seed)
+    out = path.with_suffix(".sqlite")
+    count = import_sqlite(path, out)
+    expected = FileDataProvider(path)
+    db = SqliteDataProvider(out)
+    try:
+        assert count == len(db) == len(expected)
+        for item in seed[:200]:
+            name, code = item["legal_name"], item["country"].lower()
+            assert db.lookup_business(name, code) == (
+                expected.lookup_business(name, code)
+            )
+            typo = name[:-1] + "x"
+            assert db.match_business(typo, code, 0.85) == (
+                expected.match_business(typo, code, 0.85)
+            )
+        keys = [(i["legal_name"], i["country"]) for i in seed[:50]]
+        assert db.lookup_many(keys) == expected.lookup_many(keys)
+        assert db.lookup_business("acme acme 1", "US") is None
+        for q in ["acme", "zür", "ch h", "7", 'o"h', "missing"]:
+            for country in [None, "de", "GB", "US"]:
+                assert db.search_ranked(q, country, 30) == (
+                    expected.search_ranked(q, country, 30)
+                )
+        for prefix in ["", "a", "Acme Z", "zü", 'o"', "x"]:
+            for country in [None, "NO"]:
+                assert db.autocomplete(prefix, country, 25) == (
+                    expected.autocomplete(prefix, country, 25)
+                )
+    finally:
+        db.close()
+
+
+def test_connection_per_thread(
+    make_seed: Callable[..., list[dict[str, str]]], write_seed: Callable[..., Path]
+) -> None:
+    """Each thread gets its own read-only connection."""
+
+    path = write_seed(_seed(make_seed, 20))
+    out = path.with_suffix(".db")
+    import_sqlite(path, out)
+    db = SqliteDataProvider(out)
+    try:
+        seen: list[sqlite3.Connection] = []
+        threads = [
+            threading.Thread(target=lambda: seen.append(db._connection()))
+            for _ in range(3)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len({id(c) for c in seen + [db._connection()]}) == 4
+        with pytest.raises(sqlite3.OperationalError, match="readonly|read-only"):
+            db._connection().execute("DELETE FROM businesses")
+        journal = db._connection().execute("PRAGMA journal_mode").fetchone()[0]
+        assert journal == "wal"
+    finally:
+        db.close()
+
+
+def test_rejects_non_database_file(tmp_path: Path) -> None:
+    path = tmp_path / "seed.sqlite"
+    path.write_text("[]" * 100, encoding="utf-8")
+    with pytest.raises(ValueError, match="Invalid SQLite database"):
+        SqliteDataProvider(path)
+
+
+def test_api_serves_imported_database(
+    monkeypatch: pytest.MonkeyPatch, write_seed: Callable[..., Path]
+) -> None:
+    """The CLI output can be served directly through DATA_SEED_PATH."""
+
+    seed = [
+        {
+            "legal_name": "Sqlite Co",
+            "address_line1": "3 Page Ln",
+            "city": "Btreeville",
+            "country": "US",
+            "registration_status": "Active",
+        }
+    ]
+    src = write_seed(seed)
+    out = src.with_suffix(".sqlite")
+    assert cli_main(["import-sqlite", str(src), str(out)]) == 0
+
+    monkeypatch.setenv("DATA_SEED_PATH", str(out))
+    client = TestClient(create_app())
+    resp = client.post("/v1/verify", json={"name": "sqlite co", "country": "US"})
+    assert resp.status_code == 200
+    assert resp.json()["address"]["city"] == "Btreeville"
+    resp = client.get("/v1/verify/search", params={"q": "sqli"})
+    assert [c["legal_name"] for c in resp.json()] == ["Sqlite Co"]
+    resp = client.get("/v1/verify/autocomplete", params={"q": "sq"})
+    assert [c["legal_name"] for c in resp.json()] == ["Sqlite Co"]
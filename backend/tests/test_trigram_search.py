@@ -0,0 +1,218 @@
+"""
+Trigram-indexed search tests
+
+Checks that indexed `search_businesses` returns exactly what a linear scan
+over the provider's records, fully sorted by relevance, would: including
+order, country filtering, short queries and duplicate keys; that searches
+with enough name-prefix hits skip the substring scan; and that every match
+is ranked, in every store.
+"""
+
+import random
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+import pytest
+
+from backend.app.services.columnar import ColumnarDataProvider
+from backend.app.services.datasource import (
+    BusinessRecord,
+    FileDataProvider,
+    _MatchingDataProvider,
+)
+from backend.app.services.ranking import relevance
+from backend.app.services.snapshot import SnapshotDataProvider, compile_snapshot
+from backend.app.services.sqlite import SqliteDataProvider, import_sqlite
+
+_WORDS = ["acme", "globex", "pacmem", "initech", "umbrella", "hooli", "acmes"]
+_SUFFIXES = ["Corp", "Ltd", "LLC", "GmbH", "Holdings"]
+_COUNTRIES = ["US", "GB", "DE", "CA"]
+
+
+def _scan(
+    provider: FileDataProvider, query: str, country: Optional[str], limit: int
+) -> list[BusinessRecord]:
+    """Reference implementation: O(n) scan, then a full stable sort."""
+
+    q = query.strip().lower()
+    code = country.strip().upper() if country else None
+    results: list[BusinessRecord] = []
+    for (name_key, ctry), rec in provider._data.items():
+        if q in name_key and (code is None or code == ctry):
+            results.append(rec)
+    results.sort(
+        key=lambda rec: relevance(q, rec.legal_name.lower(), rec.registration_status),
+        reverse=True,
+    )
+    return results[:limit]
+
+
+def _items(count: int) -> list[dict[str, str]]:
+    """Records named "<word> <word> <suffix>", so names repeat often."""
+
+    rng = random.Random(7)
+    return [
+        {
+            "legal_name": (
+                f"{rng.choice(_WORDS)} {rng.choice(_WORDS)} {rng.choice(_SUFFIXES)}"
+            ),
+            "address_line1": f"{i} Main St",
+            "city": "Springfield",
+            "country": rng.choice(_COUNTRIES),
+            "registration_status": rng.choice(["Active", "Inactive"]),
+        }
+        for i in range(count)
+    ]
+
+
+def test_indexed_search_matches_linear_scan(write_seed: Callable[..., Path]) -> None:
+    """Every query/country/limit combination should agree with the scan."""
+
+    provider = FileDataProvider(write_seed(_items(500)))
+
+    queries = ["acme", "ACME ", "cme", "pacmem ltd", "ex l", "ac", "zzz", "hooli h"]
+    for q in queries:
+        for country in [None, "us", "GB", "FR"]:
+            for limit in [1, 5, 1000]:
+                expected = _scan(provider, q, country, limit)
+                assert provider.search_businesses(q, country, limit) == expected
+
+
+def test_duplicate_keys_keep_first_position_and_last_value(
+    write_seed: Callable[..., Path],
+) -> None:
+    """A repeated name/country replaces the record, keeping one result."""
+
+    seed = [
+        {
+            "legal_name": "Acme Corp",
+            "address_line1": "1 A St",
+            "city": "X",
+            "country": "US",
+            "registration_status": "Active",
+        },
+        {
+            "legal_name": "Acme Works",
+            "address_line1": "2 B St",
+            "city": "Y",
+            "country": "US",
+            "registration_status": "Active",
+        },
+        {
+            "legal_name": "ACME CORP",
+            "address_line1": "3 C St",
+            "city": "Z",
+            "country": "US",
+            "registration_status": "Inactive",
+        },
+    ]
+    provider = FileDataProvider(write_seed(seed))
+
+    results = provider.search_businesses("acme", "US")
+    # Both are prefix matches; the replacement record is Inactive.
+    assert [r.address_line1 for r in results] == ["2 B St", "3 C St"]
+
+
+def test_ranked_search_orders_by_match_kind_and_status(
+    write_seed: Callable[..., Path],
+) -> None:
+    """Exact > prefix > token prefix > substring; Active wins within a kind."""
+
+    names = [
+        ("Pacmem Ltd", "Active"),
+        ("The Acme Group", "Active"),
+        ("Acme Corp Holdings", "Active"),
+        ("Acme", "Inactive"),
+        ("Acme Corp", "Inactive"),
+        ("Acme Corp", "Active"),
+    ]
+    seed = [
+        {
+            "legal_name": name,
+            "address_line1": f"{i} Main St",
+            "city": "Springfield",
+            "country": "GB" if i == len(names) - 1 else "US",
+            "registration_status": status,
+        }
+        for i, (name, status) in enumerate(names)
+    ]
+    provider = FileDataProvider(write_seed(seed))
+
+    hits = provider.search_ranked("acme", limit=10)
+    assert [(h.record.legal_name, h.record.country) for h in hits] == [
+        ("Acme", "US"),
+        ("Acme Corp", "GB"),
+        ("Acme Corp Holdings", "US"),
+        ("Acme Corp", "US"),
+        ("The Acme Group", "US"),
+        ("Pacmem Ltd", "US"),
+    ]
+    assert hits[0].score == 0.9
+    assert all(a.score >= b.score for a, b in zip(hits, hits[1:], strict=False))
+
+    top = provider.search_ranked("acme corp", limit=1)
+    assert top[0].record.country == "GB" and top[0].score == 1.0
+
+
+def _no_scan(self: object, q: str, code: Optional[str]) -> Iterator[BusinessRecord]:
+    raise AssertionError("substring scan")
+
+
+def test_prefix_matches_skip_the_substring_scan(
+    monkeypatch: pytest.MonkeyPatch, write_seed: Callable[..., Path]
+) -> None:
+    """Enough name-prefix hits answer a search without visiting other
+    records."""
+
+    seed = write_seed(_items(500))
+    db = seed.with_suffix(".sqlite")
+    import_sqlite(seed, db)
+    file_provider = FileDataProvider(seed)
+    sqlite_provider = SqliteDataProvider(db)
+    expected = _scan(file_provider, "ac", "US", 5)
+    for provider in (file_provider, sqlite_provider):
+        with monkeypatch.context() as m:
+            m.setattr(type(provider), "_iter_matches", _no_scan)
+            assert provider.search_businesses("ac", "US", 5) == expected
+    sqlite_provider.close()
+
+
+def test_every_match_is_ranked(write_seed: Callable[..., Path]) -> None:
+    """The best match is found however many weaker ones precede it in name
+    order, and every store ranks (and breaks ties) the same way."""
+
+    names = [f"Acme Holdings {i:04}" for i in range(3000)] + ["Pacmem", "Acme Zeta"]
+    seed = write_seed(
+        [
+            {
+                "legal_name": name,
+                "address_line1": f"{i} Main St",
+                "city": "Springfield",
+                "country": "US",
+                "registration_status": "Active" if name == "Acme Zeta" else "Inactive",
+            }
+            for i, name in enumerate(names)
+        ]
+    )
+    db = seed.with_suffix(".sqlite")
+    import_sqlite(seed, db)
+    snap = seed.with_suffix(".snap")
+    compile_snapshot(seed, snap)
+    file_provider = FileDataProvider(seed)
+    snapshot, sqlite = SnapshotDataProvider(snap), SqliteDataProvider(db)
+    providers: list[_MatchingDataProvider] = [
+        file_provider,
+        ColumnarDataProvider.from_seed(seed),
+        snapshot,
+        sqlite,
+    ]
+    for provider in providers:
+        for country in (None, "US"):
+            hits = provider.search_ranked("acme", country, 3)
+            assert hits[0].record.legal_name == "Acme Zeta"
+            assert [h.record for h in hits] == _scan(file_provider, "acme", None, 3)
+        assert provider.search_businesses("cme", None, 3002) == _scan(
+            file_provider, "cme", None, 3002
+        )
+    snapshot.close()
+    sqlite.close()
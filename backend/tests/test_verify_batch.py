@@ -0,0 +1,139 @@
+"""
+Batch verification endpoint tests
+
+POST /v1/verify/batch verifies an array of requests in one call, keeps the
+submission order and reports invalid items individually. Batches, like the
+NDJSON stream, consult configured registries for businesses missing locally.
+"""
+
+import asyncio
+import json
+from typing import Optional
+
+from fastapi.testclient import TestClient
+
+from backend.app.config import Settings
+from backend.app.main import create_app
+from backend.app.services.datasource import BusinessRecord
+from backend.app.services.registries import AsyncDataProvider, RegistrySource
+
+_STUB = BusinessRecord("Stub Sarl", "1 Rue Stub", "Paris", "FR", "Active")
+
+
+class RecordingRegistry(AsyncDataProvider):
+    """Knows only "Stub Sarl"; records the names it was asked for."""
+
+    name = "stub"
+
+    def __init__(self) -> None:
+        self.asked: list[str] = []
+
+    async def lookup_business(
+        self, name: str, country: str
+    ) -> Optional[BusinessRecord]:
+        self.asked.append(name)
+        await asyncio.sleep(0.01)
+        return _STUB if name.strip().lower() == "stub sarl" else None
+
+
+def test_batch_returns_results_in_order() -> None:
+    """Each item maps to the same response the single endpoint would give."""
+
+    client = TestClient(create_app())
+    items = [
+        {"name": "acme corp", "country": "us"},
+        {"name": "Unknown Trading", "country": "CA"},
+        {"name": "Test Holdings", "country": "GB"},
+    ]
+    resp = client.post("/v1/verify/batch", json=items)
+    assert resp.status_code == 200
+    data = resp.json()
+
+    assert [d["index"] for d in data] == [0, 1, 2]
+    for item, entry in zip(items, data, strict=True):
+        single = client.post("/v1/verify", json=item).json()
+        assert entry["result"] == single
+        assert entry["error"] is None
+
+
+def test_batch_reports_invalid_items_without_failing() -> None:
+    """A malformed item yields an error entry; the rest still verify."""
+
+    client = TestClient(create_app())
+    items = [
+        {"name": "Globex LLC", "country": "GB"},
+        {"name": "", "country": "USA"},
+        "not an object",
+    ]
+    resp = client.post("/v1/verify/batch", json=items)
+    assert resp.status_code == 200
+    data = resp.json()
+
+    assert data[0]["result"]["registration_status"] == "Inactive"
+    assert data[1]["result"] is None
+    assert "name" in data[1]["error"] and "country" in data[1]["error"]
+    assert data[2]["result"] is None and data[2]["error"]
+
+
+def test_batch_rejects_non_array_body() -> None:
+    """The body itself must be a JSON array."""
+
+    client = TestClient(create_app())
+    resp = client.post("/v1/verify/batch", json={"name": "Acme Corp", "country": "US"})
+    assert resp.status_code == 422
+
+
+def test_batch_and_stream_consult_registries_for_local_misses() -> None:
+    """Local hits need no registry call; duplicate keys share one lookup."""
+
+    registry = RecordingRegistry()
+    app = create_app(Settings(reload_interval=0), registries=[RegistrySource(registry)])
+    client = TestClient(app)
+    items = [
+        {"name": "Acme Corp", "country": "US"},
+        {"name": "Stub Sarl", "country": "FR"},
+        {"name": "stub sarl ", "country": "fr"},
+        {"name": "Nobody Ltd", "country": "FR"},
+    ]
+    expected = ["Acme Corp", "Stub Sarl", "Stub Sarl", "Nobody Ltd"]
+
+    data = client.post("/v1/verify/batch", json=items).json()
+    assert [d["result"]["legal_name"] for d in data] == expected
+    assert data[1]["result"]["address"]["city"] == "Paris"
+    assert sorted(registry.asked) == ["Nobody Ltd", "Stub Sarl"]
+    stats = client.get("/stats").json()["coalescing"]
+    assert (stats["lookups"], stats["coalesced"]) == (3, 1)
+
+    registry.asked.clear()
+    body = "".join(json.dumps(item) + "\n" for item in items)
+    resp = client.post(
+        "/v1/verify/stream",
+        content=body,
+        headers={"content-type": "application/x-ndjson"},
+    )
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [line["legal_name"] for line in lines] == expected
+    assert sorted(registry.asked) == ["Nobody Ltd", "Stub Sarl"]
+
+
+def test_batch_applies_fuzzy_match_per_item() -> None:
+    """Fuzzy items fall back to near matches; exact items with the same
+    misspelling stay unmatched."""
+
+    client = TestClient(create_app())
+    items = [
+        {"name": "Acme Crop", "country": "US", "match": "fuzzy"},
+        {"name": "Acme Crop", "country": "US"},
+        {"name": "Acme Corp", "country": "US", "match": "fuzzy"},
+        {"name": "Nothing Alike", "country": "US", "match": "fuzzy"},
+    ]
+    data = client.post("/v1/verify/batch", json=items).json()
+    for item, entry in zip(items, data, strict=True):
+        assert entry["result"] == client.post("/v1/verify", json=item).json()
+    results = [entry["result"] for entry in data]
+    assert results[0]["legal_name"] == "Acme Corp"
+    assert 0.8 < results[0]["match_score"] < 1
+    assert results[1]["registration_status"] == "Unknown"
+    assert results[1]["match_score"] is None
+    assert results[2]["match_score"] == 1.0
+    assert results[3]["match_score"] is None
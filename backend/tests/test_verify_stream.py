@@ -0,0 +1,86 @@
+"""
+Streaming NDJSON verification tests
+
+POST /v1/verify/stream reads `{name, country}` lines and writes one
+VerifyResponse (or error object) per input line, in order.
+"""
+
+import json
+from typing import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.main import create_app
+from backend.app.routers import verify as verify_router
+
+
+def test_stream_matches_single_verify() -> None:
+    """Each output line equals the single-endpoint response for that input."""
+
+    client = TestClient(create_app())
+    items = [
+        {"name": "acme corp", "country": "us"},
+        {"name": "Unknown Trading", "country": "CA"},
+        {"name": "Test Holdings", "country": "GB"},
+    ]
+    body = "\n".join(json.dumps(i) for i in items) + "\n\n"
+    resp = client.post(
+        "/v1/verify/stream",
+        content=body,
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert lines == [client.post("/v1/verify", json=i).json() for i in items]
+
+
+def test_stream_reports_bad_lines_and_spans_chunks(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Invalid lines yield errors in place; chunked bodies split mid-line."""
+
+    monkeypatch.setattr(verify_router, "STREAM_CHUNK_LINES", 2)
+    monkeypatch.setattr(verify_router, "MAX_STREAM_LINE_BYTES", 100)
+    client = TestClient(create_app())
+
+    payload = (
+        b'{"name": "Globex LLC", "country": "GB"}\n'
+        b"not json\n"
+        b'{"name": "' + b"x" * 200 + b'", "country": "US"}\n'
+        b'{"name": "Acme Corp", "country": "US"}'
+    )
+
+    def chunks() -> Iterator[bytes]:
+        for i in range(0, len(payload), 7):
+            yield payload[i : i + 7]
+
+    resp = client.post("/v1/verify/stream", content=chunks())
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+
+    assert len(lines) == 4
+    assert lines[0]["registration_status"] == "Inactive"
+    assert lines[1]["line"] == 2 and lines[1]["error"]
+    assert lines[2] == {"line": 3, "error": "line exceeds 100 bytes"}
+    assert lines[3]["legal_name"] == "Acme Corp"
+
+
+def test_stream_applies_fuzzy_match_per_line() -> None:
+    """`"match": "fuzzy"` lines fall back to near matches like /verify."""
+
+    client = TestClient(create_app())
+    items = [
+        {"name": "Acme Crop", "country": "US", "match": "fuzzy"},
+        {"name": "Acme Crop", "country": "US"},
+    ]
+    resp = client.post(
+        "/v1/verify/stream",
+        content="".join(json.dumps(i) + "\n" for i in items),
+        headers={"content-type": "application/x-ndjson"},
+    )
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert lines == [client.post("/v1/verify", json=i).json() for i in items]
+    assert lines[0]["legal_name"] == "Acme Corp" and lines[0]["match_score"] < 1
+    assert lines[1]["registration_status"] == "Unknown"